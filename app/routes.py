@@ -1,15 +1,22 @@
 from flask import render_template, request, send_file, jsonify
+import hmac
 import os
+import shutil
 import uuid
 import logging
 from werkzeug.utils import secure_filename
 from python.main import process_video
 from python.audio_processing.audio_cleaner import extract_audio_from_video
-from python.audio_processing.whisper_handler import transcriber
+from python.audio_processing.edge_tts_handler import speech_cache
+from python.audio_processing.vad_gate import VAD_METHODS
+from python.audio_processing.whisper_handler import (
+    get_transcriber, is_ready, readiness, resolve_profile, start_warmup
+)
 from python.others.audio_cleaner import process_audio_standalone
 from python.others.video_merger import merge_video_audio
 from python.others.transcription_analyzer import generate_transcription_pdf
 from python.others.profanity_detector import detect_profanity
+from python.text_processing.lexicon import get_lexicon, registry as lexicon_registry
 from app import app
 
 # Configure logging
@@ -96,10 +103,66 @@ def signup():
     return render_template("signup.html")
 
 @app.route("/health")
+@app.route("/health/live")
 def health():
-    """Health check endpoint."""
+    """Liveness check: the process serves requests (never waits for the model)."""
     return jsonify({"status": "healthy", "message": "NoProfanity service is running"})
 
+@app.route("/health/ready")
+def health_ready():
+    """Readiness check: 200 once the Whisper model is loaded and warmed up, 503 until then."""
+    state = readiness()
+    if state["status"] == "ready":
+        return jsonify(state)
+    if state["status"] == "not loaded" or (state["status"] == "failed" and not state["retrying"]):
+        # Nothing warmed the model up (e.g. the Flask dev server), or it gave up - start now
+        start_warmup()
+        state = readiness()
+    return jsonify(state), 503
+
+def is_admin_request():
+    """Check the X-Admin-Token header against the ADMIN_TOKEN environment variable."""
+    admin_token = os.environ.get("ADMIN_TOKEN")
+    supplied = request.headers.get("X-Admin-Token", "")
+    return bool(admin_token) and hmac.compare_digest(supplied.encode(), admin_token.encode())
+
+@app.route("/admin/reload-lexicon", methods=["POST"])
+def reload_lexicon():
+    """
+    Recompile the profanity lexicon from disk and swap it in without a restart.
+
+    The worker handling the request reloads right away; the other workers
+    reload on their next job, when they see the new lexicon generation.
+    """
+    if not is_admin_request():
+        return jsonify({"error": "Forbidden"}), 403
+
+    try:
+        wait = request.args.get("wait", "1") != "0"
+        lexicon = lexicon_registry.reload(wait=wait, broadcast=True)
+        if lexicon is None:
+            return jsonify({"status": "reloading", "pid": os.getpid()}), 202
+        return jsonify({
+            "status": "reloaded",
+            "pid": os.getpid(),
+            "patterns": len(lexicon.patterns),
+            "fingerprint": lexicon.fingerprint,
+            "source": lexicon.source
+        })
+    except Exception as e:
+        logger.error(f"Lexicon reload error: {str(e)}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/admin/cache-stats")
+def cache_stats():
+    """Hit/miss counters of this worker's caches and their size on disk."""
+    if not is_admin_request():
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({
+        "transcripts": get_transcriber().cache_stats() if is_ready() else None,
+        "speech": speech_cache().stats()
+    })
+
 @app.route("/process", methods=["POST"])
 def process():
     """Process video/audio files."""
@@ -117,6 +180,26 @@ def process():
         option = request.form.get("option", "video-clean")
         gender = request.form.get("gender", "female")
 
+        # Optional lexicon selection, e.g. min_severity=severe&exclude_categories=religious-offense
+        try:
+            lexicon = get_lexicon().select(
+                min_severity=request.form.get("min_severity") or None,
+                exclude_categories=request.form.get("exclude_categories", "").split(",")
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Optional transcription profile: realtime, balanced or accurate
+        try:
+            profile = resolve_profile(request.form.get("profile") or None)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Optional VAD gate for video cleaning: silero or energy
+        vad = request.form.get("vad") or None
+        if vad is not None and vad not in VAD_METHODS:
+            return jsonify({"error": f"Unknown VAD method {vad!r}"}), 400
+
         # Validate file type based on option
         if option in ["video-clean", "audio-extract"]:
             if not allowed_file(file.filename, "video"):
@@ -144,59 +227,71 @@ def process():
         logger.info(f"Processing {option}: {file.filename}")
         logger.info(f"Upload path: {file_path}")
 
-        # Get absolute path to output directory
-        output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output'))
+        # Get absolute path to output directory, one per request so concurrent jobs don't share files
+        output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output', unique_filename.rsplit(".", 1)[0]))
         os.makedirs(output_dir, exist_ok=True)
         logger.info(f"Output directory: {output_dir}")
 
         # Process the file based on option
-        if option == "video-clean":
-            result = process_video(file_path, output_dir, gender)
-            output_file = result["final_video"]
-            
-            logger.info(f"Looking for output file at: {output_file}")
-            if not os.path.exists(output_file):
-                raise FileNotFoundError(f"Output file not found at {output_file}")
-
-        elif option == "audio-extract":
-            # Extract audio only
-            output_file = extract_audio_from_video(file_path, output_dir)
-            logger.info(f"Audio extracted to: {output_file}")
-            
-        elif option == "audio-clean":
-            # Process audio file for cleaning
-            result = process_audio_standalone(file_path, output_dir, gender)
-            output_file = result["cleaned_audio"]
-            
-        elif option == "transcription":
-            # Handle transcription
-            output_file = generate_transcription_pdf(file_path, output_dir, unique_filename)
-            logger.info(f"Transcription saved to: {output_file}")
-            
-        elif option == "profanity-count":
-            # Handle profanity detection (returns JSON data, not file)
-            profanity_data = detect_profanity(file_path)
+        try:
+            response = run_option(option, file_path, output_dir, unique_filename, gender, lexicon, profile, vad)
+        except Exception:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            raise
+        finally:
             # Clean up uploaded file
-            os.remove(file_path)
-            return jsonify(profanity_data)
-            
-        else:
-            return jsonify({"error": "Invalid processing option"}), 400
+            if os.path.exists(file_path):
+                os.remove(file_path)
 
-        # Clean up uploaded file
-        os.remove(file_path)
-
-        # Return processed file
-        return send_file(
-            output_file,
-            as_attachment=True,
-            download_name=os.path.basename(output_file)
-        )
+        # The job's directory goes once the response (possibly a file being streamed) is done
+        response.call_on_close(lambda: shutil.rmtree(output_dir, ignore_errors=True))
+        return response
 
     except Exception as e:
         logger.error(f"Processing error: {str(e)}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+def run_option(option, file_path, output_dir, unique_filename, gender, lexicon, profile, vad):
+    """Run one /process option on a saved upload and build its response."""
+    if option == "video-clean":
+        result = process_video(file_path, output_dir, gender, lexicon=lexicon, profile=profile, vad=vad)
+        output_file = result["final_video"]
+
+        logger.info(f"Looking for output file at: {output_file}")
+        if not os.path.exists(output_file):
+            raise FileNotFoundError(f"Output file not found at {output_file}")
+
+    elif option == "audio-extract":
+        # Extract audio only
+        output_file = extract_audio_from_video(file_path, output_dir)
+        logger.info(f"Audio extracted to: {output_file}")
+
+    elif option == "audio-clean":
+        # Process audio file for cleaning
+        result = process_audio_standalone(file_path, output_dir, gender, lexicon=lexicon, profile=profile)
+        output_file = result["cleaned_audio"]
+
+    elif option == "transcription":
+        # Handle transcription
+        output_file = generate_transcription_pdf(file_path, output_dir, unique_filename, profile=profile)
+        logger.info(f"Transcription saved to: {output_file}")
+
+    elif option == "profanity-count":
+        # Handle profanity detection (returns JSON data, not file)
+        return jsonify(detect_profanity(file_path, lexicon=lexicon, profile=profile))
+
+    else:
+        response = jsonify({"error": "Invalid processing option"})
+        response.status_code = 400
+        return response
+
+    # Return processed file
+    return send_file(
+        output_file,
+        as_attachment=True,
+        download_name=os.path.basename(output_file)
+    )
+
 @app.route("/merge", methods=["POST"])
 def merge():
     """Merge video with audio file."""
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the profanity matchers on a synthetic transcript
+Usage: python benchmark_matchers.py [--words 20000] [--profanity-rate 0.05]
+"""
+
+import argparse
+import random
+import sys
+import time
+sys.path.append('.')
+
+from python.text_processing.lexicon import get_lexicon
+from python.text_processing.profanity_filter import filter_transcript
+
+FILLER = ["the", "and", "you", "know", "what", "I", "mean", "really", "guess", "about", "this", "video"]
+MISSPELLINGS = ["fuckin", "sh*t", "biatch", "assholes", "bitchs", "f*ck"]
+
+
+def build_transcript(words: int, profanity_rate: float, seed: int = 1):
+    rng = random.Random(seed)
+    lexicon_words = [p[2:-2].replace('\\', '') for p in get_lexicon().patterns if '\\s' not in p]
+    transcript = []
+    t = 0.0
+    for _ in range(words):
+        roll = rng.random()
+        if roll < profanity_rate:
+            word = rng.choice(lexicon_words)
+        elif roll < profanity_rate * 1.5:
+            word = rng.choice(MISSPELLINGS)
+        else:
+            word = rng.choice(FILLER)
+        transcript.append({"word": f" {word}{rng.choice(['', '', ',', '.'])}", "start": t, "end": t + 0.3})
+        t += 0.3
+    return transcript
+
+
+def time_filter(transcript, repeat: int, **kwargs):
+    filter_transcript(transcript, **kwargs)  # warm-up builds any lazy index
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        found = filter_transcript(transcript, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, len(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profanity matchers")
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--profanity-rate", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    transcript = build_transcript(args.words, args.profanity_rate)
+    configurations = [
+        ("text (regex semantics)", {"engine": "text"}),
+        ("tokens (exact)", {"engine": "tokens"}),
+        ("tokens + fuzzy d=1", {"engine": "tokens", "fuzzy_distance": 1}),
+        ("tokens + fuzzy d=2", {"engine": "tokens", "fuzzy_distance": 2}),
+    ]
+
+    print(f"Transcript: {len(transcript)} words")
+    print(f"{'matcher':<24}{'total ms':>10}{'us/word':>10}{'matches':>10}")
+    for name, kwargs in configurations:
+        seconds, matches = time_filter(transcript, args.repeat, **kwargs)
+        print(f"{name:<24}{seconds * 1000:>10.1f}{seconds / len(transcript) * 1e6:>10.2f}{matches:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 import multiprocessing
 import os
+import subprocess
+import sys
 
 # Server socket
 bind = "0.0.0.0:" + os.environ.get("PORT", "5000")
 backlog = 2048
 
 # Worker processes
-workers = 1  # Use only 1 worker to avoid memory issues
-worker_class = "sync"
+# With WHISPER_SERVER=1 a separate model server holds the only Whisper model,
+# so workers no longer cost a model each and WEB_CONCURRENCY can go up
+whisper_server = os.environ.get("WHISPER_SERVER", "0") == "1"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))  # Default 1 to avoid memory issues
+# Threads share the worker's single Whisper model; WHISPER_CONCURRENCY requests
+# transcribe at once and the rest wait, while health checks keep being answered
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 2 * int(os.environ.get("WHISPER_CONCURRENCY", "1")) + 2))
 worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 50
@@ -38,4 +46,37 @@ limit_request_fields = 100
 limit_request_field_size = 8190
 
 # Memory management
-worker_rlimit_nofile = 65536 
\ No newline at end of file
+worker_rlimit_nofile = 65536
+
+# Lexicon hot reload: poll the lexicon CSV every N seconds in each worker
+lexicon_watch_interval = float(os.environ.get("PROFANITY_LEXICON_WATCH", "0"))
+
+# Load the Whisper model in each worker right after it starts (off the request path)
+whisper_warmup = os.environ.get("WHISPER_WARMUP", "1") != "0"
+
+_model_server = None
+
+def on_starting(server):
+    global _model_server
+    if whisper_server:
+        from python.audio_processing.model_server import DEFAULT_SOCKET_PATH
+        # Workers inherit this and connect instead of loading a model
+        os.environ.setdefault("WHISPER_SERVER_SOCKET", DEFAULT_SOCKET_PATH)
+        _model_server = subprocess.Popen([
+            sys.executable, "-m", "python.audio_processing.model_server",
+            "--socket", os.environ["WHISPER_SERVER_SOCKET"]
+        ])
+        server.log.info(f"Started model server (pid {_model_server.pid})")
+
+def on_exit(server):
+    if _model_server is not None:
+        _model_server.terminate()
+        _model_server.wait(timeout=30)
+
+def post_fork(server, worker):
+    if lexicon_watch_interval > 0:
+        from python.text_processing.lexicon import registry
+        registry.watch(lexicon_watch_interval)
+    if whisper_warmup:
+        from python.audio_processing.whisper_handler import start_warmup
+        start_warmup()
@@ -0,0 +1,97 @@
+import logging
+import subprocess
+import wave
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rate the whole in-memory pipeline works at (what Whisper expects)
+SAMPLING_RATE = 16000
+
+
+def load_audio(path: str, sampling_rate: int = SAMPLING_RATE) -> np.ndarray:
+    """
+    Decode the audio track of any media file straight into memory.
+
+    ffmpeg writes mono 16-bit PCM to a pipe, which is read into memory and
+    converted to float32 in [-1, 1) - the format faster-whisper
+    takes in place of a file path. Nothing is written to disk.
+
+    Args:
+        path (str): Audio or video file.
+        sampling_rate (int): Output sample rate.
+
+    Returns:
+        np.ndarray: float32 samples.
+
+    Raises:
+        RuntimeError: If ffmpeg fails.
+    """
+    command = [
+        "ffmpeg", "-nostdin",
+        "-i", path,
+        "-vn",                        # No video
+        "-f", "s16le",                # Raw little-endian 16-bit PCM
+        "-acodec", "pcm_s16le",
+        "-ar", str(sampling_rate),
+        "-ac", "1",                   # Mono
+        "-hide_banner", "-loglevel", "error",
+        "-threads", "1",
+        "-"
+    ]
+    # Both pipes are drained together, so a chatty stderr can never stall the decode
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        logger.error(f"Audio decoding failed: {result.stderr.decode(errors='replace')}")
+        raise RuntimeError(f"Audio decoding failed for {path}")
+    buffer = result.stdout
+
+    # An odd trailing byte can only come from a truncated stream
+    samples = np.frombuffer(buffer, dtype="<i2", count=len(buffer) // 2)
+    audio = samples.astype(np.float32) / 32768.0
+    logger.info(f"Decoded {len(audio) / sampling_rate:.1f}s of audio from {path}")
+    return audio
+
+
+def write_wav(audio: np.ndarray, path: str, sampling_rate: int = SAMPLING_RATE) -> None:
+    """Write float32 mono samples as a 16-bit PCM WAV file."""
+    pcm = (np.clip(audio, -1.0, 1.0 - 1.0 / 32768) * 32768).astype("<i2")
+    with wave.open(path, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(sampling_rate)
+        file.writeframes(pcm.tobytes())
+
+
+def splice_audio(
+    audio: np.ndarray,
+    segments: Sequence[Tuple[float, float, np.ndarray]],
+    sampling_rate: int = SAMPLING_RATE
+) -> np.ndarray:
+    """
+    Cut time ranges out of audio and put other clips in their place.
+
+    Args:
+        audio: Original samples.
+        segments: (start, end, clip) in start order; the audio between start
+            and end (seconds) is replaced by clip.
+        sampling_rate (int): Rate of audio and every clip.
+
+    Returns:
+        np.ndarray: The spliced audio, built with one concatenation.
+    """
+    pieces: List[np.ndarray] = []
+    last_end = 0
+    for start, end, clip in segments:
+        start_sample = int(round(start * sampling_rate))
+        if start_sample > last_end:
+            pieces.append(audio[last_end:start_sample])
+        pieces.append(clip)
+        last_end = int(round(end * sampling_rate))
+    if last_end < len(audio):
+        pieces.append(audio[last_end:])
+    if not pieces:
+        return audio[:0]
+    return np.concatenate(pieces)
@@ -1,10 +1,11 @@
 import os
 import subprocess
 import logging
-from typing import Dict, Any
-from python.audio_processing.whisper_handler import transcriber
+from typing import Dict, Any, Optional
+from python.audio_processing.whisper_handler import get_transcriber
 from python.audio_processing.edge_tts_handler import generate_speech
 from python.audio_processing.audio_replacer import replace_profanity_audio
+from python.text_processing.lexicon import Lexicon
 from python.text_processing.profanity_filter import filter_transcript
 
 logger = logging.getLogger(__name__)
@@ -12,20 +13,28 @@ logger = logging.getLogger(__name__)
 def process_audio(
     audio_path: str,
     output_dir: str,
-    voice_gender: str = "female"
+    voice_gender: str = "female",
+    lexicon: Optional[Lexicon] = None,
+    profile: Optional[str] = None,
+    source_path: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Process audio file to detect and replace profanity."""
+    """
+    Process audio file to detect and replace profanity.
+
+    source_path is the upload audio_path was extracted from, if any; it is
+    transcribed instead, so the transcript cache is shared with the other tools.
+    """
     try:
         # Step 1: Transcribe audio
         logger.info("Transcribing audio...")
-        transcript = transcriber.transcribe_audio(audio_path)
+        transcript = get_transcriber(profile).transcribe_audio(source_path or audio_path)
         
         if not transcript:
             raise RuntimeError("No speech detected in audio file")
         
         # Step 2: Filter profanity
         logger.info("Filtering profanity...")
-        profane_segments = filter_transcript(transcript)
+        profane_segments = filter_transcript(transcript, lexicon=lexicon)
         
         if not profane_segments:
             logger.info("No profanity detected, returning original audio")
@@ -5,6 +5,10 @@ import logging
 from pathlib import Path
 from typing import List, Dict, Any
 
+import numpy as np
+
+from python.audio_processing.audio_buffer import SAMPLING_RATE, load_audio, splice_audio, write_wav
+
 logger = logging.getLogger(__name__)
 
 def replace_profanity_audio(
@@ -107,4 +111,44 @@ def replace_profanity_audio(
         raise RuntimeError("Audio replacement failed")
     finally:
         if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
\ No newline at end of file
+            shutil.rmtree(temp_dir)
+
+def replace_profanity_audio_buffer(
+    audio: np.ndarray,
+    replacements: List[Dict[str, Any]],
+    output_audio_file: str,
+    sampling_rate: int = SAMPLING_RATE
+) -> np.ndarray:
+    """
+    In-memory replace_profanity_audio for audio that is already decoded.
+
+    Cuts follow the same rules (no pre-cut, 350ms post-cut, replacement
+    padded by 350ms of silence and trimmed to the cut), but the original is
+    never re-read: only the replacement clips are decoded, and the result is
+    written once as a mono WAV at sampling_rate.
+
+    Args:
+        audio: Decoded original audio (see audio_buffer.load_audio).
+        replacements: Segments with start/end/replacement_audio.
+        output_audio_file (str): WAV file to write.
+        sampling_rate (int): Rate of audio.
+
+    Returns:
+        np.ndarray: The censored audio.
+    """
+    duration = len(audio) / sampling_rate
+    pad = np.zeros(int(round(0.35 * sampling_rate)), dtype=np.float32)
+    segments = []
+    try:
+        for repl in sorted(replacements, key=lambda x: x["start"]):
+            word_start = repl["start"]
+            word_end = min(duration, repl["end"] + 0.35)  # 350ms post-cut only
+            clip = np.concatenate((load_audio(repl["replacement_audio"], sampling_rate), pad))
+            segments.append((word_start, word_end, clip[:max(0, int(round((word_end - word_start) * sampling_rate)))]))
+
+        censored = splice_audio(audio, segments, sampling_rate)
+        write_wav(censored, output_audio_file, sampling_rate)
+        return censored
+    except RuntimeError as e:
+        logger.error(f"Processing failed: {e}")
+        raise RuntimeError("Audio replacement failed")
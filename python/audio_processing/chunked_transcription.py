@@ -0,0 +1,185 @@
+"""
+Parallel transcription of long audio, split into chunks at silences.
+
+Each pool process loads its own Whisper model once; chunks are transcribed
+independently and their words shifted back to file time. Chunk boundaries
+only fall in silences found by the VAD, so no word is cut in half.
+
+This module avoids importing whisper_handler so spawned workers do not load
+the shared transcriber as a side effect.
+"""
+import atexit
+import logging
+import multiprocessing
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper models work on 16 kHz mono audio
+SAMPLING_RATE = 16000
+
+# Target chunk length; chunks only end in a silence, so some run longer
+DEFAULT_CHUNK_SECONDS = 60
+
+# Shortest pause the VAD reports as a gap, i.e. as a place a chunk may end
+MIN_SILENCE_MS = 500
+
+
+def find_speech(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """Speech spans of 16 kHz audio as (start, end) sample offsets."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    spans = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=MIN_SILENCE_MS))
+    return [(span["start"], span["end"]) for span in spans]
+
+
+def plan_chunks(
+    speech: Sequence[Tuple[int, int]],
+    total_samples: int,
+    chunk_samples: int
+) -> List[Tuple[int, int]]:
+    """
+    Group speech spans into chunks of about chunk_samples.
+
+    Chunks are cut halfway through the silence between two speech spans, as
+    late as possible without exceeding chunk_samples; speech with no pause
+    in it gives a longer chunk rather than a cut word.
+
+    Args:
+        speech: Sorted (start, end) speech spans in samples.
+        total_samples (int): Length of the audio.
+        chunk_samples (int): Target chunk length.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) sample ranges covering the audio
+        in order; empty if there is no speech.
+    """
+    if not speech:
+        return []
+    cuts = [(speech[i][1] + speech[i + 1][0]) // 2 for i in range(len(speech) - 1)]
+
+    chunks = []
+    start = 0
+    previous = None
+    # The end of the audio is the last place a chunk can end
+    for cut in cuts + [total_samples]:
+        if cut - start > chunk_samples and previous is not None and previous > start:
+            chunks.append((start, previous))
+            start = previous
+        previous = cut
+    chunks.append((start, total_samples))
+    return chunks
+
+
+def merge_chunk_words(
+    chunk_words: Iterable[Tuple[float, List[Dict[str, Any]]]]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Shift chunk-relative words to file time and concatenate them in chunk order.
+
+    Args:
+        chunk_words: (chunk start in seconds, words) per chunk, in chunk order.
+
+    Yields:
+        Dict: {"word", "start", "end"} with times that never go backwards.
+    """
+    last_end = 0.0
+    for offset, words in chunk_words:
+        for word in words:
+            start = max(round(word["start"] + offset, 2), last_end)
+            end = max(round(word["end"] + offset, 2), start)
+            last_end = end
+            yield {"word": word["word"], "start": start, "end": end}
+
+
+# Per-process model of the chunk workers, loaded once by the pool initializer
+_worker_model = None
+
+
+def _init_chunk_worker(model_size: str, compute_type: str, cpu_threads: int) -> None:
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(model_size, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _transcribe_chunk(
+    task: Tuple[np.ndarray, float, Optional[str], Dict[str, Any]]
+) -> Tuple[float, List[Dict[str, Any]]]:
+    audio, offset, language, options = task
+    segments, _ = _worker_model.transcribe(audio, language=language, word_timestamps=True, **options)
+    words = [
+        {"word": word.word, "start": word.start, "end": word.end}
+        for segment in segments
+        for word in segment.words
+    ]
+    return offset, words
+
+
+_pools: Dict[Tuple[str, str, int, int], Any] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(model_size: str, compute_type: str, workers: int, cpu_threads: int = 1):
+    """Process pool for one model configuration, started on first use and kept."""
+    key = (model_size, compute_type, workers, cpu_threads)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            # spawn: forking a process whose inference threads are running is unsafe
+            context = multiprocessing.get_context("spawn")
+            pool = context.Pool(
+                workers, initializer=_init_chunk_worker, initargs=(model_size, compute_type, cpu_threads)
+            )
+            _pools[key] = pool
+            logger.info(
+                f"Started {workers} transcription workers for {model_size} ({compute_type}, {cpu_threads} threads each)"
+            )
+        return pool
+
+
+@atexit.register
+def shutdown_pools() -> None:
+    """Stop every chunk worker pool."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.terminate()
+        _pools.clear()
+
+
+def transcribe_chunked(
+    audio: np.ndarray,
+    model_size: str,
+    compute_type: str,
+    language: str,
+    workers: int,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    options: Optional[Dict[str, Any]] = None,
+    cpu_threads: int = 1
+) -> Iterator[Dict[str, Any]]:
+    """
+    Transcribe 16 kHz audio across a process pool.
+
+    Args:
+        audio: Decoded audio.
+        model_size, compute_type (str): Whisper model each worker loads.
+        language (str): Language for every chunk; detect it beforehand so the
+            chunks agree.
+        workers (int): Worker processes.
+        chunk_seconds (float): Target chunk length.
+        options (dict, optional): Extra transcribe() arguments, e.g. beam_size.
+        cpu_threads (int): Inference threads of each worker's model (the
+            profile's or tuned cpu_threads).
+
+    Yields:
+        Dict: {"word", "start", "end"} in file time, in order, as soon as the
+        chunks before them are done.
+    """
+    chunks = plan_chunks(find_speech(audio), len(audio), int(chunk_seconds * SAMPLING_RATE))
+    logger.info(f"Transcribing {len(chunks)} chunks on {workers} workers")
+    tasks = ((audio[start:end], start / SAMPLING_RATE, language, options or {}) for start, end in chunks)
+    pool = _get_pool(model_size, compute_type, workers, cpu_threads)
+    yield from merge_chunk_words(pool.imap(_transcribe_chunk, tasks))
@@ -1,10 +1,15 @@
 import os
+import shutil
 import subprocess
+import threading
 import edge_tts
 import asyncio
 import logging
 import math
+from collections import OrderedDict
 from pathlib import Path
+from typing import Optional
+from python.utils.disk_cache import DiskLRUCache, cache_dir, content_key
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,6 +19,78 @@ VOICE_MAP = {
     "female": "en-US-JennyNeural"
 }
 
+# Default size bound of the on-disk replacement speech cache
+DEFAULT_SPEECH_CACHE_MB = 64
+
+# Clip durations remembered in memory (least recently used are dropped first)
+CLIP_DURATION_CACHE_SIZE = 4096
+
+# Speaking rate edge-tts uses when none is given
+NATURAL_RATE = "+0%"
+
+_speech_cache: Optional[DiskLRUCache] = None
+_speech_cache_lock = threading.Lock()
+# In-memory index: cache key -> clip duration, so a cached clip needs no ffprobe
+_clip_durations: "OrderedDict[str, float]" = OrderedDict()
+_clip_durations_lock = threading.Lock()
+
+def speech_cache() -> DiskLRUCache:
+    """
+    Shared cache of synthesized clips, keyed by (text, voice, rate, format).
+
+    TTS_CACHE_DIR overrides the location (default: "tts" in the lexicon cache
+    directory); TTS_CACHE_MB bounds its size, 0 disables it.
+    """
+    global _speech_cache
+    if _speech_cache is None:
+        with _speech_cache_lock:
+            if _speech_cache is None:
+                directory = os.environ.get("TTS_CACHE_DIR") or os.path.join(cache_dir(), "tts")
+                max_mb = float(os.environ.get("TTS_CACHE_MB", DEFAULT_SPEECH_CACHE_MB))
+                _speech_cache = DiskLRUCache(directory, int(max_mb * 1024 * 1024), suffix=".mp3")
+    return _speech_cache
+
+def _probe_duration(path: str) -> float:
+    return float(subprocess.run([
+        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", path
+    ], stdout=subprocess.PIPE, text=True).stdout.strip())
+
+async def _synthesize(text: str, voice: str, rate: str, output_path: str, measure: bool = True) -> Optional[float]:
+    """
+    Write the clip for (text, voice, rate) to output_path and return its duration (None unless measure).
+
+    Repeated clips are copied from the speech cache instead of calling edge-tts.
+    """
+    cache = speech_cache()
+    key = content_key(text, voice, rate, "mp3")
+    cached = cache.get(key)
+    copied = False
+    if cached is not None:
+        try:
+            shutil.copyfile(cached, output_path)
+            copied = True
+        except OSError as e:
+            # Evicted (e.g. by another worker) between the lookup and the copy
+            logger.warning(f"Cached clip {cached} unreadable, synthesizing again: {e}")
+    if not copied:
+        await edge_tts.Communicate(text, voice, rate=rate).save(output_path)
+        cache.put(key, lambda tmp_path: shutil.copyfile(output_path, tmp_path))
+
+    if not measure:
+        return None
+    with _clip_durations_lock:
+        duration = _clip_durations.get(key)
+        if duration is not None:
+            _clip_durations.move_to_end(key)
+    if duration is None:
+        duration = _probe_duration(output_path)
+        with _clip_durations_lock:
+            _clip_durations[key] = duration
+            while len(_clip_durations) > CLIP_DURATION_CACHE_SIZE:
+                _clip_durations.popitem(last=False)
+    return duration
+
 async def async_generate_speech(
     text: str,
     output_path: str,
@@ -25,15 +102,8 @@ async def async_generate_speech(
         voice = VOICE_MAP.get(gender.lower(), VOICE_MAP["female"])
         
         # First generate without rate control to get natural duration
-        communicate = edge_tts.Communicate(text, voice)
         temp_path = str(Path(output_path).with_suffix('.temp.mp3'))
-        await communicate.save(temp_path)
-        
-        # Calculate current duration
-        duration = float(subprocess.run([
-            "ffprobe", "-v", "error", "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1", temp_path
-        ], stdout=subprocess.PIPE, text=True).stdout.strip())
+        duration = await _synthesize(text, voice, NATURAL_RATE, temp_path, measure=target_duration is not None)
         
         # If no target duration needed, just use natural speech
         if target_duration is None:
@@ -48,21 +118,11 @@ async def async_generate_speech(
         rate_percent = int(round(rate_adjustment * 100))
         
         # Regenerate with rate control
-        communicate = edge_tts.Communicate(
-            text, 
-            voice,
-            rate=f"+{rate_percent}%" if rate_percent >= 100 else f"-{100-rate_percent}%"
-        )
+        rate = f"+{rate_percent}%" if rate_percent >= 100 else f"-{100-rate_percent}%"
         # Remove output file if it exists
         if os.path.exists(output_path):
             os.remove(output_path)
-        await communicate.save(output_path)
-        
-        # Final duration check and padding if needed
-        final_duration = float(subprocess.run([
-            "ffprobe", "-v", "error", "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1", output_path
-        ], stdout=subprocess.PIPE, text=True).stdout.strip())
+        final_duration = await _synthesize(text, voice, rate, output_path)
         
         if final_duration < target_duration:
             subprocess.run([
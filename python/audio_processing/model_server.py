@@ -0,0 +1,333 @@
+"""
+Model server: one process owns the Whisper model and transcribes for every
+Gunicorn worker over a Unix domain socket.
+
+Run it with
+
+    python -m python.audio_processing.model_server --socket /tmp/whisper.sock
+
+and point the workers at it with WHISPER_SERVER_SOCKET; get_transcriber()
+then returns a ModelClient instead of loading a model of its own
+(gunicorn.conf.py starts the server itself when WHISPER_SERVER=1).
+
+Protocol: every message is a frame of one type byte and a uint64 payload
+length, followed by the payload. A connection carries any number of
+request/response pairs.
+
+    TRANSCRIBE  uint16 language length, uint16 profile length, language
+                (UTF-8, empty = detect), profile (UTF-8, empty = default),
+                then 16 kHz mono float32 samples, little-endian
+    SEGMENTS    as TRANSCRIBE, answered without word timestamps
+    STATS       empty
+    PING        empty
+
+    TRANSCRIPT  binary transcript (Transcript.to_bytes)
+    JSON        UTF-8 JSON document
+    ERROR       UTF-8 error message
+
+The socket is only accessible to the user running the server (mode 0600).
+Clients never import faster-whisper: whisper_handler imports it only when a
+model is loaded in this process.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from python.audio_processing.audio_buffer import SAMPLING_RATE, load_audio
+from python.text_processing.transcript import Transcript
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "profanity_whisper.sock")
+
+_FRAME = struct.Struct("<BQ")  # message type, payload length
+_OPTIONS = struct.Struct("<HH")  # language length, profile length
+
+# Requests
+MSG_TRANSCRIBE = 1
+MSG_STATS = 2
+MSG_PING = 3
+MSG_SEGMENTS = 4
+# Responses
+MSG_TRANSCRIPT = 64
+MSG_JSON = 65
+MSG_ERROR = 66
+
+
+class ModelServerError(RuntimeError):
+    """The model server could not be reached or reported a failure."""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Connection closed mid-message")
+        received += count
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, kind: int, *parts: bytes) -> None:
+    """Send one message whose payload is the concatenation of parts."""
+    sock.sendall(_FRAME.pack(kind, sum(len(part) for part in parts)))
+    for part in parts:
+        sock.sendall(part)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Tuple[int, bytes]]:
+    """Read one message; None if the peer closed the connection between messages."""
+    header = sock.recv(_FRAME.size, socket.MSG_WAITALL)
+    if not header:
+        return None
+    if len(header) < _FRAME.size:
+        raise ConnectionError("Connection closed mid-message")
+    kind, size = _FRAME.unpack(header)
+    return kind, _recv_exact(sock, size)
+
+
+def encode_transcribe(
+    audio: np.ndarray,
+    language: Optional[str],
+    profile: Optional[str] = None
+) -> Tuple[bytes, bytes]:
+    """Payload parts of a TRANSCRIBE request."""
+    language_bytes = (language or "").encode("utf-8")
+    profile_bytes = (profile or "").encode("utf-8")
+    samples = np.ascontiguousarray(audio, dtype="<f4")
+    header = _OPTIONS.pack(len(language_bytes), len(profile_bytes)) + language_bytes + profile_bytes
+    return header, samples.tobytes()
+
+
+def decode_transcribe(payload: bytes) -> Tuple[np.ndarray, Optional[str], Optional[str]]:
+    """Audio, language and profile of a TRANSCRIBE payload."""
+    language_size, profile_size = _OPTIONS.unpack_from(payload)
+    position = _OPTIONS.size + language_size
+    language = payload[_OPTIONS.size:position].decode("utf-8") or None
+    profile = payload[position:position + profile_size].decode("utf-8") or None
+    position += profile_size
+    audio = np.frombuffer(payload, dtype="<f4", offset=position).astype(np.float32, copy=False)
+    return audio, language, profile
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                frame = recv_frame(self.request)
+            except ConnectionError:
+                return
+            if frame is None:
+                return
+            try:
+                self._reply(*frame)
+            except (BrokenPipeError, ConnectionError):
+                return
+
+    def _reply(self, kind: int, payload: bytes) -> None:
+        load = self.server.load_transcriber
+        try:
+            if kind == MSG_TRANSCRIBE:
+                audio, language, profile = decode_transcribe(payload)
+                transcript = load(profile).transcribe_audio(audio, language)
+                send_frame(self.request, MSG_TRANSCRIPT, transcript.to_bytes())
+            elif kind == MSG_SEGMENTS:
+                audio, language, profile = decode_transcribe(payload)
+                segments = load(profile).transcribe_segments(audio, language)
+                send_frame(self.request, MSG_TRANSCRIPT, segments.to_bytes())
+            elif kind == MSG_STATS:
+                send_frame(self.request, MSG_JSON, json.dumps(load(None).cache_stats()).encode("utf-8"))
+            elif kind == MSG_PING:
+                send_frame(self.request, MSG_JSON, b'{"status": "ready"}')
+            else:
+                send_frame(self.request, MSG_ERROR, f"Unknown message type {kind}".encode("utf-8"))
+        except Exception as e:
+            logger.error(f"Model server request failed: {e}")
+            send_frame(self.request, MSG_ERROR, str(e).encode("utf-8"))
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server around the transcribers of one process."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, load_transcriber: Callable[[Optional[str]], Any]):
+        """
+        Args:
+            socket_path (str): Where to listen; a stale socket file is replaced
+                and the new one is made private to the current user.
+            load_transcriber: Returns the transcriber for a profile name (None
+                for the default), normally whisper_handler.load_transcriber.
+                Transcribers provide transcribe_audio(audio, language),
+                transcribe_segments(audio, language) and cache_stats().
+        """
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        self.load_transcriber = load_transcriber
+        super().__init__(socket_path, _Handler)
+        # Transcripts of other users' uploads go over this socket
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class ModelClient:
+    """
+    Transcriber backed by a model server.
+
+    Offers the transcribe_audio/iter_words/cache_stats interface of
+    WhisperTranscriber, so callers of get_transcriber() work with either.
+    Every thread keeps its own connection.
+    """
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None, profile: Optional[str] = None):
+        """
+        Args:
+            socket_path (str): Socket the server listens on.
+            timeout (float, optional): Socket timeout in seconds (None waits forever).
+            profile (str, optional): Transcription profile the server should use.
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.profile = profile
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError as e:
+                sock.close()
+                raise ModelServerError(f"Model server not reachable at {self.socket_path}: {e}")
+            self._local.sock = sock
+        return sock
+
+    def _close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, kind: int, *parts: bytes) -> Tuple[int, bytes]:
+        # A connection the server dropped (e.g. after a restart) is retried once
+        for attempt in range(2):
+            sock = self._connection()
+            try:
+                send_frame(sock, kind, *parts)
+                frame = recv_frame(sock)
+            except (BrokenPipeError, ConnectionError):
+                frame = None
+            if frame is not None:
+                break
+            self._close()
+            if attempt:
+                raise ModelServerError("Model server closed the connection")
+        kind, payload = frame
+        if kind == MSG_ERROR:
+            raise ModelServerError(payload.decode("utf-8", errors="replace"))
+        return kind, payload
+
+    def transcribe_audio(self, audio_path: Union[str, np.ndarray], language: str = None) -> Transcript:
+        """
+        Transcribe on the server.
+
+        Args:
+            audio_path: Path to an audio/video file (decoded here), or 16 kHz
+                float32 samples.
+            language (str, optional): Force language (e.g., "en").
+
+        Returns:
+            Transcript: Words with timestamps.
+
+        Raises:
+            FileNotFoundError: If the audio file is missing.
+            ModelServerError: If the server is unreachable or transcription failed.
+        """
+        _, payload = self._request(MSG_TRANSCRIBE, *encode_transcribe(self._load(audio_path), language, self.profile))
+        return Transcript.from_bytes(payload)
+
+    def transcribe_segments(self, audio_path: Union[str, np.ndarray], language: str = None) -> Transcript:
+        """Segment-level transcription on the server (see WhisperTranscriber.transcribe_segments)."""
+        _, payload = self._request(MSG_SEGMENTS, *encode_transcribe(self._load(audio_path), language, self.profile))
+        return Transcript.from_bytes(payload)
+
+    @staticmethod
+    def _load(audio_path: Union[str, np.ndarray]) -> np.ndarray:
+        if isinstance(audio_path, np.ndarray):
+            return audio_path
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        return load_audio(audio_path, SAMPLING_RATE)
+
+    def iter_words(self, audio_path: Union[str, np.ndarray], language: str = None) -> Iterator[Dict[str, Any]]:
+        """Yield the words of transcribe_audio() (the server answers in one piece)."""
+        for word in self.transcribe_audio(audio_path, language):
+            yield dict(word)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Transcript cache counters of the server process."""
+        _, payload = self._request(MSG_STATS)
+        return json.loads(payload)
+
+    def wait_until_ready(self, timeout: float = 300.0, interval: float = 1.0) -> None:
+        """
+        Block until the server answers a ping.
+
+        Raises:
+            ModelServerError: If it doesn't within timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._request(MSG_PING)
+                return
+            except ModelServerError:
+                self._close()
+                if time.monotonic() >= deadline:
+                    raise
+            time.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve Whisper transcription over a Unix socket")
+    parser.add_argument("--socket", default=os.environ.get("WHISPER_SERVER_SOCKET", DEFAULT_SOCKET_PATH),
+                        help="Socket path to listen on")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from python.audio_processing.whisper_handler import load_transcriber, warmup_model
+
+    # Other profiles load on their first request
+    warmup_model(load_transcriber())
+    # Bind only once the model is ready, so a successful connect means "ready"
+    server = ModelServer(args.socket, load_transcriber)
+    logger.info(f"Model server listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Find the fastest ctranslate2 settings for this host.
+
+    python -m python.audio_processing.tune [--clip speech.wav] [--profile balanced]
+
+Runs a short speech clip through every cpu_threads x num_workers split that
+fits the CPU (and, for the realtime profile, every compute type), each in a
+fresh process, and measures the real-time factor (decoding seconds per audio
+second, across all workers) and peak RSS. The winner is written to the tuning file (WHISPER_TUNING_FILE,
+default: whisper_tuning.json in the cache directory), which
+WhisperTranscriber.from_profile() reads when it loads a model.
+
+This module only imports faster-whisper in the benchmark processes, so
+whisper_handler can import it freely.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from python.utils.disk_cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_TYPES = ("int8", "int8_float32", "float32")
+
+# Profiles whose compute type may be tuned. The others keep their own, since it
+# is part of their accuracy (e.g. "accurate" decodes in float32); only their
+# thread layout is tuned.
+COMPUTE_TUNED_PROFILES = ("realtime",)
+
+# Spoken once through edge-tts when no --clip is given
+BENCHMARK_TEXT = (
+    "The quick brown fox jumps over the lazy dog. Then again, nobody really "
+    "knows why the fox would bother. We measured how long it takes to write "
+    "down every single word of this short recording, twice over, on this machine."
+)
+
+
+def tuning_path() -> str:
+    """Where tuned settings are stored (WHISPER_TUNING_FILE overrides it)."""
+    return os.environ.get("WHISPER_TUNING_FILE") or os.path.join(cache_dir(), "whisper_tuning.json")
+
+
+def load_tuned_settings(profile: str, model_size: str, path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Tuned compute_type, cpu_threads and num_workers for a profile and model.
+
+    compute_type is only returned for COMPUTE_TUNED_PROFILES.
+
+    Returns:
+        Dict: The settings, or {} if the file is missing, unreadable, or was
+        tuned for another model or CPU count.
+    """
+    path = path or tuning_path()
+    try:
+        with open(path, encoding="utf-8") as file:
+            entry = json.load(file).get("profiles", {}).get(profile)
+    except (OSError, ValueError, AttributeError):
+        return {}
+    if not entry or entry.get("model_size") != model_size or entry.get("cpu_count") != os.cpu_count():
+        return {}
+    names = ("cpu_threads", "num_workers")
+    if profile in COMPUTE_TUNED_PROFILES:
+        names = ("compute_type",) + names
+    return {name: entry[name] for name in names if name in entry}
+
+
+def profile_compute_types(profile: str, compute_types: Sequence[str] = COMPUTE_TYPES) -> Tuple[str, ...]:
+    """Compute types to benchmark for a profile: the profile's own unless it is in COMPUTE_TUNED_PROFILES."""
+    if profile in COMPUTE_TUNED_PROFILES:
+        return tuple(compute_types)
+    from python.audio_processing.whisper_handler import PROFILES
+
+    own = PROFILES[profile]["compute_type"]
+    if set(compute_types) != {own}:
+        logger.info(f"Profile '{profile}' keeps its {own} compute type; tuning its thread layout only")
+    return (own,)
+
+
+def thread_layouts(cores: int) -> List[Tuple[int, int]]:
+    """(cpu_threads, num_workers) splits to try: every power-of-two worker count that fits."""
+    layouts = []
+    workers = 1
+    while workers <= cores:
+        layouts.append((max(1, cores // workers), workers))
+        workers *= 2
+    return layouts
+
+
+def pick_best(results: Sequence[Dict[str, Any]], max_rss_mb: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Lowest real-time factor among successful runs within the memory limit; lower RSS breaks ties."""
+    candidates = [
+        result for result in results
+        if "error" not in result and (max_rss_mb is None or result["peak_rss_mb"] <= max_rss_mb)
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda result: (round(result["rtf"], 3), result["peak_rss_mb"]))
+
+
+def _benchmark(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one configuration; called in a fresh process so its peak RSS is its own."""
+    from faster_whisper import WhisperModel
+    from faster_whisper.audio import decode_audio
+
+    result = dict(config)
+    try:
+        audio = decode_audio(config["clip"], sampling_rate=16000)
+        started = time.monotonic()
+        model = WhisperModel(
+            config["model_size"],
+            compute_type=config["compute_type"],
+            cpu_threads=config["cpu_threads"],
+            num_workers=config["num_workers"]
+        )
+        result["load_seconds"] = round(time.monotonic() - started, 2)
+
+        def transcribe(_: int) -> None:
+            segments, _ = model.transcribe(audio, language="en", word_timestamps=True, **config["options"])
+            list(segments)
+
+        transcribe(0)  # warm-up, not timed
+        started = time.monotonic()
+        with ThreadPoolExecutor(config["num_workers"]) as pool:
+            list(pool.map(transcribe, range(config["num_workers"])))
+        elapsed = time.monotonic() - started
+        result["rtf"] = round(elapsed / (len(audio) / 16000 * config["num_workers"]), 4)
+    except Exception as e:
+        result["error"] = str(e)
+    # ru_maxrss is in kilobytes on Linux
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    del result["clip"], result["options"]
+    return result
+
+
+def benchmark_clip(path: Optional[str] = None) -> str:
+    """The clip to benchmark with; without a path, BENCHMARK_TEXT is synthesized once and kept."""
+    if path:
+        return path
+    clip = os.path.join(cache_dir(), "tune_clip.mp3")
+    if not os.path.exists(clip):
+        from python.audio_processing.edge_tts_handler import generate_speech
+
+        os.makedirs(cache_dir(), exist_ok=True)
+        generate_speech(BENCHMARK_TEXT, clip, "female")
+    return clip
+
+
+def tune(
+    clip: str,
+    profile: str,
+    model_size: str = "base",
+    compute_types: Sequence[str] = COMPUTE_TYPES,
+    max_rss_mb: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Benchmark every configuration and return the results and the winner.
+
+    Args:
+        clip (str): Speech clip (a few seconds to a minute).
+        profile (str): Profile whose decoding options are used.
+        model_size (str): Whisper model to benchmark.
+        compute_types: ctranslate2 compute types to try (see profile_compute_types).
+        max_rss_mb (float, optional): Skip configurations using more memory.
+    """
+    from python.audio_processing.whisper_handler import PROFILES
+
+    options = {name: PROFILES[profile][name] for name in ("beam_size", "best_of", "vad_filter")}
+    cores = os.cpu_count() or 1
+    configs = [
+        {
+            "clip": clip, "options": options, "model_size": model_size,
+            "compute_type": compute_type, "cpu_threads": cpu_threads, "num_workers": num_workers
+        }
+        for compute_type in profile_compute_types(profile, compute_types)
+        for cpu_threads, num_workers in thread_layouts(cores)
+    ]
+
+    results = []
+    # A fresh process per configuration; spawn keeps the parent's memory out of the RSS figures
+    context = multiprocessing.get_context("spawn")
+    for config in configs:
+        with context.Pool(1) as pool:
+            result = pool.apply(_benchmark, (config,))
+        results.append(result)
+        if "error" in result:
+            logger.warning(f"{result['compute_type']} {result['cpu_threads']}x{result['num_workers']}: {result['error']}")
+        else:
+            logger.info(
+                f"{result['compute_type']} threads={result['cpu_threads']} workers={result['num_workers']}: "
+                f"RTF {result['rtf']:.3f}, peak RSS {result['peak_rss_mb']:.0f}MB"
+            )
+    return {"results": results, "best": pick_best(results, max_rss_mb), "cpu_count": cores}
+
+
+def save_tuning(profile: str, best: Dict[str, Any], cpu_count: int, path: Optional[str] = None) -> str:
+    """Store the winning settings for a profile, keeping other profiles' entries."""
+    path = path or tuning_path()
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        data = {}
+    data.setdefault("profiles", {})[profile] = dict(best, cpu_count=cpu_count, tuned_at=int(time.time()))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main() -> int:
+    from python.audio_processing.whisper_handler import PROFILES, resolve_profile
+
+    parser = argparse.ArgumentParser(description="Benchmark Whisper settings on this host and save the fastest")
+    parser.add_argument("--clip", help="Speech clip to benchmark with (default: a synthesized sample)")
+    parser.add_argument("--profile", choices=list(PROFILES), default=None,
+                        help="Profile to tune (default: WHISPER_PROFILE or 'balanced')")
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--compute-type", action="append", choices=COMPUTE_TYPES,
+                        help="Compute type to try (repeatable, default: all; realtime profile only)")
+    parser.add_argument("--max-rss-mb", type=float, default=None,
+                        help="Ignore configurations whose peak memory exceeds this")
+    parser.add_argument("--output", default=None, help="Tuning file to write (default: WHISPER_TUNING_FILE)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    profile = resolve_profile(args.profile)
+    outcome = tune(
+        benchmark_clip(args.clip),
+        profile,
+        model_size=args.model_size,
+        compute_types=args.compute_type or COMPUTE_TYPES,
+        max_rss_mb=args.max_rss_mb
+    )
+    best = outcome["best"]
+    if best is None:
+        logger.error("No configuration completed within the limits")
+        return 1
+    path = save_tuning(profile, best, outcome["cpu_count"], args.output)
+    print(json.dumps(best, indent=2))
+    logger.info(f"Saved tuned settings for '{profile}' to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Cheap first pass, precise second pass only around lexicon hits.
+
+- transcribe_two_tier: a small model scans the whole file, and only the audio
+  around candidate hits is transcribed again with the full model.
+- transcribe_aligned_hits: the full model transcribes at segment level, and
+  only segments whose text contains a hit get word timestamps.
+
+Most media contains little or no profanity, so either costs roughly the
+cheap pass plus a few seconds of precise decoding per hit. Outside the
+refined windows the first-pass words are kept as they are.
+"""
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from python.audio_processing.audio_buffer import SAMPLING_RATE
+from python.text_processing.lexicon import Lexicon
+from python.text_processing.profanity_filter import filter_transcript
+from python.text_processing.transcript import Transcript
+
+logger = logging.getLogger(__name__)
+
+# Audio kept around a candidate hit on each side, in seconds, so the full
+# model sees the words in context
+WINDOW_PADDING = 2.0
+
+
+def candidate_windows(
+    scan: Transcript,
+    hits: Sequence[Dict[str, Any]],
+    duration: float,
+    padding: float = WINDOW_PADDING
+) -> List[Tuple[int, int, float, float]]:
+    """
+    Ranges of the scan to transcribe again.
+
+    Every hit is widened by padding and then to whole scan words; window edges
+    sit halfway between two words, so no word is cut. Overlapping or adjacent
+    windows are merged.
+
+    Args:
+        scan: Transcript of the cheap pass.
+        hits: Candidate matches with "start" and "end" in seconds.
+        duration (float): Length of the audio in seconds.
+        padding (float): Context added on both sides of a hit.
+
+    Returns:
+        List of (first word, last word, start, end) in time order; the words
+        first..last of the scan are replaced by the window's transcript.
+    """
+    starts = [word["start"] for word in scan]
+    ends = [word["end"] for word in scan]
+    n = len(scan)
+
+    ranges: List[Tuple[int, int]] = []
+    for hit in sorted(hits, key=lambda hit: hit["start"]):
+        first = bisect_right(ends, hit["start"] - padding)
+        last = bisect_left(starts, hit["end"] + padding) - 1
+        if first > last:
+            continue
+        if ranges and first <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], last))
+        else:
+            ranges.append((first, last))
+
+    windows = []
+    for first, last in ranges:
+        start = (ends[first - 1] + starts[first]) / 2 if first > 0 else 0.0
+        end = (ends[last] + starts[last + 1]) / 2 if last + 1 < n else duration
+        windows.append((first, last, start, end))
+    return windows
+
+
+def splice_windows(
+    scan: Transcript,
+    windows: Sequence[Tuple[int, int, float, float]],
+    verified: Sequence[Sequence[Dict[str, Any]]]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Replace the scan words of every window by that window's re-transcription.
+
+    Args:
+        scan: Transcript of the cheap pass.
+        windows: As returned by candidate_windows().
+        verified: Words of each window, timed relative to the window start.
+
+    Yields:
+        Dict: {"word", "start", "end"} in file time, in order.
+    """
+    position = 0
+    for (first, last, start, end), words in zip(windows, verified):
+        for i in range(position, first):
+            yield dict(scan[i])
+        for word in words:
+            # Keep the full model's words inside their window
+            word_start = min(round(word["start"] + start, 3), end)
+            word_end = max(min(round(word["end"] + start, 3), end), word_start)
+            yield {"word": word["word"], "start": word_start, "end": word_end}
+        position = last + 1
+    for i in range(position, len(scan)):
+        yield dict(scan[i])
+
+
+def transcribe_two_tier(
+    audio: np.ndarray,
+    scanner: Any,
+    verifier: Any,
+    lexicon: Lexicon,
+    language: Optional[str] = None,
+    fuzzy_distance: int = 0,
+    padding: float = WINDOW_PADDING
+) -> Transcript:
+    """
+    Scan 16 kHz audio with a small model and re-transcribe candidate hits with a large one.
+
+    Args:
+        audio: Decoded audio.
+        scanner: Transcriber for the whole file, e.g. a "tiny" WhisperTranscriber.
+        verifier: Transcriber for the windows around candidate hits.
+        lexicon: Words to look for; fuzzy matches count as candidates too.
+        language (str, optional): Force language. If None it is detected once
+            by the scanner and used for every window.
+        fuzzy_distance (int): Edit distance for candidate hits in the scan.
+        padding (float): Seconds of context around each hit.
+
+    Returns:
+        Transcript: Scan words, with the full model's words around every hit.
+    """
+    duration = len(audio) / SAMPLING_RATE
+    if language is None and hasattr(scanner, "detect_language"):
+        language = scanner.detect_language(audio)
+    scan = scanner.transcribe_audio(audio, language=language)
+
+    hits = filter_transcript(
+        scan,
+        engine="tokens" if fuzzy_distance > 0 else "text",
+        lexicon=lexicon,
+        fuzzy_distance=fuzzy_distance
+    ) or []
+    windows = candidate_windows(scan, hits, duration, padding)
+    verified = [
+        verifier.transcribe_audio(audio[int(start * SAMPLING_RATE):int(end * SAMPLING_RATE)], language=language)
+        for _, _, start, end in windows
+    ]
+    seconds = sum(end - start for _, _, start, end in windows)
+    logger.info(
+        f"Two-tier transcription: {len(hits)} candidate hits, "
+        f"{seconds:.1f}s of {duration:.1f}s re-transcribed in {len(windows)} windows"
+    )
+    return Transcript.from_words(splice_windows(scan, windows, verified))
+
+
+def rough_words(segments: Sequence[Dict[str, Any]]) -> Tuple[Transcript, List[int]]:
+    """
+    Split segment texts into words with estimated times.
+
+    Each segment's duration is shared among its words in proportion to their
+    length - good enough to find hits, not to cut audio.
+
+    Args:
+        segments: {"word": segment text, "start", "end"} per segment.
+
+    Returns:
+        The word transcript, and the index of every segment's first word
+        (plus the total word count).
+    """
+    words: List[Dict[str, Any]] = []
+    first_word = [0]
+    for segment in segments:
+        tokens = [" " + token for token in segment["word"].split()]
+        start, end = segment["start"], segment["end"]
+        per_char = (end - start) / max(sum(len(token) for token in tokens), 1)
+        position = start
+        for token in tokens:
+            word_end = min(position + per_char * len(token), end)
+            words.append({"word": token, "start": position, "end": word_end})
+            position = word_end
+        first_word.append(len(words))
+    return Transcript.from_words(words), first_word
+
+
+def transcribe_aligned_hits(
+    audio: np.ndarray,
+    transcriber: Any,
+    lexicon: Lexicon,
+    language: Optional[str] = None,
+    fuzzy_distance: int = 0
+) -> Transcript:
+    """
+    Transcribe at segment level and word-align only segments that contain a hit.
+
+    Args:
+        audio: Decoded 16 kHz audio.
+        transcriber: Provides transcribe_segments() for the whole file and
+            transcribe_audio() for the segments to align.
+        lexicon: Words to look for; fuzzy matches count as hits too.
+        language (str, optional): Force language. If None it is detected once
+            (when the transcriber can) and used for every segment.
+        fuzzy_distance (int): Edit distance for hits in the segment text.
+
+    Returns:
+        Transcript: Aligned words in segments with hits, estimated ones elsewhere.
+    """
+    duration = len(audio) / SAMPLING_RATE
+    if language is None and hasattr(transcriber, "detect_language"):
+        language = transcriber.detect_language(audio)
+    segments = transcriber.transcribe_segments(audio, language=language)
+    rough, first_word = rough_words(segments)
+
+    hits = filter_transcript(
+        rough,
+        engine="tokens" if fuzzy_distance > 0 else "text",
+        lexicon=lexicon,
+        fuzzy_distance=fuzzy_distance
+    ) or []
+    # Segments containing a hit, with edges halfway into the pauses around them
+    windows = [
+        (first_word[first], first_word[last + 1] - 1, start, end)
+        for first, last, start, end in candidate_windows(segments, hits, duration, padding=0.0)
+    ]
+    aligned = [
+        transcriber.transcribe_audio(audio[int(start * SAMPLING_RATE):int(end * SAMPLING_RATE)], language=language)
+        for _, _, start, end in windows
+    ]
+    seconds = sum(end - start for _, _, start, end in windows)
+    logger.info(
+        f"Word alignment for {len(windows)} of {len(segments)} segments "
+        f"({seconds:.1f}s of {duration:.1f}s), {len(hits)} hits"
+    )
+    return Transcript.from_words(splice_windows(rough, windows, aligned))
@@ -1,54 +1,470 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 from pathlib import Path
 import logging
-from faster_whisper import WhisperModel
+import os
+import threading
+import time
+import numpy as np
+from python.audio_processing.audio_buffer import load_audio
+from python.audio_processing.model_server import ModelClient
+from python.audio_processing.tune import load_tuned_settings
+from python.audio_processing.chunked_transcription import (
+    DEFAULT_CHUNK_SECONDS, SAMPLING_RATE, transcribe_chunked
+)
+from python.text_processing.transcript import Transcript
+from python.utils.disk_cache import DiskLRUCache, cache_dir, content_key
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default size bound of the on-disk transcript cache
+DEFAULT_TRANSCRIPT_CACHE_MB = 512
+
+# Named speed/accuracy trade-offs: ctranslate2 settings plus decoding options
+# for transcribe(). "balanced" keeps faster-whisper's default beam search.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "realtime": {"compute_type": "int8", "cpu_threads": 2, "beam_size": 1, "best_of": 1, "vad_filter": True},
+    "balanced": {"compute_type": "int8", "cpu_threads": 1, "beam_size": 5, "best_of": 5, "vad_filter": False},
+    "accurate": {"compute_type": "float32", "cpu_threads": 2, "beam_size": 8, "best_of": 5, "vad_filter": False},
+}
+DEFAULT_PROFILE = "balanced"
+_DECODE_OPTIONS = ("beam_size", "best_of", "vad_filter")
+
+def _load_whisper_model(model_size: str, **kwargs) -> Any:
+    # faster-whisper (and ctranslate2) are imported on the model-loading path
+    # only, so processes that use a model server never import them
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(model_size, **kwargs)
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """
+    Validate a profile name; None means WHISPER_PROFILE or "balanced".
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    name = (profile or os.environ.get("WHISPER_PROFILE") or DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown transcription profile {profile!r} (expected one of {', '.join(PROFILES)})")
+    return name
+
+def transcript_cache() -> DiskLRUCache:
+    """
+    Transcript cache configured from the environment.
+
+    TRANSCRIPT_CACHE_DIR overrides the location (default: "transcripts" in the
+    lexicon cache directory); TRANSCRIPT_CACHE_MB bounds its size, 0 disables it.
+    """
+    directory = os.environ.get("TRANSCRIPT_CACHE_DIR") or os.path.join(cache_dir(), "transcripts")
+    max_mb = float(os.environ.get("TRANSCRIPT_CACHE_MB", DEFAULT_TRANSCRIPT_CACHE_MB))
+    return DiskLRUCache(directory, int(max_mb * 1024 * 1024), suffix=".ptx")
+
+def prepare_audio(audio_path: Union[str, np.ndarray]) -> np.ndarray:
+    """
+    16 kHz samples of a media file (or the samples themselves).
+
+    Files are always decoded with audio_buffer.load_audio, the decoder
+    process_video uses too, so every tool gets the same samples - and the same
+    transcript cache key - for the same upload.
+
+    Raises:
+        FileNotFoundError: If the file is missing.
+    """
+    if isinstance(audio_path, np.ndarray):
+        return audio_path
+    if not Path(audio_path).exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    return load_audio(audio_path, SAMPLING_RATE)
+
+def transcript_key(
+    audio: np.ndarray,
+    model_size: str,
+    compute_type: str,
+    language: Optional[str],
+    kind: str,
+    decode_options: Dict[str, Any]
+) -> str:
+    """Transcript cache key: decoded samples plus everything that changes the decode."""
+    return content_key(memoryview(audio), model_size, compute_type, language, kind, sorted(decode_options.items()))
+
+def _describe(audio: Union[str, np.ndarray]) -> str:
+    """Log label for a path or an in-memory buffer."""
+    if isinstance(audio, np.ndarray):
+        return f"{len(audio) / SAMPLING_RATE:.1f}s in-memory audio"
+    return audio
+
 class WhisperTranscriber:
-    """Handles audio transcription using FasterWhisper with word-level timestamps."""
+    """
+    Handles audio transcription using FasterWhisper with word-level timestamps.
+
+    One instance can be shared by many threads: the model is loaded once with
+    `concurrency` ctranslate2 workers, so that many transcriptions decode in
+    parallel on one copy of the weights. Callers beyond that wait their turn.
+    """
     
-    def __init__(self, model_size: str = "base", compute_type: str = "int8"):
-        self.model = WhisperModel(model_size, compute_type=compute_type, cpu_threads=1)
+    def __init__(
+        self,
+        model_size: str = "base",
+        compute_type: str = "int8",
+        cache: Optional[DiskLRUCache] = None,
+        workers: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        cpu_threads: int = 1,
+        decode_options: Optional[Dict[str, Any]] = None
+    ):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        # Extra transcribe() arguments, e.g. beam_size (see PROFILES)
+        self.decode_options = dict(decode_options or {})
+        # Processes for chunked transcription of long files (1 = decode sequentially here)
+        self.workers = workers or int(os.environ.get("WHISPER_WORKERS", "1"))
+        # Transcriptions running at once on the shared model
+        self.concurrency = max(1, concurrency or int(os.environ.get("WHISPER_CONCURRENCY", "1")))
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self.model = _load_whisper_model(
+            model_size,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=self.concurrency
+        )
+        # Transcripts keyed by decoded audio content, so a re-upload skips Whisper
+        self.cache = cache if cache is not None else transcript_cache()
         logger.info(f"Loaded Whisper model: {model_size} with {compute_type} precision")
 
-    def transcribe_audio(self, audio_path: str, language: str = None) -> List[Dict[str, Any]]:
+    @classmethod
+    def from_profile(cls, profile: Optional[str] = None, model_size: str = "base", **kwargs) -> "WhisperTranscriber":
+        """
+        Transcriber configured by one of PROFILES.
+
+        Settings saved by `python -m python.audio_processing.tune` for this
+        profile and model replace the profile's thread count (and, for
+        "realtime" only, its compute type), and set the concurrency unless
+        WHISPER_CONCURRENCY does.
+        """
+        name = resolve_profile(profile)
+        settings = PROFILES[name]
+        tuned = load_tuned_settings(name, model_size)
+        if tuned:
+            logger.info(f"Using tuned settings for '{name}': {tuned}")
+            if "concurrency" not in kwargs and not os.environ.get("WHISPER_CONCURRENCY"):
+                kwargs["concurrency"] = tuned.get("num_workers")
+        return cls(
+            model_size,
+            compute_type=tuned.get("compute_type", settings["compute_type"]),
+            cpu_threads=tuned.get("cpu_threads", settings["cpu_threads"]),
+            decode_options={option: settings[option] for option in _DECODE_OPTIONS},
+            **kwargs
+        )
+
+    def _prepare(
+        self,
+        audio_path: Union[str, np.ndarray],
+        language: Optional[str],
+        kind: str = "word_timestamps"
+    ) -> Tuple[np.ndarray, str]:
+        """Decode the audio once (unless already decoded) and derive its transcript cache key."""
+        audio = prepare_audio(audio_path)
+        key = transcript_key(audio, self.model_size, self.compute_type, language, kind, self.decode_options)
+        return audio, key
+
+    def _cached(self, key: str) -> Optional[Transcript]:
+        path = self.cache.get(key)
+        if path is None:
+            return None
+        try:
+            return Transcript.load(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached transcript {path}: {e}")
+            return None
+
+    def detect_language(self, audio: np.ndarray) -> str:
+        """Language of the opening 30 seconds of 16 kHz audio."""
+        # transcribe() detects the language up front; the segments are never decoded
+        _, info = self.model.transcribe(audio[:30 * SAMPLING_RATE])
+        return info.language
+
+    def _decode_words(self, audio: np.ndarray, language: Optional[str]) -> Iterator[Dict[str, Any]]:
+        waited = time.monotonic()
+        # Held until the last word is out (or the consumer closes the generator)
+        with self._slots:
+            waited = time.monotonic() - waited
+            if waited > 1:
+                logger.info(f"Waited {waited:.1f}s for a free transcription slot")
+            yield from self._run_model(audio, language)
+
+    def _run_model(self, audio: np.ndarray, language: Optional[str]) -> Iterator[Dict[str, Any]]:
+        if self.workers > 1 and len(audio) > 2 * DEFAULT_CHUNK_SECONDS * SAMPLING_RATE:
+            if language is None:
+                # Detect once on the opening audio so every chunk uses the same language
+                language = self.detect_language(audio)
+            yield from transcribe_chunked(
+                audio, self.model_size, self.compute_type, language, self.workers,
+                options=self.decode_options, cpu_threads=self.cpu_threads
+            )
+            return
+
+        segments, _ = self.model.transcribe(
+            audio,
+            language=language,
+            word_timestamps=True,
+            **self.decode_options
+        )
+        for segment in segments:
+            for word in segment.words:
+                yield {"word": word.word, "start": word.start, "end": word.end}
+
+    def transcribe_audio(self, audio_path: Union[str, np.ndarray], language: str = None) -> Transcript:
         """
         Transcribe audio and return words with timestamps.
         
         Args:
-            audio_path (str): Path to audio file (WAV/MP3).
+            audio_path: Path to audio file (WAV/MP3), or 16 kHz float32 samples
+                already in memory (see audio_buffer.load_audio).
             language (str, optional): Force language (e.g., "en"). Faster if known.
         
         Returns:
-            List[Dict]: [{"word": str, "start": float, "end": float}]
+            Transcript: Sequence of {"word": str, "start": float, "end": float} words.
         
         Raises:
             FileNotFoundError: If audio file missing.
             RuntimeError: Transcription failed.
         """
-        if not Path(audio_path).exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-
         try:
-            segments, _ = self.model.transcribe(
-                audio_path,
-                language=language,
-                word_timestamps=True
-            )
-            transcript = [
-                {"word": word.word, "start": word.start, "end": word.end}
-                for segment in segments
-                for word in segment.words
-            ]
-            logger.info(f"Transcribed {len(transcript)} words from {audio_path}")
+            audio, key = self._prepare(audio_path, language)
+            transcript = self._cached(key)
+            if transcript is not None:
+                logger.info(f"Transcript cache hit: {len(transcript)} words for {_describe(audio_path)}")
+                return transcript
+
+            transcript = Transcript.from_words(self._decode_words(audio, language))
+            self.cache.put(key, transcript.save)
+            logger.info(f"Transcribed {len(transcript)} words from {_describe(audio_path)}")
             return transcript
 
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise RuntimeError(f"Whisper error: {e}")
+
+    def transcribe_segments(self, audio_path: Union[str, np.ndarray], language: str = None) -> Transcript:
+        """
+        Transcribe audio without word timestamps.
+
+        Skips faster-whisper's word alignment pass, which is a large part of
+        the decoding cost; see two_tier.transcribe_aligned_hits for aligning
+        only where it is needed.
+
+        Args:
+            audio_path: Path to audio file, or 16 kHz float32 samples.
+            language (str, optional): Force language (e.g., "en").
+
+        Returns:
+            Transcript: One entry per segment, its text in "word".
+
+        Raises:
+            FileNotFoundError: If audio file missing.
+            RuntimeError: Transcription failed.
+        """
+        try:
+            audio, key = self._prepare(audio_path, language, kind="segments")
+            segments = self._cached(key)
+            if segments is not None:
+                logger.info(f"Segment cache hit: {len(segments)} segments for {_describe(audio_path)}")
+                return segments
+
+            with self._slots:
+                decoded, _ = self.model.transcribe(audio, language=language, **self.decode_options)
+                segments = Transcript.from_words(
+                    {"word": segment.text, "start": segment.start, "end": segment.end}
+                    for segment in decoded
+                )
+            self.cache.put(key, segments.save)
+            logger.info(f"Transcribed {len(segments)} segments from {_describe(audio_path)}")
+            return segments
+
+        except FileNotFoundError:
+            raise
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             raise RuntimeError(f"Whisper error: {e}")
 
-# Singleton instance (avoids reloading model)
-transcriber = WhisperTranscriber()
\ No newline at end of file
+    def iter_words(self, audio_path: Union[str, np.ndarray], language: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield words with timestamps as faster-whisper decodes each segment.
+        
+        A cached transcript is replayed instead; a fully consumed decode is cached.
+        
+        Args:
+            audio_path: Path to audio file (WAV/MP3), or 16 kHz float32 samples
+                already in memory (see audio_buffer.load_audio).
+            language (str, optional): Force language (e.g., "en").
+        
+        Yields:
+            Dict: {"word": str, "start": float, "end": float}
+        
+        Raises:
+            FileNotFoundError: If audio file missing.
+        """
+        audio, key = self._prepare(audio_path, language)
+        transcript = self._cached(key)
+        if transcript is not None:
+            logger.info(f"Transcript cache hit: {len(transcript)} words for {_describe(audio_path)}")
+            for word in transcript:
+                yield dict(word)
+            return
+
+        words = []
+        for word in self._decode_words(audio, language):
+            words.append(word)
+            yield word
+        self.cache.put(key, Transcript.from_words(words).save)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Counters and size of the transcript cache."""
+        return self.cache.stats()
+
+def warmup_model(instance: WhisperTranscriber) -> None:
+    """Run one second of silence through a loaded model, so the first real request is not the slow one."""
+    segments, _ = instance.model.transcribe(
+        np.zeros(SAMPLING_RATE, dtype=np.float32), language="en", **instance.decode_options
+    )
+    list(segments)
+
+# Shared instances per profile, loaded on first use or by warmup() - never at import
+_transcribers: Dict[str, WhisperTranscriber] = {}
+_clients: Dict[str, ModelClient] = {}
+_transcriber_lock = threading.Lock()
+_ready = threading.Event()
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_error: Optional[str] = None
+# Seconds to wait before each retry of a failed warm-up; after the last one,
+# the next start_warmup() call (e.g. a readiness probe) starts over
+WARMUP_BACKOFF = (5.0, 15.0, 60.0)
+
+def load_transcriber(profile: Optional[str] = None) -> WhisperTranscriber:
+    """
+    Return this process's transcriber for a profile, loading its model on first call.
+
+    Every profile keeps its model, so switching between them never reloads one.
+    """
+    name = resolve_profile(profile)
+    instance = _transcribers.get(name)
+    if instance is None:
+        with _transcriber_lock:
+            instance = _transcribers.get(name)
+            if instance is None:
+                instance = WhisperTranscriber.from_profile(name)
+                _transcribers[name] = instance
+    return instance
+
+def get_transcriber(profile: Optional[str] = None) -> Union[WhisperTranscriber, ModelClient]:
+    """
+    Return the shared transcriber for a profile (see PROFILES), loading the model on first call.
+
+    With WHISPER_SERVER_SOCKET set this is a client of the model server
+    (see model_server.py) and no model is loaded in this process.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    socket_path = os.environ.get("WHISPER_SERVER_SOCKET")
+    if not socket_path:
+        return load_transcriber(profile)
+    name = resolve_profile(profile)
+    with _transcriber_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = ModelClient(socket_path, profile=name)
+            _clients[name] = client
+    return client
+
+_scan_transcriber: Optional[WhisperTranscriber] = None
+
+def get_scan_transcriber() -> WhisperTranscriber:
+    """
+    Return the small model used for the first pass of two-tier transcription.
+
+    WHISPER_SCAN_MODEL picks it (default "tiny"); it is always int8 and loaded
+    in this process on first call.
+    """
+    global _scan_transcriber
+    if _scan_transcriber is None:
+        with _transcriber_lock:
+            if _scan_transcriber is None:
+                _scan_transcriber = WhisperTranscriber(os.environ.get("WHISPER_SCAN_MODEL", "tiny"), "int8", workers=1)
+    return _scan_transcriber
+
+def is_ready() -> bool:
+    """
+    Whether warmup() finished: the default profile's model is loaded and has
+    run its first inference, or the model server answered. Never loads anything.
+    """
+    return _ready.is_set()
+
+def warmup() -> Union[WhisperTranscriber, ModelClient]:
+    """
+    Load the default profile's model and run one second of silence through it.
+
+    Meant for server start-up (see gunicorn.conf.py), so the first request
+    doesn't pay for the model load and the first inference. With a model
+    server this waits until the server answers instead.
+    """
+    started = time.monotonic()
+    instance = get_transcriber()
+    if isinstance(instance, ModelClient):
+        instance.wait_until_ready()
+        _ready.set()
+        logger.info(f"Model server ready after {time.monotonic() - started:.1f}s")
+        return instance
+    warmup_model(instance)
+    _ready.set()
+    logger.info(f"Whisper model warmed up in {time.monotonic() - started:.1f}s")
+    return instance
+
+def start_warmup() -> None:
+    """
+    Run warmup() in a background thread, so the caller can serve requests meanwhile.
+
+    Does nothing while a warm-up is running or once the model is ready; after
+    a warm-up gave up (see WARMUP_BACKOFF) it starts a new one.
+    """
+    global _warmup_thread
+    with _transcriber_lock:
+        if is_ready() or (_warmup_thread is not None and _warmup_thread.is_alive()):
+            return
+        _warmup_thread = threading.Thread(
+            target=_warmup_in_background, args=(WARMUP_BACKOFF,), name="whisper-warmup", daemon=True
+        )
+        _warmup_thread.start()
+
+def _warmup_in_background(backoff: Tuple[float, ...]) -> None:
+    global _warmup_error
+    for attempt, delay in enumerate((0.0,) + tuple(backoff), start=1):
+        time.sleep(delay)
+        try:
+            warmup()
+        except Exception as e:
+            _warmup_error = str(e)
+            logger.error(f"Whisper warm-up attempt {attempt} failed: {e}", exc_info=True)
+        else:
+            _warmup_error = None
+            return
+
+def readiness() -> Dict[str, Any]:
+    """Model state for a readiness probe: loading, ready or failed (and whether a retry is pending)."""
+    if is_ready():
+        return {"status": "ready"}
+    running = _warmup_thread is not None and _warmup_thread.is_alive()
+    if _warmup_error is not None:
+        return {"status": "failed", "error": _warmup_error, "retrying": running}
+    return {"status": "loading" if running else "not loaded"}
+
+def __getattr__(name: str) -> Any:
+    # Backward compatible "from whisper_handler import transcriber" - loads the model
+    if name == "transcriber":
+        return get_transcriber()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
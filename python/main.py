@@ -12,38 +12,26 @@ import os
 import subprocess
 import sys
 import gc
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Union
+import numpy as np
 
-from python.audio_processing.whisper_handler import transcriber
+from python.audio_processing.whisper_handler import PROFILES, get_scan_transcriber, get_transcriber
+from python.audio_processing.two_tier import transcribe_aligned_hits, transcribe_two_tier
+from python.audio_processing.vad_gate import VAD_METHODS, SpeechMap, detect_speech, gate_audio
 from python.audio_processing.edge_tts_handler import generate_speech
-from python.audio_processing.audio_replacer import replace_profanity_audio
+from python.audio_processing.audio_buffer import load_audio
+from python.audio_processing.audio_replacer import replace_profanity_audio_buffer
 from python.text_processing.profanity_filter import filter_transcript
+from python.text_processing.lexicon import Lexicon, get_lexicon
+from python.text_processing.transcript import Transcript
+from python.text_processing.streaming import StreamingFilter
 from python.utils.file_utils import create_dir_if_not_exists
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_audio(video_path: str, audio_path: str) -> None:
-    """Extract audio from video using ffmpeg with memory optimization"""
-    command = [
-        "ffmpeg", "-y", "-i", video_path,
-        "-vn",                    # No video
-        "-acodec", "pcm_s16le",   # Standard audio codec
-        "-ar", "16000",           # Lower sample rate for memory efficiency
-        "-ac", "1",               # Mono audio to reduce memory usage
-        "-f", "wav",              # Force WAV format
-        "-hide_banner", "-loglevel", "error",
-        "-threads", "1",          # Single thread to reduce memory usage
-        audio_path
-    ]
-    try:
-        subprocess.run(command, check=True)
-        logger.info(f"Successfully extracted audio to {audio_path}")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Audio extraction failed: {e.stderr.decode()}")
-        raise RuntimeError("Audio extraction failed")
-
 def create_final_video(original_video: str, censored_audio: str, output_path: str) -> None:
     """Directly merge video with censored audio with memory optimization"""
     try:
@@ -69,13 +57,78 @@ def create_final_video(original_video: str, censored_audio: str, output_path: st
         logger.error(f"Merge failed: {e.stderr.decode()}")
         raise RuntimeError("Final video creation failed")
 
+def stream_transcribe_and_synthesize(
+    audio_path: Union[str, np.ndarray],
+    output_dir: str,
+    voice_gender: str = "female",
+    language: str = None,
+    lexicon: Optional[Lexicon] = None,
+    fuzzy_distance: int = 0,
+    profile: Optional[str] = None,
+    speech_map: Optional[SpeechMap] = None
+) -> Tuple[Transcript, List[Dict[str, Any]]]:
+    """Transcribe, filter and synthesize replacements concurrently.
+
+    Words are fed to a StreamingFilter as Whisper decodes them, and each
+    replacement is handed to a TTS worker as soon as it is final, so speech
+    synthesis overlaps with the rest of the transcription.
+
+    With a speech_map, audio_path is VAD-gated audio and word times are
+    mapped back to the original file before filtering.
+    """
+    transcript = []
+    profane_segments = []
+    pending_speech = []
+    stream = StreamingFilter(lexicon=lexicon, fuzzy_distance=fuzzy_distance)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts") as tts_pool:
+        def synthesize(entries: List[Dict[str, Any]]) -> None:
+            for entry in entries:
+                out_path = os.path.join(output_dir, f"replacement_{len(profane_segments)}.mp3")
+                logger.info(f"Generating replacement {len(profane_segments) + 1}: '{entry['replacement']}'")
+                entry["replacement_audio"] = out_path
+                profane_segments.append(entry)
+                pending_speech.append(tts_pool.submit(generate_speech, entry["replacement"], out_path, voice_gender))
+
+        words = get_transcriber(profile).iter_words(audio_path, language=language)
+        if speech_map is not None:
+            words = speech_map.remap_words(words)
+        for word in words:
+            transcript.append(word)
+            synthesize(stream.feed(word))
+        synthesize(stream.flush())
+
+        for future in pending_speech:
+            future.result()
+
+    return Transcript.from_words(transcript), profane_segments
+
 def process_video(
     video_path: str,
     output_dir: str,
     voice_gender: str = "female",
-    language: str = None
+    language: str = None,
+    fuzzy_distance: int = 0,
+    stream: bool = False,
+    min_severity: Any = None,
+    exclude_categories: Optional[List[str]] = None,
+    lexicon: Optional[Lexicon] = None,
+    two_tier: bool = False,
+    word_timestamps: str = "all",
+    profile: Optional[str] = None,
+    vad: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Pipeline: Video → Audio → Transcript → Filtered Audio → Final Video."""
+    """
+    Pipeline: Video → Audio → Transcript → Filtered Audio → Final Video.
+
+    With two_tier a tiny model transcribes the file and only the audio around
+    candidate hits goes through the full model. With word_timestamps="hits"
+    the file is transcribed at segment level and only segments containing a
+    hit are word-aligned. Neither mode streams. profile picks the speed/accuracy
+    trade-off of the full model (see whisper_handler.PROFILES). vad ("silero"
+    or "energy") passes only detected speech to Whisper; the result's "vad"
+    entry then reports how many seconds were skipped.
+    """
     logger.info("Starting video processing pipeline...")
     
     # Convert to absolute paths
@@ -104,60 +157,116 @@ def process_video(
             except:
                 pass
     
+    # Pin the lexicon for this job so a hot reload can't change it mid-run
+    lexicon = (lexicon or get_lexicon()).select(
+        min_severity=min_severity,
+        exclude_categories=exclude_categories
+    )
+    
     # Force garbage collection at start
     gc.collect()
     
-    # Step 1: Extract audio
-    logger.info("Step 1: Extracting audio from video...")
-    audio_path = os.path.join(output_dir, "extracted.wav")
-    extract_audio(video_path, audio_path)
-    logger.info("Audio extraction completed")
+    # Step 1: Decode audio into memory; the same buffer feeds Whisper and the splicing
+    logger.info("Step 1: Decoding audio from video...")
+    audio = load_audio(video_path)
+    logger.info("Audio decoding completed")
     
     # Force garbage collection after audio extraction
     gc.collect()
 
-    # Step 2: Transcribe
-    logger.info("Step 2: Starting Whisper AI transcription (this may take several minutes)...")
-    transcript = transcriber.transcribe_audio(audio_path, language=language)
-    logger.info(f"Transcription completed - {len(transcript)} words processed")
+    # Optional VAD gate: Whisper only hears the speech, word times are mapped back to the file
+    speech_map = None
+    speech_audio = audio
+    if vad:
+        logger.info(f"Detecting speech ({vad} VAD)...")
+        speech_audio, speech_map = gate_audio(audio, detect_speech(audio, vad))
+
+    if speech_map is not None and not speech_map.lengths:
+        logger.info("No speech detected - skipping transcription")
+        transcript, profane_segments = Transcript(), []
+    elif stream and not two_tier and word_timestamps == "all":
+        # Steps 2-4 overlap: replacement speech is generated while Whisper is still decoding
+        logger.info("Steps 2-4: Streaming transcription, filtering and replacement audio...")
+        transcript, profane_segments = stream_transcribe_and_synthesize(
+            speech_audio,
+            output_dir,
+            voice_gender=voice_gender,
+            language=language,
+            lexicon=lexicon,
+            fuzzy_distance=fuzzy_distance,
+            profile=profile,
+            speech_map=speech_map
+        )
+        logger.info(f"Streaming completed - {len(transcript)} words, {len(profane_segments)} segments found")
+        gc.collect()
+    else:
+        # Step 2: Transcribe
+        logger.info("Step 2: Starting Whisper AI transcription (this may take several minutes)...")
+        if two_tier:
+            transcript = transcribe_two_tier(
+                speech_audio,
+                get_scan_transcriber(),
+                get_transcriber(profile),
+                lexicon,
+                language=language,
+                fuzzy_distance=fuzzy_distance
+            )
+        elif word_timestamps == "hits":
+            transcript = transcribe_aligned_hits(
+                speech_audio,
+                get_transcriber(profile),
+                lexicon,
+                language=language,
+                fuzzy_distance=fuzzy_distance
+            )
+        else:
+            transcript = get_transcriber(profile).transcribe_audio(speech_audio, language=language)
+        if speech_map is not None:
+            transcript = speech_map.remap(transcript)
+        logger.info(f"Transcription completed - {len(transcript)} words processed")
     
-    # Force garbage collection after transcription
-    gc.collect()
+        # Force garbage collection after transcription
+        gc.collect()
     
-    # Clear any cached data
-    import psutil
-    process = psutil.Process()
-    if hasattr(process, 'memory_info'):
-        logger.info(f"Memory usage after transcription: {process.memory_info().rss / 1024 / 1024:.1f}MB")
+        # Clear any cached data
+        import psutil
+        process = psutil.Process()
+        if hasattr(process, 'memory_info'):
+            logger.info(f"Memory usage after transcription: {process.memory_info().rss / 1024 / 1024:.1f}MB")
 
-    # Step 3: Filter profanity
-    logger.info("Step 3: Filtering profanity...")
-    profane_segments = filter_transcript(transcript) or []
-    logger.info(f"Profanity filtering completed - {len(profane_segments)} segments found")
+        # Step 3: Filter profanity
+        logger.info("Step 3: Filtering profanity...")
+        profane_segments = filter_transcript(
+            transcript,
+            engine="tokens" if fuzzy_distance > 0 else "text",
+            lexicon=lexicon,
+            fuzzy_distance=fuzzy_distance
+        ) or []
+        logger.info(f"Profanity filtering completed - {len(profane_segments)} segments found")
     
-    # Force garbage collection after filtering
-    gc.collect()
-
-    # Step 4: Generate replacement audio
-    logger.info(f"Step 4: Generating replacement audio for {len(profane_segments)} segments...")
-    for idx, entry in enumerate(profane_segments):
-        logger.info(f"Generating replacement {idx + 1}/{len(profane_segments)}: '{entry['replacement']}'")
-        out_path = os.path.join(output_dir, f"replacement_{idx}.mp3")
-        generate_speech(entry["replacement"], out_path, voice_gender)
-        entry["replacement_audio"] = out_path
-        # Force garbage collection after each audio generation
+        # Force garbage collection after filtering
         gc.collect()
-    logger.info("Replacement audio generation completed")
+
+        # Step 4: Generate replacement audio
+        logger.info(f"Step 4: Generating replacement audio for {len(profane_segments)} segments...")
+        for idx, entry in enumerate(profane_segments):
+            logger.info(f"Generating replacement {idx + 1}/{len(profane_segments)}: '{entry['replacement']}'")
+            out_path = os.path.join(output_dir, f"replacement_{idx}.mp3")
+            generate_speech(entry["replacement"], out_path, voice_gender)
+            entry["replacement_audio"] = out_path
+            # Force garbage collection after each audio generation
+            gc.collect()
+        logger.info("Replacement audio generation completed")
 
     # Step 5: Create censored audio
     logger.info("Step 5: Creating censored audio...")
     censored_audio = os.path.join(output_dir, "censored_audio.wav")
-    replace_profanity_audio(
-        original_audio=audio_path,
+    replace_profanity_audio_buffer(
+        audio,
         replacements=profane_segments,
-        output_audio_file=censored_audio,
-        temp_dir=os.path.join(output_dir, "temp_audio")
+        output_audio_file=censored_audio
     )
+    del audio, speech_audio
     logger.info("Censored audio creation completed")
     
     # Force garbage collection before final video creation
@@ -185,7 +294,8 @@ def process_video(
         "transcript": transcript,
         "profane_segments": profane_segments,
         "final_video": final_video,
-        "censored_audio": censored_audio
+        "censored_audio": censored_audio,
+        "vad": speech_map.stats() if speech_map is not None else None
     }
 
 if __name__ == "__main__":
@@ -196,15 +306,51 @@ if __name__ == "__main__":
     parser.add_argument("output_dir", help="Output directory path")
     parser.add_argument("--gender", choices=["male", "female"], default="female")
     parser.add_argument("--language", help="Force language (e.g., 'en')", default=None)
+    parser.add_argument("--fuzzy", type=int, default=0,
+                        help="Also catch misrecognized words within this edit distance (0 = exact only)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Generate replacement speech while transcription is still running")
+    parser.add_argument("--min-severity", default=None,
+                        help="Only censor words at least this severe: mild, strong, severe or a 1-3 rating")
+    parser.add_argument("--exclude-category", action="append", default=[],
+                        help="Leave words of this category uncensored (repeatable, e.g. 'religious-offense')")
+    parser.add_argument("--two-tier", action="store_true",
+                        help="Scan with a tiny model and re-transcribe only around candidate hits with the full model")
+    parser.add_argument("--word-timestamps", choices=["all", "hits"], default="all",
+                        help="Align every word, or only words in segments that contain a lexicon hit")
+    parser.add_argument("--profile", choices=list(PROFILES), default=None,
+                        help="Transcription speed/accuracy profile (default: WHISPER_PROFILE or 'balanced')")
+    parser.add_argument("--vad", choices=list(VAD_METHODS), default=None,
+                        help="Transcribe only detected speech (silero: faster-whisper's VAD, energy: loudness)")
+    parser.add_argument("--transcript-out", default=None,
+                        help="Save the transcript in binary form (.npz for a numpy archive) instead of printing it")
     args = parser.parse_args()
 
+    # Reject a misspelled category or severity before any decoding starts
+    try:
+        lexicon = get_lexicon().select(min_severity=args.min_severity, exclude_categories=args.exclude_category)
+    except ValueError as e:
+        parser.error(str(e))
+
     try:
         result = process_video(
             args.video_path,
             args.output_dir,
             voice_gender=args.gender,
-            language=args.language
+            language=args.language,
+            fuzzy_distance=args.fuzzy,
+            stream=args.stream,
+            lexicon=lexicon,
+            two_tier=args.two_tier,
+            word_timestamps=args.word_timestamps,
+            profile=args.profile,
+            vad=args.vad
         )
+        if args.transcript_out:
+            result["transcript"].save(args.transcript_out)
+            result["transcript"] = args.transcript_out
+        else:
+            result["transcript"] = result["transcript"].to_list()
         print(json.dumps(result, indent=2))
         logger.info(f"Final video saved to: {result['final_video']}")
     except Exception as e:
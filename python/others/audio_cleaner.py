@@ -11,9 +11,10 @@ from python.audio_processing.audio_cleaner import process_audio
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def process_audio_standalone(audio_path: str, output_dir: str, voice_gender: str = "female"):
+def process_audio_standalone(audio_path: str, output_dir: str, voice_gender: str = "female", lexicon=None, profile=None):
     """Process audio file to clean profanity and return result dict."""
     try:
+        source_path = audio_path
         # If input is video, extract audio first
         if audio_path.lower().endswith(('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm')):
             from python.audio_processing.audio_cleaner import extract_audio_from_video
@@ -22,7 +23,10 @@ def process_audio_standalone(audio_path: str, output_dir: str, voice_gender: str
         result = process_audio(
             audio_path=audio_path,
             output_dir=output_dir,
-            voice_gender=voice_gender
+            voice_gender=voice_gender,
+            lexicon=lexicon,
+            profile=profile,
+            source_path=source_path
         )
         logger.info(f"Cleaned audio saved: {result['cleaned_audio']}")
         return result
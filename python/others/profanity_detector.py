@@ -6,27 +6,19 @@ Usage: python profanity_detector.py input.mp4|input.wav
 import argparse
 import logging
 import os
-from python.audio_processing.whisper_handler import transcriber
-from python.audio_processing.audio_cleaner import extract_audio_from_video
+from python.audio_processing.whisper_handler import get_transcriber
 from python.text_processing.profanity_filter import filter_transcript
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def detect_profanity(input_path: str):
+def detect_profanity(input_path: str, lexicon=None, profile=None):
     """Detect profanity in media file and return analysis data."""
     try:
-        # Extract audio if input is video
-        if input_path.lower().endswith(('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm')):
-            # Create temporary output dir for audio extraction
-            temp_dir = os.path.dirname(input_path)
-            audio_path = extract_audio_from_video(input_path, temp_dir)
-        else:
-            audio_path = input_path
-        
-        # Transcribe and analyze
-        transcript = transcriber.transcribe_audio(audio_path)
-        profanity_report = filter_transcript(transcript)
+        # Transcribe the upload itself (video or audio) - the same samples as
+        # the other tools decode, so they share one cached transcript
+        transcript = get_transcriber(profile).transcribe_audio(input_path)
+        profanity_report = filter_transcript(transcript, lexicon=lexicon)
         
         # Calculate statistics
         total_words = len(transcript)
@@ -50,13 +42,6 @@ def detect_profanity(input_path: str):
                 'duration': round((item['end'] + 0.35) - item['start'], 2)
             })
         
-        # Clean up extracted audio if it was created
-        if audio_path != input_path and os.path.exists(audio_path):
-            try:
-                os.remove(audio_path)
-            except:
-                pass
-        
         return {
             'success': True,
             'total_words': total_words,
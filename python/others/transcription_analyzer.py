@@ -6,24 +6,18 @@ Usage: python transcription_analyzer.py input.mp4|input.wav [--pdf]
 import argparse
 import logging
 import os
-from python.audio_processing.whisper_handler import transcriber
-from python.audio_processing.audio_cleaner import extract_audio_from_video
+from python.audio_processing.whisper_handler import get_transcriber
 from python.text_processing.profanity_filter import filter_transcript
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def generate_transcription_pdf(input_path: str, output_dir: str, unique_filename: str):
+def generate_transcription_pdf(input_path: str, output_dir: str, unique_filename: str, profile=None):
     """Generate PDF transcript with profanity marked."""
     try:
-        # Extract audio if input is video
-        if input_path.lower().endswith(('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm')):
-            audio_path = extract_audio_from_video(input_path, output_dir)
-        else:
-            audio_path = input_path
-        
-        # Transcribe audio
-        transcript = transcriber.transcribe_audio(audio_path)
+        # Transcribe the upload itself (video or audio) - the same samples as
+        # the other tools decode, so they share one cached transcript
+        transcript = get_transcriber(profile).transcribe_audio(input_path)
         profanity_report = filter_transcript(transcript)
         
         # Generate PDF
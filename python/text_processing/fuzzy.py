@@ -0,0 +1,148 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters people (and some ASR post-processing) use to mask letters, e.g. "sh*t"
+MASK_CHARS = "*#"
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by deleting up to max_distance characters."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between a and b, stopping early.
+
+    Returns max_distance + 1 as soon as the distance is known to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Approximate lookup of single lexicon words (SymSpell-style deletion index).
+
+    Every lexicon word is stored under all of its deletion variants up to
+    max_distance, so a query only generates its own deletions and verifies the
+    few candidates that share one - no scan over the lexicon.
+
+    Misrecognitions collide with ordinary speech ("batch" vs "bitch", "booby"
+    vs "boobs"), so a match by edit distance needs all of:
+
+    - query and lexicon word at least min_length long,
+    - the same first letter (ASR rarely gets the onset wrong; "pitch" is not "bitch"),
+    - a query that is not an ordinary word from the dictionary.
+
+    Short words still match through masked letters ("sh*t").
+    """
+
+    def __init__(
+        self,
+        words: Dict[str, int],
+        max_distance: int = 1,
+        min_length: int = 5,
+        dictionary: Optional[Iterable[str]] = None
+    ):
+        """
+        Args:
+            words: Canonical lexicon word -> entry id.
+            max_distance (int): Maximum edit distance (or masked letters) for a match.
+            min_length (int): Shortest query or lexicon word that may match by edit distance.
+            dictionary: Ordinary words that are never matched approximately.
+        """
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self._words = dict(words)
+        self._dictionary = frozenset(dictionary or ()) - frozenset(self._words)
+        self._deletes: Dict[str, List[str]] = {}
+
+        for word in sorted(self._words, key=self._words.get):
+            for variant in _deletes(word, max_distance):
+                self._deletes.setdefault(variant, []).append(word)
+
+        logger.debug(
+            f"Fuzzy index: {len(self._words)} words, {len(self._deletes)} deletion variants "
+            f"(max distance {max_distance}), {len(self._dictionary)} dictionary words"
+        )
+
+    def lookup(self, token: str) -> Optional[Tuple[int, int]]:
+        """
+        Find the closest lexicon word to a canonical token.
+
+        Args:
+            token (str): Normalized, leet-folded token.
+
+        Returns:
+            Tuple[int, int]: (entry_id, distance) of the best match, or None.
+            Ties are broken by lexicon order.
+        """
+        if not token:
+            return None
+        if token in self._words:
+            return self._words[token], 0
+        if any(ch in MASK_CHARS for ch in token):
+            return self._lookup_masked(token)
+        if len(token) < self.min_length or token in self._dictionary:
+            return None
+
+        best: Optional[Tuple[int, int]] = None
+        seen: Set[str] = set()
+        for variant in _deletes(token, self.max_distance):
+            for word in self._deletes.get(variant, ()):
+                if word in seen:
+                    continue
+                seen.add(word)
+                if len(word) < self.min_length or word[0] != token[0]:
+                    continue
+                distance = edit_distance(token, word, self.max_distance)
+                if distance > self.max_distance:
+                    continue
+                candidate = (distance, self._words[word])
+                if best is None or candidate < best:
+                    best = candidate
+        if best is None:
+            return None
+        return best[1], best[0]
+
+    def _lookup_masked(self, token: str) -> Optional[Tuple[int, int]]:
+        """Match "sh*t"-style tokens: every unmasked letter must agree, at most max_distance masked."""
+        masked = sum(1 for ch in token if ch in MASK_CHARS)
+        if masked > self.max_distance or len(token) - masked < 2:
+            return None
+        # Deleting the masked letters gives a deletion variant of every word that fits
+        visible = "".join(ch for ch in token if ch not in MASK_CHARS)
+        for word in self._deletes.get(visible, ()):
+            if len(word) == len(token) and all(
+                ch in MASK_CHARS or ch == word[i] for i, ch in enumerate(token)
+            ):
+                return self._words[word], masked
+        return None
@@ -0,0 +1,614 @@
+import csv
+import hashlib
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from python.text_processing.fuzzy import FuzzyIndex
+from python.text_processing.matcher import PatternMatcher
+from python.text_processing.token_index import TokenIndex, fold_token, phrase_forms
+from python.utils.disk_cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Lexicon CSV shipped at the repository root; override with PROFANITY_LEXICON_PATH
+DEFAULT_LEXICON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "validated_profanity_replacements.csv"
+))
+
+# Variant spellings with their canonical forms; override with PROFANITY_VARIANTS_PATH
+DEFAULT_VARIANTS_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "badWords.csv"
+))
+
+# Ordinary words the fuzzy matcher must not flag; override with PROFANITY_DICTIONARY_PATH
+DEFAULT_DICTIONARY_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "common_words.txt"
+))
+
+# Bump whenever the pickled Lexicon layout changes
+CACHE_VERSION = 8
+
+# Named thresholds, matching the severity_description ranges in badWords.csv
+SEVERITY_LEVELS = {
+    "mild": 1.0,
+    "strong": 1.6,
+    "severe": 2.6,
+}
+
+# Compiled selections kept per lexicon, least recently used dropped first
+SELECTION_CACHE_SIZE = 16
+
+# Severity assumed for lexicon entries that badWords.csv does not rate ("Strong")
+DEFAULT_SEVERITY = 2.0
+
+# Always available, even without the CSV
+TEST_REPLACEMENTS = {
+    r'\bjeans\b': "pants",
+    r'\bshit\b': "crap",
+    r'\basshole\b': "jerk",
+    r'\bmother\s?fucker\b': "awesome person"
+}
+
+
+def lexicon_path() -> str:
+    """Absolute path of the lexicon CSV in use."""
+    return os.path.abspath(os.environ.get("PROFANITY_LEXICON_PATH", DEFAULT_LEXICON_PATH))
+
+
+def variants_path() -> str:
+    """Absolute path of the variant spelling CSV in use."""
+    return os.path.abspath(os.environ.get("PROFANITY_VARIANTS_PATH", DEFAULT_VARIANTS_PATH))
+
+
+def dictionary_path() -> str:
+    """Absolute path of the ordinary-word list in use."""
+    return os.path.abspath(os.environ.get("PROFANITY_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATH))
+
+
+def load_profanity_replacements(csv_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Load profanity replacements from a tab-separated CSV file.
+
+    Args:
+        csv_path (str, optional): Lexicon CSV. Defaults to lexicon_path().
+
+    Returns:
+        Dict[str, str]: Word-boundary regex pattern -> replacement word.
+    """
+    replacements = {}
+    skipped_numbers = 0
+    csv_path = csv_path or lexicon_path()
+
+    if os.path.exists(csv_path):
+        try:
+            with open(csv_path, 'r', encoding='utf-8') as file:
+                reader = csv.DictReader(file, delimiter='\t')
+                for row in reader:
+                    badword = (row.get('badword') or '').strip().lower()
+                    replacement = (row.get('replacement_word') or '').strip()
+                    # Transcripts write spoken numbers as digits, so a
+                    # digit-only entry ("55") would censor plain numbers
+                    if badword and not any(char.isalpha() for char in badword):
+                        skipped_numbers += 1
+                        continue
+                    if badword and replacement:
+                        # Create regex pattern for word boundaries
+                        pattern = r'\b' + re.escape(badword) + r'\b'
+                        replacements[pattern] = replacement
+            logger.info(f"Loaded {len(replacements)} replacements from {csv_path}")
+            if skipped_numbers:
+                logger.info(f"Skipped {skipped_numbers} entries without letters")
+        except Exception as e:
+            logger.error(f"Error loading {csv_path}: {e}")
+    else:
+        logger.warning(f"Lexicon file not found: {csv_path}")
+
+    # Merge test replacements with CSV replacements
+    for pattern, replacement in TEST_REPLACEMENTS.items():
+        if pattern not in replacements:
+            replacements[pattern] = replacement
+
+    return replacements
+
+
+def load_dictionary(path: Optional[str] = None) -> FrozenSet[str]:
+    """
+    Load the ordinary-word list used to veto fuzzy matches.
+
+    Args:
+        path (str, optional): One word per line, "#" starts a comment. Defaults
+            to dictionary_path().
+
+    Returns:
+        FrozenSet[str]: Lowercased words (empty if the file is missing).
+    """
+    path = path or dictionary_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return frozenset(
+                line.strip().lower() for line in file
+                if line.strip() and not line.lstrip().startswith('#')
+            )
+    except OSError as e:
+        logger.warning(f"Dictionary not loaded from {path}: {e}")
+        return frozenset()
+
+
+def parse_severity(value: Any) -> Optional[float]:
+    """
+    Turn a severity threshold ("severe", "2.2", 2.2, None) into a number.
+
+    Raises:
+        ValueError: If the value is neither a level name nor a number.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and value.strip().lower() in SEVERITY_LEVELS:
+        return SEVERITY_LEVELS[value.strip().lower()]
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Invalid severity {value!r}; use a number or one of {', '.join(SEVERITY_LEVELS)}"
+        )
+
+
+def category_slug(name: str) -> str:
+    """"sexual anatomy / sexual acts" -> "sexual-anatomy-sexual-acts"."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def _read_variant_rows(csv_path: Optional[str] = None) -> List[Dict[str, str]]:
+    csv_path = csv_path or variants_path()
+    if not os.path.exists(csv_path):
+        return []
+    try:
+        with open(csv_path, 'r', encoding='utf-8') as file:
+            return list(csv.DictReader(file))
+    except Exception as e:
+        logger.error(f"Error loading {csv_path}: {e}")
+        return []
+
+
+def load_variant_aliases(
+    csv_path: Optional[str] = None,
+    rows: Optional[List[Dict[str, str]]] = None
+) -> Dict[str, str]:
+    """
+    Load variant -> canonical spellings from badWords.csv.
+
+    Only variants with a single canonical form are used; compounds such as
+    "@ssfucker" (fuck + ass) have no one word to stand for.
+
+    Args:
+        csv_path (str, optional): Variants CSV. Defaults to variants_path().
+        rows (list, optional): Already-read CSV rows.
+
+    Returns:
+        Dict[str, str]: Lowercased variant -> lowercased canonical form.
+    """
+    aliases = {}
+    for row in _read_variant_rows(csv_path) if rows is None else rows:
+        variant = (row.get('text') or '').strip().lower()
+        canonical = (row.get('canonical_form_1') or '').strip().lower()
+        if variant and canonical and not (row.get('canonical_form_2') or '').strip():
+            aliases[variant] = canonical
+    return aliases
+
+
+def load_severity_ratings(
+    csv_path: Optional[str] = None,
+    rows: Optional[List[Dict[str, str]]] = None
+) -> Dict[str, Tuple[float, Tuple[str, ...]]]:
+    """
+    Load severity rating and category slugs per word from badWords.csv.
+
+    Args:
+        csv_path (str, optional): Variants CSV. Defaults to variants_path().
+        rows (list, optional): Already-read CSV rows.
+
+    Returns:
+        Dict[str, Tuple[float, Tuple[str, ...]]]: Lowercased word -> (severity, categories).
+    """
+    ratings = {}
+    for row in _read_variant_rows(csv_path) if rows is None else rows:
+        word = (row.get('text') or '').strip().lower()
+        try:
+            severity = float(row.get('severity_rating') or '')
+        except ValueError:
+            continue
+        categories = tuple(
+            category_slug(row[key]) for key in ('category_1', 'category_2', 'category_3')
+            if (row.get(key) or '').strip()
+        )
+        if word:
+            ratings[word] = (severity, categories)
+    return ratings
+
+
+def rate_entries(
+    patterns: Iterable[str],
+    ratings: Dict[str, Tuple[float, Tuple[str, ...]]]
+) -> Dict[str, Tuple[float, Tuple[str, ...]]]:
+    """
+    Attach a badWords.csv rating to each lexicon pattern.
+
+    A pattern is rated by its own spelling first, then by its leet-folded
+    spelling; unrated patterns get DEFAULT_SEVERITY and no categories.
+    """
+    folded = {}
+    for word, rating in ratings.items():
+        folded.setdefault(fold_token(word), rating)
+
+    rated = {}
+    for pattern in patterns:
+        spellings = []
+        for form in phrase_forms(pattern):
+            spellings += [" ".join(form), "".join(form)]
+        rating = next((ratings[w] for w in spellings if w in ratings), None)
+        if rating is None:
+            rating = next((folded[fold_token(w)] for w in spellings if fold_token(w) in folded), None)
+        rated[pattern] = rating or (DEFAULT_SEVERITY, ())
+    return rated
+
+
+# Guards the selection caches of all Lexicon objects (a lock can't be pickled with them)
+_selection_lock = threading.Lock()
+
+
+class Lexicon:
+    """A loaded lexicon together with its compiled matchers."""
+
+    def __init__(
+        self,
+        patterns: Dict[str, str],
+        source: str = "",
+        fingerprint: str = "",
+        aliases: Optional[Dict[str, str]] = None,
+        ratings: Optional[Dict[str, Tuple[float, Tuple[str, ...]]]] = None,
+        categories: Optional[Iterable[str]] = None
+    ):
+        self.patterns = patterns
+        self.source = source
+        self.fingerprint = fingerprint
+        self.ratings = {
+            pattern: (ratings or {}).get(pattern, (DEFAULT_SEVERITY, ())) for pattern in patterns
+        }
+        # Every category a request may name: all of badWords.csv, even those no entry here uses
+        self.categories = frozenset(categories or ()) | frozenset(
+            c for _, entry_categories in self.ratings.values() for c in entry_categories
+        )
+        self.matcher = PatternMatcher(patterns)
+        self.token_index = TokenIndex(patterns, aliases)
+        self._aliases = aliases
+        self._fuzzy_indexes: Dict[int, FuzzyIndex] = {}
+        self._selections: "OrderedDict[Tuple[Optional[float], FrozenSet[str], FrozenSet[str]], Lexicon]" = OrderedDict()
+
+    def fuzzy_index(self, max_distance: int = 1) -> FuzzyIndex:
+        """
+        Approximate-match index for this lexicon, built once per distance.
+
+        Words from the dictionary and the lexicon's own replacement words are
+        ordinary speech and never matched approximately.
+        """
+        index = self._fuzzy_indexes.get(max_distance)
+        if index is None:
+            replacements = {
+                word.lower() for replacement in self.patterns.values() for word in replacement.split()
+            }
+            index = FuzzyIndex(
+                self.token_index.single_words(),
+                max_distance=max_distance,
+                dictionary=load_dictionary() | replacements
+            )
+            self._fuzzy_indexes[max_distance] = index
+        return index
+
+    def _category_selectors(self, names: Optional[Iterable[str]]) -> FrozenSet[str]:
+        selectors = frozenset(category_slug(c) for c in names or () if c.strip())
+        known = self.categories
+        unknown = sorted(s for s in selectors if not any(c.startswith(s) for c in known))
+        if unknown:
+            raise ValueError(
+                f"Unknown categor{'y' if len(unknown) == 1 else 'ies'} {', '.join(unknown)} "
+                f"(expected one of {', '.join(sorted(known))})"
+            )
+        return selectors
+
+    def select(
+        self,
+        min_severity: Any = None,
+        categories: Optional[Iterable[str]] = None,
+        exclude_categories: Optional[Iterable[str]] = None
+    ) -> "Lexicon":
+        """
+        Return the lexicon pruned to a severity threshold and category selection.
+
+        The last SELECTION_CACHE_SIZE combinations stay compiled, so a
+        stricter selection gets its own smaller matchers and scans less.
+
+        Args:
+            min_severity: Lowest severity to keep - a number or "mild"/"strong"/"severe".
+            categories: Keep only entries in one of these categories. A category
+                matches by slug prefix, e.g. "sexual-anatomy".
+            exclude_categories: Drop entries in any of these categories.
+
+        Returns:
+            Lexicon: self when nothing is filtered, else the cached subset.
+
+        Raises:
+            ValueError: If the severity is invalid or a category matches no
+                rated entry (e.g. a misspelled slug).
+        """
+        threshold = parse_severity(min_severity)
+        include = self._category_selectors(categories)
+        exclude = self._category_selectors(exclude_categories)
+        if threshold is None and not include and not exclude:
+            return self
+
+        key = (threshold, include, exclude)
+        with _selection_lock:
+            selection = self._selections.get(key)
+            if selection is not None:
+                self._selections.move_to_end(key)
+        if selection is None:
+            def in_any(entry_categories: Tuple[str, ...], selectors: FrozenSet[str]) -> bool:
+                return any(c.startswith(s) for c in entry_categories for s in selectors)
+
+            patterns = {}
+            for pattern, replacement in self.patterns.items():
+                severity, entry_categories = self.ratings[pattern]
+                if threshold is not None and severity < threshold:
+                    continue
+                if include and not in_any(entry_categories, include):
+                    continue
+                if exclude and in_any(entry_categories, exclude):
+                    continue
+                patterns[pattern] = replacement
+
+            selection = Lexicon(
+                patterns,
+                source=self.source,
+                fingerprint=f"{self.fingerprint}:{threshold}:{sorted(include)}:{sorted(exclude)}",
+                aliases=self._aliases,
+                ratings=self.ratings,
+                categories=self.categories
+            )
+            with _selection_lock:
+                self._selections[key] = selection
+                while len(self._selections) > SELECTION_CACHE_SIZE:
+                    self._selections.popitem(last=False)
+            logger.info(f"Compiled lexicon selection with {len(patterns)}/{len(self.patterns)} patterns")
+        return selection
+
+
+def _fingerprint(*paths: str) -> str:
+    """Cache key for lexicon files: path, mtime, size and a content hash of each."""
+    digest = hashlib.sha1(f"{CACHE_VERSION}".encode())
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            digest.update(f":missing:{path}".encode())
+            continue
+        digest.update(f":{path}:{stat.st_mtime_ns}:{stat.st_size}:".encode())
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _read_cache(cache_file: str) -> Optional[Lexicon]:
+    try:
+        with open(cache_file, 'rb') as file:
+            lexicon = pickle.load(file)
+        if isinstance(lexicon, Lexicon):
+            return lexicon
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable lexicon cache {cache_file}: {e}")
+    return None
+
+
+def _write_cache(cache_file: str, lexicon: Lexicon) -> None:
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(tmp_file, 'wb') as file:
+            pickle.dump(lexicon, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write lexicon cache {cache_file}: {e}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def load_lexicon(csv_path: Optional[str] = None, use_cache: bool = True) -> Lexicon:
+    """
+    Load and compile a lexicon, using the on-disk cache when it is fresh.
+
+    Args:
+        csv_path (str, optional): Lexicon CSV. Defaults to lexicon_path().
+        use_cache (bool): Read/write the compiled cache in cache_dir().
+
+    Returns:
+        Lexicon: Patterns plus compiled matchers.
+    """
+    csv_path = os.path.abspath(csv_path or lexicon_path())
+    aliases_path = variants_path()
+    fingerprint = _fingerprint(csv_path, aliases_path)
+    cache_file = os.path.join(cache_dir(), f"lexicon_{fingerprint}.pickle")
+
+    if use_cache:
+        lexicon = _read_cache(cache_file)
+        if lexicon is not None:
+            logger.info(f"Loaded compiled lexicon from cache ({len(lexicon.patterns)} patterns)")
+            return lexicon
+
+    patterns = load_profanity_replacements(csv_path)
+    variant_rows = _read_variant_rows(aliases_path)
+    severity_ratings = load_severity_ratings(rows=variant_rows)
+    lexicon = Lexicon(
+        patterns,
+        source=csv_path,
+        fingerprint=fingerprint,
+        aliases=load_variant_aliases(rows=variant_rows),
+        ratings=rate_entries(patterns, severity_ratings),
+        categories=(c for _, word_categories in severity_ratings.values() for c in word_categories)
+    )
+    if use_cache:
+        _write_cache(cache_file, lexicon)
+    return lexicon
+
+
+class LexiconRegistry:
+    """
+    Holds the active lexicon and swaps in recompiled versions atomically.
+
+    Callers take a snapshot with current() and keep using it for the whole job;
+    a reload builds the new Lexicon off to the side and replaces the reference
+    in one assignment, so running jobs never see a half-built matcher.
+
+    A broadcast reload also writes a new token to the generation file in
+    cache_dir(); every other process using the same cache directory (e.g. the
+    other Gunicorn workers) notices the new file on its next current() call,
+    which costs one stat(), and reloads too.
+    """
+
+    def __init__(self, csv_path: Optional[str] = None):
+        self._csv_path = csv_path
+        self._lexicon: Optional[Lexicon] = None
+        self._load_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._generation: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def csv_path(self) -> str:
+        return os.path.abspath(self._csv_path or lexicon_path())
+
+    @property
+    def generation_path(self) -> str:
+        return os.path.join(cache_dir(), "lexicon_generation")
+
+    def current(self) -> Lexicon:
+        """Return the active lexicon, loading it on first use or after a broadcast reload."""
+        lexicon = self._lexicon
+        if lexicon is None:
+            with self._load_lock:
+                if self._lexicon is None:
+                    self._generation = self._generation_key()
+                    self._lexicon = load_lexicon(self.csv_path)
+                lexicon = self._lexicon
+            return lexicon
+
+        # One stat() per call; the file is only written by broadcast reloads
+        generation = self._generation_key()
+        if generation != self._generation:
+            self._generation = generation
+            try:
+                lexicon = self.reload()
+            except Exception as e:
+                logger.error(f"Lexicon reload failed, keeping the previous one: {e}")
+        return lexicon
+
+    def reload(self, wait: bool = True, broadcast: bool = False) -> Optional[Lexicon]:
+        """
+        Recompile the lexicon from disk and swap it in.
+
+        Args:
+            wait (bool): Block until the new lexicon is active. With False the
+                compile runs in a background thread and None is returned.
+            broadcast (bool): Once reloaded, tell the other processes sharing
+                cache_dir() to reload as well.
+
+        Returns:
+            Lexicon: The active lexicon after the reload (when wait is True).
+        """
+        if not wait:
+            threading.Thread(
+                target=self.reload, kwargs={"broadcast": broadcast}, name="lexicon-reload", daemon=True
+            ).start()
+            return None
+
+        with self._reload_lock:
+            active = self._lexicon
+            if active is not None and active.fingerprint == _fingerprint(self.csv_path, variants_path()):
+                logger.info("Lexicon unchanged, keeping the active matcher")
+                lexicon = active
+            else:
+                lexicon = load_lexicon(self.csv_path)
+                self._lexicon = lexicon
+                logger.info(f"Swapped in lexicon {lexicon.fingerprint[:12]} ({len(lexicon.patterns)} patterns)")
+            if broadcast:
+                self._generation = self._write_generation()
+            return lexicon
+
+    def _generation_key(self) -> Optional[Tuple[int, int, int]]:
+        # Every write renames a new file into place, so the inode changes even
+        # when two writes land within the same mtime tick
+        try:
+            stat = os.stat(self.generation_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _write_generation(self) -> Optional[Tuple[int, int, int]]:
+        os.makedirs(cache_dir(), exist_ok=True)
+        tmp_file = f"{self.generation_path}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(f"{os.getpid()}-{time.time_ns()}")
+        os.replace(tmp_file, self.generation_path)
+        return self._generation_key()
+
+    def watch(self, interval: float = 5.0) -> None:
+        """Poll the lexicon file and reload it whenever it changes."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="lexicon-watcher", daemon=True
+        )
+        self._watcher.start()
+        logger.info(f"Watching {self.csv_path} for changes every {interval}s")
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
+
+    def _watch_loop(self, interval: float) -> None:
+        last_seen = self._stat_key()
+        while not self._stop_watching.wait(interval):
+            seen = self._stat_key()
+            if seen == last_seen:
+                continue
+            last_seen = seen
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Lexicon reload failed, keeping the previous one: {e}")
+
+    def _stat_key(self):
+        key = []
+        for path in (self.csv_path, variants_path()):
+            try:
+                stat = os.stat(path)
+                key.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                key.append(None)
+        return key
+
+
+# Process-wide registry used by filter_transcript and the admin reload endpoint
+registry = LexiconRegistry()
+
+
+def get_lexicon() -> Lexicon:
+    """Return a snapshot of the process-wide lexicon, loading it on first use."""
+    return registry.current()
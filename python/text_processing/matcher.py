@@ -0,0 +1,173 @@
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Patterns produced by load_profanity_replacements look like r'\b<escaped word>\b'
+_LITERAL_PATTERN = re.compile(r'^\\b(.+)\\b$', re.DOTALL)
+_UNESCAPE = re.compile(r'\\(.)', re.DOTALL)
+
+
+def literal_of(pattern: str) -> Optional[str]:
+    """
+    Return the literal word wrapped by a '\\b...\\b' pattern, or None.
+
+    A pattern counts as literal only if re-escaping the unescaped body gives
+    back exactly the original body, i.e. it contains no regex syntax.
+    """
+    m = _LITERAL_PATTERN.match(pattern)
+    if not m:
+        return None
+    body = m.group(1)
+    literal = _UNESCAPE.sub(r'\1', body)
+    if not literal or re.escape(literal) != body:
+        return None
+    return literal
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character as the re module's \\w."""
+    return ch.isalnum() or ch == '_'
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(ch: str) -> str:
+    """
+    One character folded the way re.IGNORECASE compares it.
+
+    Round-tripping through upper() also folds the letters whose lowercase is
+    another letter's variant ('ſ' -> 's', 'ı' -> 'i', 'ς' -> 'σ'), and a
+    lowercase longer than one character keeps its base letter ('İ' -> 'i').
+    """
+    upper = ch.upper()
+    folded = upper.lower() if len(upper) == 1 else ch.lower()
+    return folded[0]
+
+
+def _fold_case(text: str) -> str:
+    """Case-fold text like re.IGNORECASE without changing its length (offsets must stay valid)."""
+    if text.isascii():
+        return text.lower()
+    return "".join(_fold_char(c) for c in text)
+
+
+class PatternMatcher:
+    """
+    Compiled single-pass matcher for a profanity pattern map.
+
+    Literal word entries go into an Aho-Corasick automaton so every one of them
+    is found in a single scan of the text. The few entries that use real regex
+    syntax (e.g. r'\\bmother\\s?fucker\\b') are kept as compiled regexes.
+
+    Results are identical to running re.finditer(pattern, text, re.IGNORECASE)
+    for every pattern in map order, including for letters re folds specially
+    such as 'İ', 'ı' and 'ſ' (see _fold_char).
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        self.entries: List[Tuple[str, str]] = list(patterns.items())
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]
+        self._regexes: List[Tuple[int, "re.Pattern"]] = []
+
+        for entry_id, (pattern, _) in enumerate(self.entries):
+            literal = literal_of(pattern)
+            if literal is None:
+                self._regexes.append((entry_id, re.compile(pattern, re.IGNORECASE)))
+            else:
+                self._add_literal(_fold_case(literal), entry_id)
+        self._build_failure_links()
+
+        # One combined alternation lets a clean text skip every regex entry at once
+        self._regex_prefilter = None
+        if len(self._regexes) > 1:
+            self._regex_prefilter = re.compile(
+                "|".join(f"(?:{rx.pattern})" for _, rx in self._regexes),
+                re.IGNORECASE
+            )
+
+        logger.debug(
+            f"Compiled matcher: {len(self.entries) - len(self._regexes)} literal, "
+            f"{len(self._regexes)} regex entries"
+        )
+
+    def _add_literal(self, literal: str, entry_id: int) -> None:
+        node = 0
+        for ch in literal:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((entry_id, len(literal)))
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit outputs of the suffix state so the scan never walks fail links for output
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find every match in text.
+
+        Args:
+            text (str): Text to scan.
+
+        Returns:
+            List[Tuple[int, int, int]]: (entry_id, start, end) tuples ordered by
+            entry id, then start offset - the order of a per-pattern finditer loop.
+        """
+        hits: List[Tuple[int, int, int]] = []
+        n = len(text)
+        if not n:
+            return hits
+
+        goto, fail, out = self._goto, self._fail, self._out
+        folded = _fold_case(text)
+        is_word = [_is_word_char(c) for c in text]
+        last_end: Dict[int, int] = {}
+
+        node = 0
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            after = is_word[end] if end < n else False
+            for entry_id, length in out[node]:
+                start = end - length
+                # \b on both sides of the literal
+                before = is_word[start - 1] if start > 0 else False
+                if before == is_word[start] or is_word[end - 1] == after:
+                    continue
+                # finditer never returns overlapping matches for the same pattern
+                if start < last_end.get(entry_id, 0):
+                    continue
+                last_end[entry_id] = end
+                hits.append((entry_id, start, end))
+
+        if self._regexes and (self._regex_prefilter is None or self._regex_prefilter.search(text)):
+            for entry_id, rx in self._regexes:
+                hits.extend((entry_id, m.start(), m.end()) for m in rx.finditer(text))
+
+        hits.sort()
+        return hits
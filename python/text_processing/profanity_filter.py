@@ -1,109 +1,322 @@
-from typing import List, Dict, Any
-import re
-import csv
+from typing import List, Dict, Any, Sequence, Tuple, Optional, Iterable, Iterator
+from array import array
+from bisect import bisect_left, bisect_right
+import multiprocessing
 import os
 
-# Load replacements from CSV file
-def load_profanity_replacements():
-    """Load profanity replacements from CSV file"""
-    replacements = {}
+try:
+    import numpy as np
+except ImportError:  # numpy only speeds up the batch path
+    np = None
+
+from python.text_processing.lexicon import Lexicon, get_lexicon, load_profanity_replacements
+from python.text_processing.token_index import normalize_token
+from python.text_processing.transcript import Transcript
+
+# Above this many matches, word lookup is done with one vectorized searchsorted call
+VECTORIZE_MIN_MATCHES = 64
+
+# Compiled lexicon objects are loaded on first use, not at import
+_LAZY_ATTRIBUTES = {
+    "PROFANITY_MAP": "patterns",
+    "PROFANITY_MATCHER": "matcher",
+    "PROFANITY_TOKEN_INDEX": "token_index",
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(get_lexicon(), _LAZY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def map_matches_to_words(
+    start_chars: Sequence[int],
+    end_chars: Sequence[int],
+    match_starts: Sequence[int],
+    match_ends: Sequence[int]
+) -> List[Tuple[int, int]]:
+    """
+    Map character spans to the first and last word they overlap.
+
+    Word offsets are sorted, so each lookup is a binary search instead of a
+    scan over every word.
+
+    Args:
+        start_chars: Sorted start offset of every word.
+        end_chars: Sorted end offset of every word.
+        match_starts: Start offset of every match.
+        match_ends: End offset of every match.
+
+    Returns:
+        List[Tuple[int, int]]: (first_word, last_word) per match; first_word > last_word
+        when the match overlaps no word.
+    """
+    if np is not None and len(match_starts) >= VECTORIZE_MIN_MATCHES:
+        firsts = np.searchsorted(np.frombuffer(end_chars, dtype=np.int64), match_starts, side="right")
+        lasts = np.searchsorted(np.frombuffer(start_chars, dtype=np.int64), match_ends, side="left") - 1
+        return list(zip(firsts.tolist(), lasts.tolist()))
+
+    return [
+        (bisect_right(end_chars, match_start), bisect_left(start_chars, match_end) - 1)
+        for match_start, match_end in zip(match_starts, match_ends)
+    ]
+
+def resolve_overlaps(
+    starts: Sequence[float],
+    ends: Sequence[float],
+    weights: Sequence[int]
+) -> List[int]:
+    """
+    Pick the heaviest set of non-overlapping matches (weighted interval scheduling).
+
+    Runs in O(n log n): matches are ordered by end time and each one is either
+    skipped or taken together with the best solution ending before it starts,
+    found by binary search. Between equally heavy solutions the one with fewer
+    matches wins, so a phrase beats the words it is made of.
+
+    Args:
+        starts, ends: Match start/end times; a match may start where another ends.
+        weights: Non-negative match weights.
+
+    Returns:
+        List[int]: Indices of the chosen matches, ordered by start time.
+    """
+    n = len(starts)
+    order = sorted(range(n), key=lambda i: (ends[i], starts[i], i))
+    sorted_ends = [ends[i] for i in order]
+
+    # best[k] = (total weight, -match count) using the first k matches by end time
+    best: List[Tuple[int, int]] = [(0, 0)] * (n + 1)
+    previous = array("q", [0]) * (n + 1)
+    taken = bytearray(n + 1)
+    for k, i in enumerate(order, 1):
+        p = bisect_right(sorted_ends, starts[i], 0, k - 1)
+        weight, count = best[p]
+        candidate = (weight + weights[i], count - 1)
+        if candidate > best[k - 1]:
+            best[k] = candidate
+            previous[k] = p
+            taken[k] = 1
+        else:
+            best[k] = best[k - 1]
+
+    chosen = []
+    k = n
+    while k:
+        if taken[k]:
+            chosen.append(order[k - 1])
+            k = previous[k]
+        else:
+            k -= 1
+    chosen.sort(key=lambda i: (starts[i], ends[i], i))
+    return chosen
+
+def match_weight(start: float, end: float, words: int, severity: Optional[float] = None) -> int:
+    """
+    Weight of a match for resolve_overlaps.
+
+    Covered milliseconds plus one per covered word, so zero-length Whisper
+    words still count. With a severity, the more severe match wins first and
+    length only breaks ties.
+    """
+    weight = int(round((end - start) * 1000)) + words
+    if severity is not None:
+        weight += int(round(severity * 10)) << 32
+    return weight
+
+def remove_overlaps(replacements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop overlapping replacements, keeping the set that covers the most speech; sorted by start time."""
+    chosen = resolve_overlaps(
+        [repl["start"] for repl in replacements],
+        [repl["end"] for repl in replacements],
+        [match_weight(repl["start"], repl["end"], len(repl["original"].split()) or 1) for repl in replacements]
+    )
+    return [replacements[i] for i in chosen]
+
+def _resolve_word_matches(
+    transcript: Sequence[Dict[str, Any]],
+    lexicon: Lexicon,
+    entries: Sequence[Tuple[str, str]],
+    hits: Sequence[Tuple[int, int, int]],
+    overlap_weight: str
+) -> List[int]:
+    """Resolve (entry_id, first_word, last_word) matches; returns the winning indices."""
+    if overlap_weight not in ("length", "severity"):
+        raise ValueError(f"Unknown overlap weight: {overlap_weight}")
+    starts = array("d", (transcript[first]["start"] for _, first, _ in hits))
+    ends = array("d", (transcript[last]["end"] for _, _, last in hits))
+    weights = array("q", (
+        match_weight(
+            starts[i],
+            ends[i],
+            last - first + 1,
+            lexicon.ratings[entries[entry_id][0]][0] if overlap_weight == "severity" else None
+        )
+        for i, (entry_id, first, last) in enumerate(hits)
+    ))
+    return resolve_overlaps(starts, ends, weights)
+
+def _word_texts(transcript: Sequence[Dict[str, Any]]) -> List[str]:
+    if isinstance(transcript, Transcript):
+        return transcript.words()
+    return [word["word"] for word in transcript]
+
+def filter_transcript(
+    transcript: Sequence[Dict[str, Any]],
+    engine: str = "text",
+    lexicon: Optional[Lexicon] = None,
+    fuzzy_distance: int = 0,
+    min_severity: Any = None,
+    categories: Optional[List[str]] = None,
+    exclude_categories: Optional[List[str]] = None,
+    overlap_weight: str = "length"
+) -> List[Dict[str, Any]]:
+    """
+    Find profane words in a transcript.
     
-    # Try to load from CSV
-    csv_path = 'validated_profanity_replacements.csv'
+    Args:
+        transcript: [{"word": str, "start": float, "end": float}] or a Transcript
+        engine (str): "text" scans the joined transcript with the full regex
+            semantics; "tokens" looks every word up in the token index, which
+            skips building the joined text.
+        lexicon (Lexicon, optional): Snapshot to match against. Defaults to the
+            active lexicon; pass one explicitly to keep a job consistent across
+            hot reloads.
+        fuzzy_distance (int): With the "tokens" engine, also match words within
+            this edit distance of a lexicon word (0 disables approximate matching).
+        min_severity: Only match entries at least this severe - a badWords.csv
+            rating or "mild"/"strong"/"severe".
+        categories (list, optional): Only match entries in these categories.
+        exclude_categories (list, optional): Never match entries in these categories.
+        overlap_weight (str): How overlapping matches are settled - "length"
+            keeps the set covering the most speech, "severity" the most severe set.
     
-    if os.path.exists(csv_path):
-        try:
-            with open(csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file, delimiter='\t')
-                for row in reader:
-                    badword = row.get('badword', '').strip().lower()
-                    replacement = row.get('replacement_word', '').strip()
-                    if badword and replacement:
-                        # Create regex pattern for word boundaries
-                        pattern = r'\b' + re.escape(badword) + r'\b'
-                        replacements[pattern] = replacement
-            print(f"Loaded {len(replacements)} replacements from {csv_path}")
-        except Exception as e:
-            print(f"Error loading {csv_path}: {e}")
+    Returns:
+        List[Dict]: [{"start", "end", "original", "replacement"}] sorted by start time.
+    """
+    lexicon = (lexicon or get_lexicon()).select(min_severity, categories, exclude_categories)
+    if engine == "tokens":
+        fuzzy = lexicon.fuzzy_index(fuzzy_distance) if fuzzy_distance > 0 else None
+        index = lexicon.token_index
+        tokens = [normalize_token(text) for text in _word_texts(transcript)]
+        hits = index.find_all(tokens, fuzzy)
+        return [
+            index.make_replacement(transcript[first:last + 1], entry_id)
+            for entry_id, first, last in (
+                hits[i] for i in _resolve_word_matches(transcript, lexicon, index.entries, hits, overlap_weight)
+            )
+        ]
+    if engine != "text":
+        raise ValueError(f"Unknown filter engine: {engine}")
+    if fuzzy_distance > 0:
+        raise ValueError("Approximate matching requires engine='tokens'")
     
-    # Always add test cases
-    test_replacements = {
-        r'\bjeans\b': "pants",
-        r'\bshit\b': "crap",
-        r'\basshole\b': "jerk",
-        r'\bmother\s?fucker\b': "awesome person"
-    }
+    # Character offsets of every word in the joined text, kept as sorted arrays
+    texts = _word_texts(transcript)
+    start_chars = array("q")
+    end_chars = array("q")
+    char_pos = 0
+    for text in texts:
+        word_len = len(text)
+        start_chars.append(char_pos)
+        end_chars.append(char_pos + word_len)
+        char_pos += word_len + 1  # +1 for space
     
-    # Merge test replacements with CSV replacements
-    for pattern, replacement in test_replacements.items():
-        if pattern not in replacements:
-            replacements[pattern] = replacement
+    full_text = " ".join(texts)
     
-    return replacements
-
-# Load the profanity map
-PROFANITY_MAP = load_profanity_replacements()
-
-def filter_transcript(transcript: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    replacements = []
+    # Find all profanity patterns in a single pass
+    matches = lexicon.matcher.find_all(full_text)
+    word_spans = map_matches_to_words(
+        start_chars,
+        end_chars,
+        [match_start for _, match_start, _ in matches],
+        [match_end for _, _, match_end in matches]
+    )
     
-    # Create a searchable version of the transcript with character positions
-    char_pos = 0
-    word_positions = []
-    for word in transcript:
-        word_text = word["word"]
-        word_positions.append({
-            "start_char": char_pos,
-            "end_char": char_pos + len(word_text),
-            "word": word
-        })
-        char_pos += len(word_text) + 1  # +1 for space
+    # Matches that cover at least one word, as (entry_id, first_word, last_word)
+    kept = [i for i, (first_word, last_word) in enumerate(word_spans) if first_word <= last_word]
+    hits = [(matches[i][0],) + tuple(word_spans[i]) for i in kept]
     
-    full_text = " ".join(word["word"] for word in transcript)
+    # Records are only built for the matches that survive overlap resolution
+    replacements = []
+    for i in _resolve_word_matches(transcript, lexicon, lexicon.matcher.entries, hits, overlap_weight):
+        entry_id, first_word, last_word = hits[i]
+        _, match_start, match_end = matches[kept[i]]
+        # Get timing information from first and last overlapping words
+        replacements.append({
+            "start": transcript[first_word]["start"],
+            "end": transcript[last_word]["end"],
+            "original": full_text[match_start:match_end],
+            "replacement": lexicon.matcher.entries[entry_id][1]
+        })
     
-    # Check for all profanity patterns
-    for pattern, replacement in PROFANITY_MAP.items():
-        for match in re.finditer(pattern, full_text, re.IGNORECASE):
-            # Find words that overlap with this match
-            match_start = match.start()
-            match_end = match.end()
-            
-            overlapping_words = [
-                wp for wp in word_positions 
-                if not (wp["end_char"] <= match_start or wp["start_char"] >= match_end)
-            ]
-            
-            if not overlapping_words:
-                continue
-                
-            # Get timing information from first and last overlapping words
-            start_time = overlapping_words[0]["word"]["start"]
-            end_time = overlapping_words[-1]["word"]["end"]
-            
-            replacements.append({
-                "start": start_time,
-                "end": end_time,
-                "original": match.group(),
-                "replacement": replacement
-            })
+    return replacements
+
+# Per-process state of filter_transcripts workers, set once by the pool initializer
+_worker_lexicon: Optional[Lexicon] = None
+_worker_options: Dict[str, Any] = {}
+
+def _init_filter_worker(lexicon: Lexicon, options: Dict[str, Any]) -> None:
+    global _worker_lexicon, _worker_options
+    _worker_lexicon = lexicon
+    _worker_options = options
+
+def _filter_in_worker(transcript: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return filter_transcript(transcript, lexicon=_worker_lexicon, **_worker_options)
+
+def filter_transcripts(
+    transcripts: Iterable[List[Dict[str, Any]]],
+    workers: Optional[int] = None,
+    engine: str = "text",
+    lexicon: Optional[Lexicon] = None,
+    fuzzy_distance: int = 0,
+    min_severity: Any = None,
+    categories: Optional[List[str]] = None,
+    exclude_categories: Optional[List[str]] = None,
+    overlap_weight: str = "length",
+    chunksize: int = 8
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Filter many transcripts across a process pool.
     
-    # Sort by start time and remove overlaps (keep longer matches)
-    replacements.sort(key=lambda x: x["start"])
-    filtered_replacements = []
+    The compiled lexicon is handed to each worker once through the pool
+    initializer (inherited without copying where fork is available), and
+    results are yielded in input order as they complete.
     
-    for repl in replacements:
-        if not filtered_replacements:
-            filtered_replacements.append(repl)
-        else:
-            last = filtered_replacements[-1]
-            if repl["start"] < last["end"]:
-                # Overlapping - keep the longer match
-                if (repl["end"] - repl["start"]) > (last["end"] - last["start"]):
-                    filtered_replacements[-1] = repl
-            else:
-                filtered_replacements.append(repl)
+    Args:
+        transcripts: Iterable of word lists, consumed lazily.
+        workers (int, optional): Worker processes. Defaults to the CPU count;
+            1 filters in the calling process.
+        engine (str): See filter_transcript.
+        lexicon (Lexicon, optional): Snapshot to use for every transcript.
+        fuzzy_distance (int): See filter_transcript.
+        min_severity, categories, exclude_categories: See filter_transcript;
+            the selection is compiled once, before the workers start.
+        overlap_weight (str): See filter_transcript.
+        chunksize (int): Transcripts sent to a worker per task.
     
-    return filtered_replacements
+    Yields:
+        List[Dict]: filter_transcript result for each input transcript.
+    """
+    lexicon = (lexicon or get_lexicon()).select(min_severity, categories, exclude_categories)
+    workers = workers or os.cpu_count() or 1
+    if fuzzy_distance > 0:
+        lexicon.fuzzy_index(fuzzy_distance)  # build before the workers start so they share it
+
+    options = {"engine": engine, "fuzzy_distance": fuzzy_distance, "overlap_weight": overlap_weight}
+
+    if workers == 1:
+        for transcript in transcripts:
+            yield filter_transcript(transcript, lexicon=lexicon, **options)
+        return
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with context.Pool(
+        workers,
+        initializer=_init_filter_worker,
+        initargs=(lexicon, options)
+    ) as pool:
+        yield from pool.imap(_filter_in_worker, transcripts, chunksize)
 
 def test_profanity_filter():
     """Test the profanity filter with sample text"""
@@ -0,0 +1,137 @@
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from python.text_processing.lexicon import Lexicon, get_lexicon
+from python.text_processing.profanity_filter import match_weight, resolve_overlaps
+from python.text_processing.token_index import fold_token, normalize_token
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingFilter:
+    """
+    Incremental profanity filter fed one Whisper word at a time.
+
+    Matches are emitted as soon as no later word can change them, so speech
+    synthesis for early hits can start while the rest of the audio is still
+    being transcribed. Only the last max_phrase_len words are kept around.
+
+    Fed the complete word list, the emitted replacements are the same as
+    filter_transcript(words, engine="tokens") returns, provided word start
+    times never go backwards (Whisper output always satisfies this).
+    """
+
+    def __init__(
+        self,
+        lexicon: Optional[Lexicon] = None,
+        fuzzy_distance: int = 0,
+        overlap_weight: str = "length"
+    ):
+        """
+        Args:
+            lexicon (Lexicon, optional): Snapshot to match against. Defaults to the active lexicon.
+            fuzzy_distance (int): Edit distance for approximate matches (0 = exact only).
+            overlap_weight (str): "length" or "severity", see filter_transcript.
+        """
+        if overlap_weight not in ("length", "severity"):
+            raise ValueError(f"Unknown overlap weight: {overlap_weight}")
+        self.lexicon = lexicon or get_lexicon()
+        self._by_severity = overlap_weight == "severity"
+        self._index = self.lexicon.token_index
+        self._fuzzy = self.lexicon.fuzzy_index(fuzzy_distance) if fuzzy_distance > 0 else None
+        self._lookahead = self._index.max_phrase_len - 1
+
+        # Sliding window of the words that can still start or extend a match
+        self._words: List[Dict[str, Any]] = []
+        self._tokens: List[str] = []
+        self._canonical: List[str] = []
+        # Overlapping candidates not yet resolved: (start, end, weight, entry_id, words)
+        self._pending: List[Tuple[float, float, int, int, List[Dict[str, Any]]]] = []
+        self._pending_end = 0.0
+        self.words_seen = 0
+
+    def feed(self, word: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Add the next transcript word.
+
+        Args:
+            word: {"word": str, "start": float, "end": float}
+
+        Returns:
+            List[Dict]: Replacements that became final, in start-time order.
+        """
+        token = normalize_token(word["word"])
+        self._words.append(word)
+        self._tokens.append(token)
+        self._canonical.append(fold_token(token))
+        self.words_seen += 1
+
+        ready: List[Dict[str, Any]] = []
+        # The oldest buffered word now has all the lookahead a phrase can need
+        if len(self._words) > self._lookahead:
+            self._scan_oldest(ready)
+        self._release_pending(ready)
+        return ready
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Finish the stream and return every remaining replacement."""
+        ready: List[Dict[str, Any]] = []
+        while self._words:
+            self._scan_oldest(ready)
+        self._resolve_pending(ready)
+        return ready
+
+    def _scan_oldest(self, ready: List[Dict[str, Any]]) -> None:
+        hits: List[Tuple[int, int, int]] = []
+        self._index.matches_at(self._tokens, self._canonical, 0, hits, self._fuzzy)
+        for entry_id, first, last in hits:
+            words = self._words[first:last + 1]
+            start, end = words[0]["start"], words[-1]["end"]
+            if self._pending and start >= self._pending_end:
+                self._resolve_pending(ready)
+            severity = None
+            if self._by_severity:
+                severity = self.lexicon.ratings[self._index.entries[entry_id][0]][0]
+            self._pending.append((start, end, match_weight(start, end, len(words), severity), entry_id, words))
+            self._pending_end = max(self._pending_end, end)
+        del self._words[0], self._tokens[0], self._canonical[0]
+
+    def _resolve_pending(self, ready: List[Dict[str, Any]]) -> None:
+        """Settle the pending cluster; nothing outside it can overlap its matches."""
+        pending = self._pending
+        if not pending:
+            return
+        chosen = resolve_overlaps(
+            [c[0] for c in pending],
+            [c[1] for c in pending],
+            [c[2] for c in pending]
+        )
+        ready.extend(self._index.make_replacement(pending[i][4], pending[i][3]) for i in chosen)
+        self._pending = []
+        self._pending_end = 0.0
+
+    def _release_pending(self, ready: List[Dict[str, Any]]) -> None:
+        # Later matches start at or after the oldest buffered word
+        if self._pending and self._words and self._words[0]["start"] >= self._pending_end:
+            self._resolve_pending(ready)
+
+
+def stream_filter(
+    words: Iterable[Dict[str, Any]],
+    lexicon: Optional[Lexicon] = None,
+    fuzzy_distance: int = 0,
+    overlap_weight: str = "length"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield replacements from a word stream as soon as they are final.
+
+    Args:
+        words: Iterable of {"word", "start", "end"} dicts, e.g. WhisperTranscriber.iter_words().
+        lexicon (Lexicon, optional): Snapshot to match against.
+        fuzzy_distance (int): Edit distance for approximate matches.
+        overlap_weight (str): "length" or "severity", see filter_transcript.
+    """
+    stream = StreamingFilter(lexicon=lexicon, fuzzy_distance=fuzzy_distance, overlap_weight=overlap_weight)
+    for word in words:
+        yield from stream.feed(word)
+    yield from stream.flush()
@@ -0,0 +1,283 @@
+import re
+import logging
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+
+from python.text_processing.fuzzy import FuzzyIndex
+from python.text_processing.matcher import literal_of
+
+logger = logging.getLogger(__name__)
+
+# Characters Whisper attaches to words that never belong to the word itself
+STRIP_CHARS = " \t\r\n.,!?;:\"'`()[]{}<>…‘’“”–—-"
+
+# Digit/symbol -> letter substitutions (same map as process_all_records.validate_spelling)
+LEET_TABLE = str.maketrans({
+    '0': 'o',
+    '1': 'i',
+    '3': 'e',
+    '4': 'a',
+    '5': 's',
+    '7': 't',
+    '@': 'a',
+    '$': 's',
+})
+
+# Whitespace tokens a regex entry may use between two words, e.g. r'\bmother\s?fucker\b'
+_WHITESPACE_TOKEN = re.compile(r'\\s[?*+]?')
+
+
+def normalize_token(token: str) -> str:
+    """
+    Normalize a transcript word for lexicon lookup.
+
+    Args:
+        token (str): Raw word as returned by Whisper, e.g. " Shit,".
+
+    Returns:
+        str: Lowercased word without surrounding whitespace/punctuation, e.g. "shit".
+    """
+    return token.strip(STRIP_CHARS).lower()
+
+
+def fold_token(token: str) -> str:
+    """
+    Map a normalized token to its canonical spelling, e.g. "sh1t" -> "shit".
+
+    Only tokens with at least one letter are folded, so plain numbers such as
+    "55" or "455" stay numbers.
+    """
+    if not any(char.isalpha() for char in token):
+        return token
+    return token.translate(LEET_TABLE)
+
+
+def phrase_forms(pattern: str) -> List[List[str]]:
+    """
+    Turn a lexicon pattern into the token sequences it matches.
+
+    Literal patterns give one sequence. Regex patterns are supported when they
+    are literal words joined by \\s, \\s?, \\s* or \\s+; optional whitespace
+    yields both the joined and the split spelling. Anything else gives [].
+    """
+    literal = literal_of(pattern)
+    if literal is not None:
+        tokens = [normalize_token(t) for t in literal.split()]
+        return [tokens] if all(tokens) else []
+
+    if not (pattern.startswith(r'\b') and pattern.endswith(r'\b')):
+        return []
+    body = pattern[2:-2]
+    parts = _WHITESPACE_TOKEN.split(body)
+    separators = _WHITESPACE_TOKEN.findall(body)
+    words = [literal_of(r'\b' + part + r'\b') for part in parts]
+    if any(word is None or word.strip() != word or " " in word for word in words):
+        return []
+
+    forms = [[normalize_token(words[0])]]
+    for separator, word in zip(separators, words[1:]):
+        word = normalize_token(word)
+        split = [form + [word] for form in forms]
+        if separator in (r'\s?', r'\s*'):
+            joined = [form[:-1] + [form[-1] + word] for form in forms]
+            forms = joined + split
+        else:
+            forms = split
+    return [form for form in forms if all(form)]
+
+
+class TokenIndex:
+    """
+    Lexicon index that matches directly on the transcript word list.
+
+    Every word is normalized once, folded to its canonical spelling through
+    LEET_TABLE and looked up in a token trie: single-word entries are found
+    with one dict lookup, multi-word entries continue down the trie. No joined
+    text or character offsets are needed.
+
+    Lexicon variants that fold to the same canonical form share one trie node;
+    only variants whose replacement differs from the canonical one are kept in
+    a small exact-spelling override table.
+    """
+
+    def __init__(self, patterns: Dict[str, str], aliases: Optional[Dict[str, str]] = None):
+        self.entries: List[Tuple[str, str]] = list(patterns.items())
+        # canonical token -> [entry_id or -1, children or None]
+        self._root: Dict[str, list] = {}
+        # exact normalized spelling -> entry_id, for variants that disagree with their canonical form
+        self._exact: Dict[str, int] = {}
+        # canonical tokens that only exist because of an alias
+        self._alias_tokens = set()
+        # single-word entries spelled without leet characters
+        self._plain_tokens = set()
+        # known misspellings/inflections of another word (alias variants)
+        self._variant_tokens = set()
+        self.max_phrase_len = 1
+
+        entry_forms = [phrase_forms(pattern) for pattern, _ in self.entries]
+        skipped = sum(1 for forms in entry_forms if not forms)
+        # Real spellings claim their canonical node before leet variants of them do
+        order = sorted(
+            range(len(self.entries)),
+            key=lambda i: (any(fold_token(t) != t for form in entry_forms[i] for t in form), i)
+        )
+        for entry_id in order:
+            for form in entry_forms[entry_id]:
+                self._add_phrase(form, entry_id)
+
+        for variant, canonical in (aliases or {}).items():
+            self._add_alias(variant, canonical)
+
+        if skipped:
+            logger.warning(f"Token index skipped {skipped} patterns that are not word sequences")
+        logger.debug(
+            f"Token index: {len(self.entries)} entries in {len(self._root)} canonical forms, "
+            f"{len(self._exact)} exact overrides"
+        )
+
+    def _add_phrase(self, tokens: Sequence[str], entry_id: int) -> None:
+        level = self._root
+        last = len(tokens) - 1
+        for k, token in enumerate(tokens):
+            token = fold_token(token)
+            node = level.get(token)
+            if node is None:
+                node = [-1, None]
+                level[token] = node
+            if k < last:
+                if node[1] is None:
+                    node[1] = {}
+                level = node[1]
+        if len(tokens) == 1 and fold_token(tokens[0]) == tokens[0]:
+            self._plain_tokens.add(tokens[0])
+        # First entry to claim a node wins; later ones only keep an exact override
+        if node[0] == -1:
+            node[0] = entry_id
+        elif len(tokens) == 1 and self.entries[entry_id][1] != self.entries[node[0]][1]:
+            self._exact.setdefault(tokens[0], entry_id)
+        self.max_phrase_len = max(self.max_phrase_len, len(tokens))
+
+    def _add_alias(self, variant: str, canonical: str) -> None:
+        """Point a known variant spelling at the entry of its canonical word."""
+        variant, canonical = fold_token(normalize_token(variant)), fold_token(normalize_token(canonical))
+        if not variant or not canonical:
+            return
+        if variant != canonical:
+            self._variant_tokens.add(variant)
+        target = self._root.get(canonical)
+        if target is None or target[0] == -1:
+            return
+        node = self._root.setdefault(variant, [-1, None])
+        if node[0] == -1:
+            node[0] = target[0]
+            self._alias_tokens.add(variant)
+
+    def single_words(self) -> Dict[str, int]:
+        """
+        Canonical single-word lexicon entries -> entry id (input for a FuzzyIndex).
+
+        Only plain spellings of base words are returned. Leet spellings, alias
+        spellings and entries badWords.csv lists as a variant of another word
+        ("cuunt", "biatch", "asses") are left out: they are already
+        misspellings or inflections, and fuzzy matching around them mostly
+        catches ordinary words.
+        """
+        return {
+            token: node[0] for token, node in self._root.items()
+            if node[0] != -1
+            and token in self._plain_tokens
+            and token not in self._alias_tokens
+            and token not in self._variant_tokens
+        }
+
+    def find_all(self, tokens: Sequence[str], fuzzy: Optional["FuzzyIndex"] = None) -> List[Tuple[int, int, int]]:
+        """
+        Find every lexicon phrase in a list of normalized tokens.
+
+        Args:
+            tokens: Normalized words (see normalize_token).
+            fuzzy (FuzzyIndex, optional): Approximate lookup for words that
+                start no exact match.
+
+        Returns:
+            List[Tuple[int, int, int]]: (entry_id, first_word, last_word) per match,
+            ordered by first word.
+        """
+        hits: List[Tuple[int, int, int]] = []
+        canonical = [fold_token(token) for token in tokens]
+        for i in range(len(canonical)):
+            self.matches_at(tokens, canonical, i, hits, fuzzy)
+        return hits
+
+    def matches_at(
+        self,
+        tokens: Sequence[str],
+        canonical: Sequence[str],
+        i: int,
+        hits: List[Tuple[int, int, int]],
+        fuzzy: Optional["FuzzyIndex"] = None
+    ) -> None:
+        """
+        Append every match that starts at word i to hits.
+
+        Args:
+            tokens: Normalized words.
+            canonical: The same words folded with fold_token.
+            i (int): Index of the first word.
+            hits: Output list of (entry_id, first_word, last_word).
+            fuzzy (FuzzyIndex, optional): Approximate lookup if no exact match starts here.
+        """
+        node = self._root.get(canonical[i])
+        if node is None:
+            if fuzzy is not None:
+                found = fuzzy.lookup(canonical[i])
+                if found is not None:
+                    hits.append((found[0], i, i))
+            return
+        if node[0] != -1:
+            hits.append((self._exact.get(tokens[i], node[0]), i, i))
+        n = len(canonical)
+        j = i + 1
+        while node[1] is not None and j < n:
+            node = node[1].get(canonical[j])
+            if node is None:
+                break
+            if node[0] != -1:
+                hits.append((node[0], i, j))
+            j += 1
+
+    def lookup(self, token: str) -> Optional[int]:
+        """Return the entry id of a single normalized word, or None."""
+        node = self._root.get(fold_token(token))
+        if node is None or node[0] == -1:
+            return None
+        return self._exact.get(token, node[0])
+
+    def filter_words(
+        self,
+        transcript: List[Dict[str, Any]],
+        fuzzy: Optional["FuzzyIndex"] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Match a Whisper word list against the lexicon.
+
+        Args:
+            transcript: [{"word": str, "start": float, "end": float}]
+            fuzzy (FuzzyIndex, optional): Approximate lookup for unmatched words.
+
+        Returns:
+            List[Dict]: Unsorted replacement records with start/end/original/replacement.
+        """
+        tokens = [normalize_token(word["word"]) for word in transcript]
+        return [
+            self.make_replacement(transcript[first:last + 1], entry_id)
+            for entry_id, first, last in self.find_all(tokens, fuzzy)
+        ]
+
+    def make_replacement(self, words: Sequence[Dict[str, Any]], entry_id: int) -> Dict[str, Any]:
+        """Build the replacement record for a match covering words."""
+        return {
+            "start": words[0]["start"],
+            "end": words[-1]["end"],
+            "original": " ".join(word["word"].strip(STRIP_CHARS) for word in words),
+            "replacement": self.entries[entry_id][1]
+        }
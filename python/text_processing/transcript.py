@@ -0,0 +1,323 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the .npz variant
+    np = None
+
+# Times are stored as float32 and read back rounded to the millisecond,
+# which is exact for Whisper's 10 ms timestamps even hours into a file
+TIME_DECIMALS = 3
+
+# Binary layout: header, uint32 offsets (n + 1), float32 starts (n), float32 ends (n),
+# then the UTF-8 text. Everything is little-endian and the arrays are 4-byte aligned,
+# so a memory-mapped file can back a Transcript directly.
+TRANSCRIPT_MAGIC = b"PTRX"
+TRANSCRIPT_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ")  # magic, version, flags, word count, text bytes
+
+# Arrays can be used in place only when the machine's byte order matches the file
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _section(values: Sequence, typecode: str, lo: int, hi: int) -> array:
+    """Copy values[lo:hi] of an array or memoryview into a new array."""
+    section = array(typecode)
+    section.frombytes(memoryview(values)[lo:hi].tobytes())
+    return section
+
+
+def _to_little_endian(values: array) -> bytes:
+    if not _NATIVE_LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(buffer: memoryview, typecode: str, count: int, copy: bool) -> Sequence:
+    """View (or copy) count little-endian values of typecode from buffer."""
+    values = array(typecode)
+    size = count * values.itemsize
+    if len(buffer) < size:
+        raise ValueError("Truncated transcript data")
+    if not copy and _NATIVE_LITTLE_ENDIAN:
+        return buffer[:size].cast(typecode)
+    values.frombytes(buffer[:size].tobytes())
+    if not _NATIVE_LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+class Word(Mapping):
+    """Read-only {"word", "start", "end"} view of one transcript word."""
+
+    __slots__ = ("_transcript", "_index")
+    _KEYS = ("word", "start", "end")
+
+    def __init__(self, transcript: "Transcript", index: int):
+        self._transcript = transcript
+        self._index = index
+
+    def __getitem__(self, key: str) -> Union[str, float]:
+        transcript, i = self._transcript, self._index
+        if key == "word":
+            return transcript._word(i)
+        if key == "start":
+            return round(transcript._starts[i], TIME_DECIMALS)
+        if key == "end":
+            return round(transcript._ends[i], TIME_DECIMALS)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class Transcript(Sequence):
+    """
+    Columnar word list with timestamps.
+
+    All words live in one text buffer addressed by an offsets array, and
+    start/end times in two float32 arrays - about 20 bytes per word instead of
+    a few hundred for a list of dicts.
+
+    Indexing returns a Word view that reads like the {"word", "start", "end"}
+    dicts the rest of the pipeline expects. Slicing (by index or with between())
+    returns a Transcript that shares the buffers of the original.
+    """
+
+    __slots__ = ("_text", "_offsets", "_starts", "_ends", "_lo", "_hi")
+
+    def __init__(
+        self,
+        text: str = "",
+        offsets: Optional[array] = None,
+        starts: Optional[array] = None,
+        ends: Optional[array] = None,
+        lo: int = 0,
+        hi: Optional[int] = None
+    ):
+        """
+        Args:
+            text (str): All words concatenated.
+            offsets (array): Start offset of every word in text, plus len(text).
+            starts (array): float32 start time of every word.
+            ends (array): float32 end time of every word.
+                The three arrays may also be memoryviews, e.g. of a mapped file.
+            lo, hi (int): Range of words this transcript covers.
+        """
+        self._text = text
+        self._offsets = offsets if offsets is not None else array("I", [0])
+        self._starts = starts if starts is not None else array("f")
+        self._ends = ends if ends is not None else array("f")
+        self._lo = lo
+        self._hi = len(self._starts) if hi is None else hi
+
+    @classmethod
+    def from_words(cls, words: Iterable[Dict[str, Any]]) -> "Transcript":
+        """
+        Build a transcript from {"word", "start", "end"} dicts.
+
+        Args:
+            words: Any iterable of word dicts, e.g. WhisperTranscriber.iter_words().
+        """
+        parts: List[str] = []
+        offsets = array("I", [0])
+        starts = array("f")
+        ends = array("f")
+        position = 0
+        for word in words:
+            text = word["word"]
+            parts.append(text)
+            position += len(text)
+            offsets.append(position)
+            starts.append(word["start"])
+            ends.append(word["end"])
+        return cls("".join(parts), offsets, starts, ends)
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Word, "Transcript", List[Word]]:
+        if isinstance(item, slice):
+            first, last, step = item.indices(len(self))
+            if step != 1:
+                return [Word(self, self._lo + i) for i in range(first, last, step)]
+            last = max(first, last)
+            return Transcript(
+                self._text, self._offsets, self._starts, self._ends,
+                self._lo + first, self._lo + last
+            )
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("transcript index out of range")
+        return Word(self, self._lo + item)
+
+    def __iter__(self) -> Iterator[Word]:
+        for i in range(self._lo, self._hi):
+            yield Word(self, i)
+
+    def __repr__(self) -> str:
+        return f"<Transcript {len(self)} words>"
+
+    def __reduce__(self):
+        # Pickle as one binary blob, with only the covered words
+        return Transcript.from_bytes, (self.to_bytes(),)
+
+    def _word(self, i: int) -> str:
+        return self._text[self._offsets[i]:self._offsets[i + 1]]
+
+    def words(self) -> List[str]:
+        """The word strings, without building any views."""
+        offsets, text = self._offsets, self._text
+        return [text[offsets[i]:offsets[i + 1]] for i in range(self._lo, self._hi)]
+
+    def between(self, start: float, end: float) -> "Transcript":
+        """
+        Words overlapping the time range [start, end), without copying.
+
+        Word times must not go backwards (Whisper output always satisfies this).
+        """
+        # Compare at the stored precision, so a word ending exactly at start is excluded
+        start, end = array("f", (start, end))
+        first = bisect_right(self._ends, start, self._lo, self._hi)
+        last = bisect_left(self._starts, end, first, self._hi)
+        return Transcript(self._text, self._offsets, self._starts, self._ends, first, last)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Plain {"word", "start", "end"} dicts, e.g. for JSON output."""
+        return [dict(word) for word in self]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the covered words in the binary transcript format."""
+        lo, hi = self._lo, self._hi
+        base = self._offsets[lo]
+        offsets = _section(self._offsets, "I", lo, hi + 1)
+        if base:
+            offsets = array("I", (offset - base for offset in offsets))
+        text = self._text[base:self._offsets[hi]].encode("utf-8")
+        return b"".join((
+            _HEADER.pack(TRANSCRIPT_MAGIC, TRANSCRIPT_FORMAT_VERSION, 0, hi - lo, len(text)),
+            _to_little_endian(offsets),
+            _to_little_endian(_section(self._starts, "f", lo, hi)),
+            _to_little_endian(_section(self._ends, "f", lo, hi)),
+            text,
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, memoryview, mmap.mmap], copy: bool = True) -> "Transcript":
+        """
+        Read a transcript written by to_bytes().
+
+        Args:
+            data: Serialized transcript.
+            copy (bool): Copy the arrays out of data. With False they stay views
+                into data, which must then outlive the transcript.
+
+        Raises:
+            ValueError: If data is not a transcript in a supported format version.
+        """
+        buffer = memoryview(data)
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Truncated transcript data")
+        magic, version, _, count, text_size = _HEADER.unpack_from(buffer)
+        if magic != TRANSCRIPT_MAGIC:
+            raise ValueError("Not a transcript file")
+        if version != TRANSCRIPT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported transcript format version {version}")
+
+        position = _HEADER.size
+        offsets = _read_array(buffer[position:], "I", count + 1, copy)
+        position += 4 * (count + 1)
+        starts = _read_array(buffer[position:], "f", count, copy)
+        position += 4 * count
+        ends = _read_array(buffer[position:], "f", count, copy)
+        position += 4 * count
+        if len(buffer) < position + text_size:
+            raise ValueError("Truncated transcript data")
+        text = str(buffer[position:position + text_size], "utf-8")
+        return cls(text, offsets, starts, ends)
+
+    def save(self, path: str) -> None:
+        """
+        Write the transcript to path; a .npz path uses numpy's archive format instead.
+
+        The file is written to a temporary name and moved into place.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            if path.endswith(".npz"):
+                self._save_npz(tmp_path)
+            else:
+                with open(tmp_path, "wb") as file:
+                    file.write(self.to_bytes())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> "Transcript":
+        """
+        Read a transcript saved with save().
+
+        Args:
+            path (str): Binary transcript, or a .npz archive.
+            use_mmap (bool): Map the file and use its arrays in place instead of
+                reading them into memory.
+        """
+        if path.endswith(".npz"):
+            return cls._load_npz(path)
+        with open(path, "rb") as file:
+            if use_mmap and os.fstat(file.fileno()).st_size:
+                return cls.from_bytes(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), copy=False)
+            return cls.from_bytes(file.read())
+
+    def _save_npz(self, path: str) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for .npz transcripts")
+        lo, hi = self._lo, self._hi
+        offsets = np.asarray(_section(self._offsets, "I", lo, hi + 1), dtype=np.uint32)
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                text=np.frombuffer(self._text[offsets[0]:offsets[-1]].encode("utf-8"), dtype=np.uint8),
+                offsets=offsets - offsets[0],
+                starts=np.asarray(_section(self._starts, "f", lo, hi), dtype=np.float32),
+                ends=np.asarray(_section(self._ends, "f", lo, hi), dtype=np.float32)
+            )
+
+    @classmethod
+    def _load_npz(cls, path: str) -> "Transcript":
+        if np is None:
+            raise RuntimeError("numpy is required for .npz transcripts")
+        with np.load(path) as data:
+            return cls(
+                data["text"].tobytes().decode("utf-8"),
+                array("I", data["offsets"].astype("<u4").tobytes()),
+                array("f", data["starts"].astype("<f4").tobytes()),
+                array("f", data["ends"].astype("<f4").tobytes())
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the underlying buffers."""
+        return (
+            sys.getsizeof(self._text)
+            + self._offsets.itemsize * len(self._offsets)
+            + self._starts.itemsize * len(self._starts)
+            + self._ends.itemsize * len(self._ends)
+        )
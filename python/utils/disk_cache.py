@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Compiled lexicons, transcripts, speech clips and tuning results live here;
+# override with PROFANITY_CACHE_DIR
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "profanity_replacement")
+
+
+def cache_dir() -> str:
+    """Directory holding the application's caches."""
+    return os.environ.get("PROFANITY_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def content_key(*parts: Any) -> str:
+    """Stable cache key for a mix of bytes-like and plain values."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, (bytes, bytearray, memoryview)) else repr(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class DiskLRUCache:
+    """
+    Directory of cached files bounded by total size.
+
+    Every entry is one file named after its key. Reads refresh the file's
+    modification time, and once the directory grows past max_bytes the least
+    recently used files are deleted. Files are written under a temporary name
+    and renamed into place, so several processes can share one directory.
+
+    Hit/miss counters are kept per process.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ""):
+        """
+        Args:
+            directory (str): Where entries are stored; created on first write.
+            max_bytes (int): Size bound for the directory (0 disables the cache).
+            suffix (str): File extension for entries, e.g. ".ptx".
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up an entry.
+
+        Returns:
+            str: Path of the cached file, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key: str, write: Callable[[str], None]) -> Optional[str]:
+        """
+        Store an entry.
+
+        Args:
+            key (str): Entry key.
+            write: Called with a temporary path to write the entry to.
+
+        Returns:
+            str: Path of the stored file, or None if the cache is disabled or
+            the write failed (caching never breaks the caller).
+        """
+        if not self.enabled:
+            return None
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        self.evict()
+        return path
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the directory fits max_bytes."""
+        try:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.suffix) and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+            logger.debug(f"Evicted cache entry {path}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and current size, e.g. for a monitoring endpoint."""
+        entries = 0
+        size = 0
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.suffix) and not entry.name.endswith(".tmp"):
+                    entries += 1
+                    size += entry.stat().st_size
+        except OSError:
+            pass
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
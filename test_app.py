@@ -4,8 +4,12 @@ Simple test script to verify Flask app can start
 Run this to check if there are any import or initialization issues
 """
 
+import io
 import sys
 import os
+import tempfile
+import threading
+import time
 
 def test_imports():
     """Test if all imports work correctly"""
@@ -21,7 +25,7 @@ def test_imports():
         print("✅ Main processing module imported successfully")
         
         # Test audio processing modules
-        from python.audio_processing.whisper_handler import transcriber
+        from python.audio_processing.whisper_handler import get_transcriber
         print("✅ Whisper handler imported successfully")
         
         from python.audio_processing.edge_tts_handler import generate_speech
@@ -65,6 +69,13 @@ def test_app_startup():
                 print("✅ Health endpoint responds correctly")
             else:
                 print(f"⚠️  Health endpoint returned status {response.status_code}")
+
+            # Liveness must not wait for the Whisper model
+            response = client.get('/health/live')
+            if response.status_code == 200:
+                print("✅ Liveness endpoint responds correctly")
+            else:
+                print(f"⚠️  Liveness endpoint returned status {response.status_code}")
         
         return True
         
@@ -72,6 +83,130 @@ def test_app_startup():
         print(f"❌ App startup error: {e}")
         return False
 
+def test_admin_reload():
+    """The admin token must match exactly and the reload reports the worker's PID"""
+    from app import app
+
+    # The broadcast writes to the cache directory; keep it away from live workers
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PROFANITY_CACHE_DIR"] = tmp
+        os.environ["ADMIN_TOKEN"] = "s3cret"
+        try:
+            with app.test_client() as client:
+                assert client.post('/admin/reload-lexicon').status_code == 403
+                response = client.post('/admin/reload-lexicon', headers={"X-Admin-Token": "s3cre"})
+                assert response.status_code == 403
+                response = client.post('/admin/reload-lexicon', headers={"X-Admin-Token": "s3cret"})
+                assert response.status_code == 200
+                assert response.get_json()["pid"] == os.getpid()
+            assert os.path.exists(os.path.join(tmp, "lexicon_generation"))
+        finally:
+            del os.environ["ADMIN_TOKEN"]
+            del os.environ["PROFANITY_CACHE_DIR"]
+
+def test_process_rejects_unknown_profile():
+    """An unknown transcription profile is a 400 before anything is saved or decoded"""
+    from app import app
+
+    with app.test_client() as client:
+        response = client.post('/process', data={
+            "media": (io.BytesIO(b"not a video"), "clip.mp4"),
+            "option": "transcription",
+            "profile": "fast"
+        }, content_type="multipart/form-data")
+    assert response.status_code == 400
+    assert "Unknown transcription profile" in response.get_json()["error"]
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+class StubModel:
+    """Stands in for faster_whisper.WhisperModel and counts inferences."""
+
+    def __init__(self, model_size, **kwargs):
+        self.inferences = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.inferences += 1
+        return iter([]), None
+
+def test_ready_only_after_warmup():
+    """Loading the model (e.g. for a request) is not enough; the warm-up inference must have run"""
+    from python.audio_processing import whisper_handler
+
+    original = whisper_handler._load_whisper_model
+    whisper_handler._load_whisper_model = StubModel
+    whisper_handler._ready.clear()
+    whisper_handler._transcribers.clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["WHISPER_TUNING_FILE"] = os.path.join(tmp, "missing.json")
+        try:
+            instance = whisper_handler.load_transcriber()
+            assert not whisper_handler.is_ready()
+            assert whisper_handler.readiness()["status"] == "not loaded"
+
+            assert whisper_handler.warmup() is instance
+            assert instance.model.inferences == 1
+            assert whisper_handler.is_ready()
+        finally:
+            whisper_handler._load_whisper_model = original
+            whisper_handler._ready.clear()
+            whisper_handler._transcribers.clear()
+            del os.environ["WHISPER_TUNING_FILE"]
+
+def test_readiness_transitions():
+    """/health/ready goes loading -> failed (retrying) -> failed -> ready with a stub model"""
+    from app import app
+    from python.audio_processing import whisper_handler
+
+    # Each load waits for its gate; the first two fail, the third loads
+    gates = [threading.Event() for _ in range(3)]
+    attempts = []
+
+    def stub_warmup():
+        attempts.append(len(attempts))
+        gates[attempts[-1]].wait(5)
+        if len(attempts) < 3:
+            raise RuntimeError("model download failed")
+        whisper_handler._ready.set()
+
+    originals = whisper_handler.warmup, whisper_handler.WARMUP_BACKOFF
+    whisper_handler.warmup, whisper_handler.WARMUP_BACKOFF = stub_warmup, (0.01,)
+    whisper_handler._ready.clear()
+    whisper_handler._warmup_thread, whisper_handler._warmup_error = None, None
+    try:
+        with app.test_client() as client:
+            def status():
+                response = client.get('/health/ready')
+                return response.status_code, response.get_json()
+
+            assert status() == (503, {"status": "loading"})
+
+            gates[0].set()  # first attempt fails, the retry is pending
+            wait_for(lambda: len(attempts) == 2)
+            code, state = status()
+            assert code == 503 and state["status"] == "failed" and state["retrying"]
+            assert state["error"] == "model download failed"
+
+            gates[1].set()  # the retry fails too and the warm-up gives up
+            wait_for(lambda: not whisper_handler._warmup_thread.is_alive())
+            assert whisper_handler.readiness()["retrying"] is False
+
+            # The next probe starts a new warm-up, which loads
+            code, state = status()
+            assert code == 503 and state["retrying"]
+            gates[2].set()
+            wait_for(whisper_handler.is_ready)
+            assert status() == (200, {"status": "ready"})
+            assert len(attempts) == 3
+    finally:
+        whisper_handler.warmup, whisper_handler.WARMUP_BACKOFF = originals
+        whisper_handler._ready.clear()
+        whisper_handler._warmup_thread, whisper_handler._warmup_error = None, None
+
 def test_ffmpeg():
     """Test if FFmpeg is available"""
     print("\nTesting FFmpeg availability...")
@@ -99,6 +234,10 @@ if __name__ == "__main__":
     
     import_success = test_imports()
     app_success = test_app_startup()
+    test_admin_reload()
+    test_process_rejects_unknown_profile()
+    test_ready_only_after_warmup()
+    test_readiness_transitions()
     ffmpeg_success = test_ffmpeg()
     
     print("\n" + "=" * 40)
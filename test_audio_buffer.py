@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test in-memory audio splicing
+"""
+
+import os
+import sys
+import tempfile
+import wave
+sys.path.append('.')
+
+import numpy as np
+
+from python.audio_processing.audio_buffer import splice_audio, write_wav
+
+
+def test_splice_audio():
+    rate = 10
+    audio = np.arange(50, dtype=np.float32)  # 5 seconds
+    clip = np.full(3, -1.0, dtype=np.float32)
+    spliced = splice_audio(audio, [(1.0, 2.0, clip), (3.0, 3.5, clip[:1])], rate)
+    expected = np.concatenate((audio[:10], clip, audio[20:30], clip[:1], audio[35:]))
+    assert np.array_equal(spliced, expected)
+
+    # Replacement running to the very end, and no replacements at all
+    assert np.array_equal(splice_audio(audio, [(4.0, 5.0, clip)], rate), np.concatenate((audio[:40], clip)))
+    assert np.array_equal(splice_audio(audio, [], rate), audio)
+
+
+def test_write_wav():
+    audio = np.array([0.0, 0.5, -0.5, 1.0, -1.0], dtype=np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.wav")
+        write_wav(audio, path, 16000)
+        with wave.open(path, "rb") as f:
+            assert (f.getnchannels(), f.getsampwidth(), f.getframerate()) == (1, 2, 16000)
+            samples = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+    assert samples.tolist() == [0, 16384, -16384, 32767, -32768]
+
+
+if __name__ == "__main__":
+    test_splice_audio()
+    test_write_wav()
+    print("✅ Audio buffer tests passed")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test batch filtering of many transcripts across worker processes
+"""
+
+import sys
+sys.path.append('.')
+
+from python.text_processing.profanity_filter import filter_transcript, filter_transcripts
+
+
+def make_transcripts(count):
+    vocabulary = [" I", " love", " my", " jeans", " and", " shit,", " hello", " asshole"]
+    transcripts = []
+    for n in range(count):
+        words = [vocabulary[(n * 7 + i * 3) % len(vocabulary)] for i in range(n % 13)]
+        transcripts.append([{"word": w, "start": i * 0.5, "end": i * 0.5 + 0.4} for i, w in enumerate(words)])
+    return transcripts
+
+
+def test_results_in_input_order():
+    transcripts = make_transcripts(60)
+    expected = [filter_transcript(t) for t in transcripts]
+    assert list(filter_transcripts(iter(transcripts), workers=2, chunksize=4)) == expected
+    assert list(filter_transcripts(transcripts, workers=1)) == expected
+
+
+def test_token_engine_in_workers():
+    transcripts = make_transcripts(20)
+    expected = [filter_transcript(t, engine="tokens", fuzzy_distance=1) for t in transcripts]
+    assert list(filter_transcripts(transcripts, workers=2, engine="tokens", fuzzy_distance=1)) == expected
+
+
+if __name__ == "__main__":
+    test_results_in_input_order()
+    test_token_engine_in_workers()
+    print("✅ Batch filtering tests passed")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test chunk planning and merging for parallel transcription
+"""
+
+import sys
+sys.path.append('.')
+
+from python.audio_processing import chunked_transcription
+from python.audio_processing.chunked_transcription import merge_chunk_words, plan_chunks
+
+
+def test_chunks_end_in_silences():
+    # 10 s of speech every 12 s, in units of seconds for readability
+    speech = [(t, t + 10) for t in range(0, 120, 12)]
+    chunks = plan_chunks(speech, 125, 30)
+    assert chunks[0][0] == 0 and chunks[-1][1] == 125
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    for start, end in chunks:
+        assert end - start <= 30 or len([s for s in speech if start <= s[0] < end]) == 1
+        # Every cut falls in a gap between speech spans
+        assert not any(s < start < e for s, e in speech)
+    assert chunks == [(0, 23), (23, 47), (47, 71), (71, 95), (95, 125)]
+
+
+def test_unbroken_speech_is_not_cut():
+    assert plan_chunks([(0, 100)], 100, 30) == [(0, 100)]
+    assert plan_chunks([(0, 50), (52, 60)], 60, 30) == [(0, 51), (51, 60)]
+    assert plan_chunks([], 100, 30) == []
+
+
+def test_merge_offsets_and_order():
+    chunk_words = [
+        (0.0, [{"word": " a", "start": 0.0, "end": 0.5}, {"word": " b", "start": 0.5, "end": 1.0}]),
+        (60.0, [{"word": " c", "start": 0.0, "end": 0.4}]),
+        (59.8, [{"word": " d", "start": 0.1, "end": 0.3}]),  # would go backwards
+    ]
+    merged = list(merge_chunk_words(chunk_words))
+    assert [w["word"] for w in merged] == [" a", " b", " c", " d"]
+    assert (merged[2]["start"], merged[2]["end"]) == (60.0, 60.4)
+    assert (merged[3]["start"], merged[3]["end"]) == (60.4, 60.4)
+
+
+class RecordingContext:
+    """Stands in for a multiprocessing context and records the pools it starts."""
+
+    def __init__(self):
+        self.started = []
+
+    def Pool(self, workers, initializer, initargs):
+        self.started.append((workers, initargs))
+        return object()
+
+
+def test_workers_load_with_the_profile_threads():
+    context = RecordingContext()
+    original = chunked_transcription.multiprocessing.get_context
+    chunked_transcription.multiprocessing.get_context = lambda method: context
+    try:
+        pool = chunked_transcription._get_pool("base", "int8", 2, cpu_threads=4)
+        assert chunked_transcription._get_pool("base", "int8", 2, cpu_threads=4) is pool
+        assert chunked_transcription._get_pool("base", "int8", 2, cpu_threads=1) is not pool
+        assert context.started == [(2, ("base", "int8", 4)), (2, ("base", "int8", 1))]
+    finally:
+        chunked_transcription.multiprocessing.get_context = original
+        chunked_transcription._pools.clear()
+
+
+if __name__ == "__main__":
+    test_chunks_end_in_silences()
+    test_unbroken_speech_is_not_cut()
+    test_merge_offsets_and_order()
+    test_workers_load_with_the_profile_threads()
+    print("✅ Chunked transcription tests passed")
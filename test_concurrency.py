@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test that a shared WhisperTranscriber runs at most `concurrency` decodes at once
+"""
+
+import sys
+import threading
+import time
+sys.path.append('.')
+
+import numpy as np
+
+from python.audio_processing.whisper_handler import WhisperTranscriber
+from python.utils.disk_cache import DiskLRUCache
+
+
+class SlowTranscriber(WhisperTranscriber):
+    """WhisperTranscriber without a model: every decode sleeps and counts overlapping calls."""
+
+    def __init__(self, concurrency):
+        self.model_size, self.compute_type = "base", "int8"
+        self.decode_options = {}
+        self.workers = 1
+        self.concurrency = concurrency
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self.cache = DiskLRUCache("unused", 0)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def _run_model(self, audio, language):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self._lock:
+            self.running -= 1
+        yield {"word": " hi", "start": 0.0, "end": 0.5}
+
+
+def test_semaphore_caps_concurrent_transcriptions():
+    transcriber = SlowTranscriber(concurrency=2)
+    # Different audio per thread, so no request is served from another's result
+    threads = [
+        threading.Thread(target=transcriber.transcribe_audio, args=(np.full(160, i, dtype=np.float32),))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert transcriber.peak == 2
+    assert transcriber.running == 0
+
+
+if __name__ == "__main__":
+    test_semaphore_caps_concurrent_transcriptions()
+    print("✅ Concurrency tests passed")
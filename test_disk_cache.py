@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test the size-bounded on-disk LRU cache
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append('.')
+
+from python.text_processing.transcript import Transcript
+from python.utils.disk_cache import DiskLRUCache, content_key
+
+
+def write_bytes(size):
+    def write(path):
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+    return write
+
+
+def test_content_key():
+    assert content_key(b"audio", "base", "int8", None) == content_key(b"audio", "base", "int8", None)
+    assert content_key(b"audio", "base", "int8", None) != content_key(b"audio", "base", "int8", "en")
+    assert content_key(b"ab", "c") != content_key(b"a", "bc")
+
+
+def test_hits_misses_and_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskLRUCache(os.path.join(tmp, "cache"), max_bytes=250, suffix=".bin")
+        assert cache.get("a") is None
+        cache.put("a", write_bytes(100))
+        time.sleep(0.01)
+        cache.put("b", write_bytes(100))
+        time.sleep(0.01)
+        assert cache.get("a") is not None  # a is now the most recently used
+        time.sleep(0.01)
+        cache.put("c", write_bytes(100))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 2, 1)
+        assert stats["entries"] == 2 and stats["bytes"] == 200
+
+
+def test_disabled_and_failed_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert DiskLRUCache(tmp, max_bytes=0).put("a", write_bytes(10)) is None
+
+        def broken(path):
+            raise IOError("disk full")
+        cache = DiskLRUCache(tmp, max_bytes=1000)
+        assert cache.put("a", broken) is None
+        assert os.listdir(tmp) == []
+
+
+def test_transcript_entries():
+    words = [{"word": " hello", "start": 0.0, "end": 0.5}, {"word": " shit", "start": 0.5, "end": 0.9}]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskLRUCache(tmp, max_bytes=1 << 20, suffix=".ptx")
+        key = content_key(b"pcm", "base", "int8", None)
+        cache.put(key, Transcript.from_words(words).save)
+        assert Transcript.load(cache.get(key)).to_list() == words
+
+
+if __name__ == "__main__":
+    test_content_key()
+    test_hits_misses_and_eviction()
+    test_disabled_and_failed_writes()
+    test_transcript_entries()
+    print("✅ Disk cache tests passed")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test approximate matching of misrecognized lexicon words
+"""
+
+import sys
+sys.path.append('.')
+
+from python.text_processing.fuzzy import FuzzyIndex, edit_distance
+from python.text_processing.profanity_filter import filter_transcript
+from python.text_processing.token_index import TokenIndex
+
+
+def test_edit_distance():
+    assert edit_distance("fuckin", "fucking", 2) == 1
+    assert edit_distance("biatch", "bitch", 2) == 1
+    assert edit_distance("ab", "ba", 2) == 1  # transposition
+    assert edit_distance("hello", "world", 1) == 2  # capped at max_distance + 1
+
+
+def test_fuzzy_lookup():
+    index = FuzzyIndex({"fucking": 0, "bitch": 1, "shit": 2}, max_distance=1)
+    assert index.lookup("fuckin") == (0, 1)
+    assert index.lookup("biatch") == (1, 1)
+    assert index.lookup("sh*t") == (2, 1)
+    # Too short to match by edit distance
+    assert index.lookup("shot") is None
+    assert index.lookup("people") is None
+    # The first letter has to agree
+    assert index.lookup("pitch") is None
+    # More masked letters than the distance allows
+    assert index.lookup("f**king") is None
+    assert FuzzyIndex({"fucking": 0}, max_distance=2).lookup("f**king") == (0, 2)
+
+
+def test_dictionary_words_never_match():
+    index = FuzzyIndex({"bitch": 0, "boobs": 1}, max_distance=1, dictionary={"batch", "booby"})
+    assert index.lookup("batch") is None
+    assert index.lookup("booby") is None
+    assert index.lookup("bitchh") == (0, 1)
+
+
+def test_variants_stay_out_of_the_index():
+    index = TokenIndex(
+        {r'\bbitch\b': "jerk", r'\bbiatch\b': "jerk", r'\bb00bz\b': "chest", r'\bfaggot\b': "slur"},
+        aliases={"biatch": "bitch", "b00bz": "boobs"}
+    )
+    assert sorted(index.single_words()) == ["bitch", "faggot"]
+
+
+def test_near_misses_in_default_lexicon():
+    near_misses = [
+        "count", "pitch", "witch", "ditch", "batch", "passes", "masses", "basses",
+        "hunts", "punts", "cocky", "cooks", "maggot", "booby", "spank",
+    ]
+    transcript = [{"word": f" {word}", "start": float(i), "end": i + 0.5} for i, word in enumerate(near_misses)]
+    for distance in (1, 2):
+        assert filter_transcript(transcript, engine="tokens", fuzzy_distance=distance) == []
+
+
+def test_filter_transcript_fuzzy():
+    transcript = [
+        {"word": " You", "start": 0.0, "end": 0.4},
+        {"word": " sh*t,", "start": 0.4, "end": 0.8},
+        {"word": " man", "start": 0.8, "end": 1.2},
+    ]
+    assert filter_transcript(transcript, engine="tokens") == []
+    replacements = filter_transcript(transcript, engine="tokens", fuzzy_distance=1)
+    assert [(r["original"], r["replacement"]) for r in replacements] == [("sh*t", "crap")]
+
+
+if __name__ == "__main__":
+    test_edit_distance()
+    test_fuzzy_lookup()
+    test_dictionary_words_never_match()
+    test_variants_stay_out_of_the_index()
+    test_near_misses_in_default_lexicon()
+    test_filter_transcript_fuzzy()
+    print("✅ Fuzzy matching tests passed")
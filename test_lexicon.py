@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test lazy lexicon loading and the compiled lexicon cache
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.append('.')
+
+from python.text_processing import lexicon as lexicon_module
+from python.text_processing.lexicon import LexiconRegistry, load_lexicon
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("badword\tbadwordtype\treplacement_word\treplacement_wordtype\n")
+        for badword, replacement in rows:
+            f.write(f"{badword}\tnoun\t{replacement}\tliteral\n")
+
+
+def test_import_does_not_load_lexicon():
+    code = (
+        "import sys; sys.path.append('.');"
+        "import python.text_processing.profanity_filter;"
+        "from python.text_processing import lexicon;"
+        "print(lexicon.registry._lexicon is None)"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True).stdout
+    assert output.strip() == "True"
+
+
+def test_cache_round_trip_and_invalidation():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PROFANITY_CACHE_DIR"] = os.path.join(tmp, "cache")
+        try:
+            csv_path = os.path.join(tmp, "lexicon.csv")
+            write_csv(csv_path, [("darn", "dang")])
+
+            cold = load_lexicon(csv_path)
+            assert cold.patterns[r'\bdarn\b'] == "dang"
+            assert len(os.listdir(os.path.join(tmp, "cache"))) == 1
+
+            warm = load_lexicon(csv_path)
+            assert warm.patterns == cold.patterns
+            assert warm.matcher.find_all("oh darn") == [(0, 3, 7)]
+
+            # Editing the CSV produces a new cache entry
+            time.sleep(0.01)
+            write_csv(csv_path, [("heck", "gosh")])
+            edited = load_lexicon(csv_path)
+            assert r'\bheck\b' in edited.patterns and r'\bdarn\b' not in edited.patterns
+            assert len(os.listdir(os.path.join(tmp, "cache"))) == 2
+        finally:
+            del os.environ["PROFANITY_CACHE_DIR"]
+
+
+def test_registry_swaps_atomically():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PROFANITY_CACHE_DIR"] = os.path.join(tmp, "cache")
+        try:
+            csv_path = os.path.join(tmp, "lexicon.csv")
+            write_csv(csv_path, [("darn", "dang")])
+            registry = LexiconRegistry(csv_path)
+
+            snapshot = registry.current()
+            assert registry.reload() is snapshot  # unchanged file keeps the matcher
+
+            time.sleep(0.01)
+            write_csv(csv_path, [("heck", "gosh")])
+            reloaded = registry.reload()
+            assert registry.current() is reloaded
+            # A job holding the old snapshot still sees the old lexicon
+            assert r'\bdarn\b' in snapshot.patterns
+            assert r'\bheck\b' in reloaded.patterns
+        finally:
+            del os.environ["PROFANITY_CACHE_DIR"]
+
+
+def test_broadcast_reload_reaches_other_registries():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PROFANITY_CACHE_DIR"] = os.path.join(tmp, "cache")
+        try:
+            csv_path = os.path.join(tmp, "lexicon.csv")
+            write_csv(csv_path, [("darn", "dang")])
+            # Two registries stand in for two Gunicorn workers
+            handling, other = LexiconRegistry(csv_path), LexiconRegistry(csv_path)
+            stale = other.current()
+
+            time.sleep(0.01)
+            write_csv(csv_path, [("heck", "gosh")])
+            assert other.current() is stale  # nothing announced yet
+            reloaded = handling.reload(broadcast=True)
+            assert r'\bheck\b' in reloaded.patterns
+
+            assert r'\bheck\b' in other.current().patterns
+            assert handling.current() is reloaded
+        finally:
+            del os.environ["PROFANITY_CACHE_DIR"]
+
+
+def test_numbers_are_not_entries():
+    from python.text_processing.profanity_filter import filter_transcript
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "lexicon.csv")
+        write_csv(csv_path, [("55", "digits"), ("455", "behind"), ("a55", "behind")])
+        lexicon = load_lexicon(csv_path, use_cache=False)
+        assert r'\b55\b' not in lexicon.patterns and r'\ba55\b' in lexicon.patterns
+
+    transcript = [
+        {"word": f" {number}", "start": i * 0.5, "end": i * 0.5 + 0.5}
+        for i, number in enumerate(["55", "455", "1337", "2007"])
+    ]
+    lexicon = load_lexicon(use_cache=False)
+    for engine in ("text", "tokens"):
+        assert filter_transcript(transcript, engine=engine, lexicon=lexicon) == []
+
+
+def test_lexicon_path_is_absolute():
+    assert os.path.isabs(lexicon_module.lexicon_path())
+    assert os.path.exists(lexicon_module.DEFAULT_LEXICON_PATH)
+
+
+if __name__ == "__main__":
+    test_import_does_not_load_lexicon()
+    test_cache_round_trip_and_invalidation()
+    test_registry_swaps_atomically()
+    test_broadcast_reload_reaches_other_registries()
+    test_numbers_are_not_entries()
+    test_lexicon_path_is_absolute()
+    print("✅ Lexicon loading tests passed")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test that the compiled single-pass matcher gives the same results as the
+original per-pattern regex loop, and that overlaps are resolved optimally
+"""
+
+import random
+import re
+import sys
+sys.path.append('.')
+
+from python.text_processing.lexicon import Lexicon
+from python.text_processing.matcher import PatternMatcher
+from python.text_processing import profanity_filter
+from python.text_processing.profanity_filter import (
+    PROFANITY_MAP, filter_transcript, match_weight, resolve_overlaps
+)
+
+
+def reference_find_all(patterns, text):
+    """The original filter loop: one re.finditer per pattern"""
+    hits = []
+    for entry_id, pattern in enumerate(patterns):
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            hits.append((entry_id, match.start(), match.end()))
+    return hits
+
+
+def reference_candidates(transcript):
+    """The original filter_transcript before dedup: scan every word for every match"""
+    word_positions = []
+    char_pos = 0
+    for word in transcript:
+        word_positions.append((char_pos, char_pos + len(word["word"]), word))
+        char_pos += len(word["word"]) + 1
+    full_text = " ".join(word["word"] for word in transcript)
+
+    replacements = []
+    for pattern, replacement in PROFANITY_MAP.items():
+        for match in re.finditer(pattern, full_text, re.IGNORECASE):
+            overlapping = [
+                wp for wp in word_positions
+                if not (wp[1] <= match.start() or wp[0] >= match.end())
+            ]
+            if overlapping:
+                replacements.append({
+                    "start": overlapping[0][2]["start"],
+                    "end": overlapping[-1][2]["end"],
+                    "original": match.group(),
+                    "replacement": replacement,
+                    "words": len(overlapping)
+                })
+    return replacements
+
+
+def best_weight(intervals):
+    """Quadratic weighted interval scheduling over (start, end, weight)"""
+    intervals = sorted(intervals, key=lambda x: (x[1], x[0]))
+    best = [0]
+    for k, (start, end, weight) in enumerate(intervals):
+        p = max([j + 1 for j in range(k) if intervals[j][1] <= start], default=0)
+        best.append(max(best[k], best[p] + weight))
+    return best[-1]
+
+
+def check_resolution(result, candidates):
+    keyed = {}
+    for c in candidates:
+        keyed.setdefault((c["start"], c["end"], c["original"], c["replacement"]), c)
+    chosen = [keyed[(r["start"], r["end"], r["original"], r["replacement"])] for r in result]
+    assert all(a["end"] <= b["start"] for a, b in zip(chosen, chosen[1:]))
+    weight = lambda c: match_weight(c["start"], c["end"], c["words"])
+    assert sum(map(weight, chosen)) == best_weight([(c["start"], c["end"], weight(c)) for c in candidates])
+
+
+def random_text(rng, words, length):
+    filler = ["I", "love", "my", "and", "what", "the", "is", "this", "_x", "Bull-", "ok.", "-", " "]
+    tokens = []
+    for _ in range(length):
+        token = rng.choice(words) if rng.random() < 0.3 else rng.choice(filler)
+        if rng.random() < 0.2:
+            token = token.upper()
+        if rng.random() < 0.2:
+            token += rng.choice([",", ".", "!", "s", "_", "'"])
+        tokens.append(token)
+    return " ".join(tokens)
+
+
+def test_matches_reference_on_lexicon():
+    matcher = PatternMatcher(PROFANITY_MAP)
+    patterns = list(PROFANITY_MAP)
+    words = [re.sub(r'\\(.)', r'\1', p[2:-2]) for p in patterns if '\\s' not in p]
+    words += ["mother fucker", "motherfucker", "mother  fucker"]
+
+    rng = random.Random(7)
+    for _ in range(50):
+        text = random_text(rng, words, 200)
+        assert matcher.find_all(text) == reference_find_all(patterns, text)
+
+
+def test_overlapping_and_non_word_literals():
+    patterns = {
+        r'\ba\ a\b': "x",
+        r'\b' + re.escape('@55') + r'\b': "y",
+        r'\bab\b': "z",
+        r'\bab\-c\b': "w",
+        r'\bmother\s?fucker\b': "v",
+        r'\bbad\s+word\b': "u",
+    }
+    matcher = PatternMatcher(patterns)
+    for text in ["a a a a", "x@55 @55 b@55c", "ab ab-c ab_c", "MotherFucker bad   word", ""]:
+        assert matcher.find_all(text) == reference_find_all(list(patterns), text), text
+
+
+def test_unicode_case_folding():
+    patterns = {r'\bshit\b': "shoot", r'\bass\b': "butt", r'\bσκατά\b': "x", r'\bmother\s?fucker\b': "v"}
+    matcher = PatternMatcher(patterns)
+    for text in ["shİt SHİT", "ſhit aſſ", "shıt SHIT", "ΣΚΑΤΆ σκατά", "Straße shit", "motherfucKer"]:
+        expected = reference_find_all(list(patterns), text)
+        assert expected, text
+        assert matcher.find_all(text) == expected, text
+
+
+def test_filter_transcript_matches_reference():
+    words = [re.sub(r'\\(.)', r'\1', p[2:-2]) for p in PROFANITY_MAP if '\\s' not in p]
+    rng = random.Random(11)
+    for size in (0, 5, 300, 3000):
+        text = random_text(rng, words + ["mother fucker"], size)
+        transcript = []
+        t = 0.0
+        for token in text.split(" "):
+            duration = rng.choice([0.0, 0.2, 0.5])
+            transcript.append({"word": token, "start": t, "end": t + duration})
+            t += duration
+        result = filter_transcript(transcript)
+        check_resolution(result, reference_candidates(transcript))
+
+    # Exercise the bisect path too when the vectorized path is available
+    if profanity_filter.np is not None:
+        saved = profanity_filter.np
+        profanity_filter.np = None
+        try:
+            assert filter_transcript(transcript) == result
+        finally:
+            profanity_filter.np = saved
+
+
+def test_resolve_overlaps_chained():
+    # Greedy keeps only the middle match; the two outer ones cover more
+    starts, ends = [0.0, 1.0, 3.5], [2.0, 4.0, 6.0]
+    weights = [match_weight(s, e, 1) for s, e in zip(starts, ends)]
+    assert resolve_overlaps(starts, ends, weights) == [0, 2]
+    # A phrase beats the words it is made of when they weigh the same
+    assert resolve_overlaps([0.0, 0.0, 0.5], [1.0, 0.5, 1.0], [2, 1, 1]) == [0]
+    assert resolve_overlaps([], [], []) == []
+
+
+def test_overlap_weight_severity():
+    lexicon = Lexicon(
+        {r'\bmother\s?fucker\b': "awesome person", r'\bfucker\b': "jerk"},
+        ratings={r'\bmother\s?fucker\b': (1.8, ()), r'\bfucker\b': (2.8, ())}
+    )
+    transcript = [
+        {"word": "mother", "start": 0.0, "end": 0.5},
+        {"word": "fucker", "start": 0.5, "end": 1.0},
+    ]
+    for engine in ("text", "tokens"):
+        by_length = filter_transcript(transcript, engine=engine, lexicon=lexicon)
+        assert [r["replacement"] for r in by_length] == ["awesome person"]
+        by_severity = filter_transcript(transcript, engine=engine, lexicon=lexicon, overlap_weight="severity")
+        assert [r["replacement"] for r in by_severity] == ["jerk"]
+
+if __name__ == "__main__":
+    test_matches_reference_on_lexicon()
+    test_filter_transcript_matches_reference()
+    test_overlapping_and_non_word_literals()
+    test_unicode_case_folding()
+    test_resolve_overlaps_chained()
+    test_overlap_weight_severity()
+    print("✅ Matcher matches the per-pattern regex loop")
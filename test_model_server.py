@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the model server protocol and a client/server round trip
+"""
+
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+sys.path.append('.')
+
+import numpy as np
+
+from python.audio_processing.model_server import (
+    ModelClient, ModelServer, ModelServerError, decode_transcribe, encode_transcribe
+)
+from python.text_processing.transcript import Transcript
+
+
+class EchoTranscriber:
+    """Answers with one word per request describing what it received."""
+
+    def transcribe_audio(self, audio, language=None):
+        if language == "xx":
+            raise RuntimeError("unsupported language")
+        return Transcript.from_words([
+            {"word": f" {language or 'auto'}", "start": 0.0, "end": len(audio) / 16000},
+        ])
+
+    def transcribe_segments(self, audio, language=None):
+        return Transcript.from_words([{"word": " one two", "start": 0.0, "end": 1.0}])
+
+    def cache_stats(self):
+        return {"hits": 1, "misses": 2}
+
+
+def test_transcribe_payload_roundtrip():
+    audio = np.linspace(-1, 1, 1000, dtype=np.float32)
+    decoded, language, profile = decode_transcribe(b"".join(encode_transcribe(audio, "en", "realtime")))
+    assert (language, profile) == ("en", "realtime")
+    assert np.array_equal(decoded, audio)
+
+    decoded, language, profile = decode_transcribe(b"".join(encode_transcribe(audio[:0], None)))
+    assert language is None and profile is None and len(decoded) == 0
+
+
+def test_client_server_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "whisper.sock")
+        profiles = []
+        echo = EchoTranscriber()
+        server = ModelServer(socket_path, lambda profile: profiles.append(profile) or echo)
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = ModelClient(socket_path, timeout=10)
+            client.wait_until_ready(timeout=5)
+
+            transcript = client.transcribe_audio(np.zeros(32000, dtype=np.float32), "en")
+            assert transcript.to_list() == [{"word": " en", "start": 0.0, "end": 2.0}]
+            # The same connection serves further requests
+            assert [w["word"] for w in client.iter_words(np.zeros(16000, dtype=np.float32))] == [" auto"]
+            assert client.transcribe_segments(np.zeros(10, dtype=np.float32)).words() == [" one two"]
+            assert client.cache_stats() == {"hits": 1, "misses": 2}
+            assert ModelClient(socket_path, profile="accurate").transcribe_audio(np.zeros(10, dtype=np.float32))
+            assert profiles == [None, None, None, None, "accurate"]
+
+            try:
+                client.transcribe_audio(np.zeros(10, dtype=np.float32), "xx")
+                assert False, "server error was not raised"
+            except ModelServerError as e:
+                assert "unsupported language" in str(e)
+            # ...and the connection survives an error reply
+            assert len(client.transcribe_audio(np.zeros(10, dtype=np.float32))) == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert not os.path.exists(socket_path)
+
+
+def test_unreachable_server():
+    with tempfile.TemporaryDirectory() as tmp:
+        client = ModelClient(os.path.join(tmp, "missing.sock"))
+        try:
+            client.wait_until_ready(timeout=0, interval=0)
+            assert False, "missing server was not reported"
+        except ModelServerError:
+            pass
+
+
+def test_client_does_not_import_faster_whisper():
+    code = (
+        "import sys; sys.path.append('.'); "
+        "from python.audio_processing.whisper_handler import get_transcriber; "
+        "import os; os.environ['WHISPER_SERVER_SOCKET'] = '/nonexistent.sock'; "
+        "get_transcriber(); "
+        "assert 'faster_whisper' not in sys.modules and 'ctranslate2' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    test_transcribe_payload_roundtrip()
+    test_client_server_roundtrip()
+    test_unreachable_server()
+    test_client_does_not_import_faster_whisper()
+    print("✅ Model server tests passed")
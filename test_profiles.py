@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test transcription profiles: their settings, name resolution and rejection of unknown names
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+sys.path.append('.')
+
+from python.audio_processing import whisper_handler
+from python.audio_processing.whisper_handler import PROFILES, WhisperTranscriber, resolve_profile
+
+
+class StubModel:
+    """Stands in for faster_whisper.WhisperModel and records how it was loaded."""
+
+    def __init__(self, model_size, **kwargs):
+        self.model_size = model_size
+        self.kwargs = kwargs
+
+
+def test_profiles_trade_speed_for_accuracy():
+    assert set(PROFILES) == {"realtime", "balanced", "accurate"}
+    assert PROFILES["realtime"]["beam_size"] < PROFILES["balanced"]["beam_size"] < PROFILES["accurate"]["beam_size"]
+    assert PROFILES["realtime"]["vad_filter"] and not PROFILES["accurate"]["vad_filter"]
+    assert PROFILES["accurate"]["compute_type"] == "float32"
+
+
+def test_resolve_profile():
+    os.environ.pop("WHISPER_PROFILE", None)
+    assert resolve_profile() == "balanced"
+    assert resolve_profile(" Accurate ") == "accurate"
+    os.environ["WHISPER_PROFILE"] = "realtime"
+    try:
+        assert resolve_profile() == "realtime"
+        assert resolve_profile("balanced") == "balanced"
+    finally:
+        del os.environ["WHISPER_PROFILE"]
+
+    for unknown in ("fast", "  ", "int8"):
+        try:
+            resolve_profile(unknown)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert "Unknown transcription profile" in str(e)
+
+
+def test_from_profile():
+    original = whisper_handler._load_whisper_model
+    whisper_handler._load_whisper_model = StubModel
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["WHISPER_TUNING_FILE"] = os.path.join(tmp, "missing.json")
+        try:
+            transcriber = WhisperTranscriber.from_profile("accurate", concurrency=1)
+        finally:
+            whisper_handler._load_whisper_model = original
+            del os.environ["WHISPER_TUNING_FILE"]
+    assert transcriber.compute_type == "float32"
+    assert transcriber.decode_options == {"beam_size": 8, "best_of": 5, "vad_filter": False}
+    assert transcriber.model.kwargs["cpu_threads"] == 2
+
+    try:
+        WhisperTranscriber.from_profile("fast")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_cli_rejects_unknown_profile():
+    result = subprocess.run(
+        [sys.executable, "-m", "python.main", "input.mp4", "output", "--profile", "fast"],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 2
+    assert "invalid choice: 'fast'" in result.stderr
+
+
+if __name__ == "__main__":
+    test_profiles_trade_speed_for_accuracy()
+    test_resolve_profile()
+    test_from_profile()
+    test_cli_rejects_unknown_profile()
+    print("✅ Profile tests passed")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test severity and category selection of the lexicon
+"""
+
+import sys
+sys.path.append('.')
+
+from python.text_processing.lexicon import (
+    Lexicon, category_slug, get_lexicon, parse_severity, rate_entries
+)
+from python.text_processing.profanity_filter import filter_transcript, filter_transcripts
+
+
+def test_parse_severity():
+    assert parse_severity(None) is None
+    assert parse_severity("Severe") == 2.6
+    assert parse_severity("2.2") == 2.2
+    try:
+        parse_severity("very")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_rate_entries():
+    ratings = {
+        "shit": (1.2, ("bodily-fluids-excrement",)),
+        "motherfucker": (3.0, ("sexual-anatomy-sexual-acts",)),
+    }
+    rated = rate_entries([r'\bshit\b', r'\bsh1t\b', r'\bmother\s?fucker\b', r'\bheck\b'], ratings)
+    assert rated[r'\bshit\b'] == ratings["shit"]
+    assert rated[r'\bsh1t\b'] == ratings["shit"]  # rated through its leet-folded spelling
+    assert rated[r'\bmother\s?fucker\b'] == ratings["motherfucker"]
+    assert rated[r'\bheck\b'][1] == ()
+    assert category_slug("bodily fluids / excrement") == "bodily-fluids-excrement"
+
+
+def test_select():
+    lexicon = Lexicon(
+        {r'\bshit\b': 'crap', r'\bmotherfucker\b': 'jerk', r'\bheck\b': 'gosh'},
+        ratings={
+            r'\bshit\b': (1.2, ("bodily-fluids-excrement",)),
+            r'\bmotherfucker\b': (3.0, ("sexual-anatomy-sexual-acts", "other-general-insult")),
+        }
+    )
+    assert lexicon.select() is lexicon
+    assert list(lexicon.select(min_severity="severe").patterns) == [r'\bmotherfucker\b']
+    assert lexicon.select(min_severity="severe") is lexicon.select(min_severity=2.6)  # compiled once
+    assert list(lexicon.select(categories=["bodily-fluids"]).patterns) == [r'\bshit\b']
+    assert list(lexicon.select(exclude_categories=["sexual anatomy"]).patterns) == [r'\bshit\b', r'\bheck\b']
+
+
+def test_select_rejects_unknown_categories():
+    lexicon = Lexicon({r'\bshit\b': 'crap'}, ratings={r'\bshit\b': (1.2, ("bodily-fluids",))}, categories=["political"])
+    # Known from badWords.csv even though no entry of this lexicon uses it
+    assert lexicon.select(exclude_categories=["political"]).patterns == lexicon.patterns
+    for selection in ({"exclude_categories": ["politcal"]}, {"categories": ["bodily-fluids", "religous-offense"]}):
+        try:
+            lexicon.select(**selection)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert "Unknown categor" in str(e)
+
+
+def test_selection_cache_is_bounded():
+    from python.text_processing.lexicon import SELECTION_CACHE_SIZE
+
+    lexicon = Lexicon({r'\bshit\b': 'crap'}, ratings={r'\bshit\b': (1.2, ())})
+    first = lexicon.select(min_severity=1.0)
+    for i in range(SELECTION_CACHE_SIZE + 5):
+        lexicon.select(min_severity=1.0 + i / 100)
+    assert len(lexicon._selections) == SELECTION_CACHE_SIZE
+    # The least recently used selection was dropped and is compiled anew
+    assert lexicon.select(min_severity=1.0) is not first
+
+
+def test_filter_transcript_severity():
+    transcript = [
+        {"word": " Shit,", "start": 0.0, "end": 0.4},
+        {"word": " you", "start": 0.4, "end": 0.6},
+        {"word": " motherfucker", "start": 0.6, "end": 1.2},
+    ]
+    lexicon = get_lexicon()
+    for engine in ("text", "tokens"):
+        replacements = filter_transcript(transcript, engine=engine, lexicon=lexicon)
+        assert len(replacements) == 2
+        severe = filter_transcript(transcript, engine=engine, lexicon=lexicon, min_severity="severe")
+        assert [r["start"] for r in severe] == [0.6]
+    results = list(filter_transcripts([transcript] * 3, workers=1, min_severity="severe"))
+    assert all(len(result) == 1 for result in results)
+
+
+if __name__ == "__main__":
+    test_parse_severity()
+    test_rate_entries()
+    test_select()
+    test_select_rejects_unknown_categories()
+    test_selection_cache_is_bounded()
+    test_filter_transcript_severity()
+    print("✅ Severity selection tests passed")
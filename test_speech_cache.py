@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test that replacement speech is served from the TTS cache and survives eviction
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+sys.path.append('.')
+
+from python.audio_processing import edge_tts_handler
+
+
+class StubCommunicate:
+    """Stands in for edge_tts.Communicate and counts syntheses."""
+
+    calls = 0
+
+    def __init__(self, text, voice, rate="+0%"):
+        self.data = f"{text}|{voice}|{rate}".encode("utf-8")
+
+    async def save(self, path):
+        StubCommunicate.calls += 1
+        with open(path, "wb") as f:
+            f.write(self.data)
+
+
+def synthesize(text, output_path):
+    return asyncio.run(edge_tts_handler._synthesize(text, "en-US-JennyNeural", "+0%", output_path))
+
+
+def with_stubs(test):
+    def run():
+        originals = (
+            edge_tts_handler.edge_tts.Communicate, edge_tts_handler._probe_duration,
+            edge_tts_handler._speech_cache, edge_tts_handler.CLIP_DURATION_CACHE_SIZE
+        )
+        edge_tts_handler.edge_tts.Communicate = StubCommunicate
+        edge_tts_handler._probe_duration = lambda path: float(os.path.getsize(path))
+        StubCommunicate.calls = 0
+        edge_tts_handler._clip_durations.clear()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["TTS_CACHE_DIR"] = os.path.join(tmp, "tts")
+            edge_tts_handler._speech_cache = None
+            try:
+                test(tmp)
+            finally:
+                del os.environ["TTS_CACHE_DIR"]
+                (edge_tts_handler.edge_tts.Communicate, edge_tts_handler._probe_duration,
+                 edge_tts_handler._speech_cache, edge_tts_handler.CLIP_DURATION_CACHE_SIZE) = originals
+                edge_tts_handler._clip_durations.clear()
+    run.__name__ = test.__name__
+    return run
+
+
+@with_stubs
+def test_miss_then_hit(tmp):
+    first, second = os.path.join(tmp, "a.mp3"), os.path.join(tmp, "b.mp3")
+    duration = synthesize("gosh", first)
+    assert StubCommunicate.calls == 1
+
+    assert synthesize("gosh", second) == duration
+    assert StubCommunicate.calls == 1  # copied from the cache
+    with open(first, "rb") as a, open(second, "rb") as b:
+        assert a.read() == b.read()
+    assert edge_tts_handler.speech_cache().stats()["hits"] == 1
+
+
+@with_stubs
+def test_eviction_during_copy(tmp):
+    synthesize("gosh", os.path.join(tmp, "a.mp3"))
+    cache = edge_tts_handler.speech_cache()
+
+    # Another worker evicts the clip right after the lookup
+    lookup = cache.get
+    def get_then_evict(key):
+        path = lookup(key)
+        os.remove(path)
+        return path
+    cache.get = get_then_evict
+
+    output = os.path.join(tmp, "b.mp3")
+    assert synthesize("gosh", output) > 0
+    assert StubCommunicate.calls == 2
+    assert os.path.getsize(output) > 0
+
+
+@with_stubs
+def test_clip_durations_are_bounded(tmp):
+    edge_tts_handler.CLIP_DURATION_CACHE_SIZE = 2
+    for word in ("gosh", "heck", "darn"):
+        synthesize(word, os.path.join(tmp, f"{word}.mp3"))
+    assert len(edge_tts_handler._clip_durations) == 2
+
+
+if __name__ == "__main__":
+    test_miss_then_hit()
+    test_eviction_during_copy()
+    test_clip_durations_are_bounded()
+    print("✅ Speech cache tests passed")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test that the streaming filter emits the same replacements as the batch filter
+"""
+
+import random
+import sys
+sys.path.append('.')
+
+from python.text_processing.lexicon import get_lexicon
+from python.text_processing.profanity_filter import filter_transcript
+from python.text_processing.streaming import StreamingFilter, stream_filter
+
+
+def random_transcript(rng, size):
+    lexicon_words = [p[2:-2].replace('\\', '') for p in get_lexicon().patterns if '\\s' not in p]
+    vocabulary = lexicon_words[:40] + ["mother", "fucker", "sh1t", "hello", "there", "and"] * 5
+    transcript = []
+    t = 0.0
+    for _ in range(size):
+        duration = rng.choice([0.0, 0.1, 0.3])
+        transcript.append({"word": " " + rng.choice(vocabulary), "start": t, "end": t + duration})
+        t += rng.choice([0.0, duration, duration + 0.1])
+    return transcript
+
+
+def test_stream_matches_batch():
+    rng = random.Random(5)
+    for size in (0, 1, 2, 50, 500):
+        transcript = random_transcript(rng, size)
+        for fuzzy_distance in (0, 1):
+            expected = filter_transcript(transcript, engine="tokens", fuzzy_distance=fuzzy_distance)
+            assert list(stream_filter(transcript, fuzzy_distance=fuzzy_distance)) == expected
+
+
+def test_matches_are_emitted_early():
+    stream = StreamingFilter()
+    assert stream.feed({"word": " what", "start": 0.0, "end": 0.5}) == []
+    assert stream.feed({"word": " shit", "start": 0.5, "end": 1.0}) == []
+    # "shit" can't grow into "mother fucker"; it is final once a later word starts after it
+    emitted = stream.feed({"word": " man", "start": 1.0, "end": 1.5})
+    emitted += stream.feed({"word": " okay", "start": 1.5, "end": 2.0})
+    assert [r["original"] for r in emitted] == ["shit"]
+    assert stream.flush() == []
+
+
+def test_numbers_pass_through():
+    transcript = [
+        {"word": f" {number}", "start": i * 0.5, "end": i * 0.5 + 0.5}
+        for i, number in enumerate(["55", "455", "1337", "2007"])
+    ]
+    assert list(stream_filter(transcript)) == []
+
+
+if __name__ == "__main__":
+    test_stream_matches_batch()
+    test_matches_are_emitted_early()
+    test_numbers_pass_through()
+    print("✅ Streaming filter tests passed")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the token-level lexicon index used by filter_transcript(engine="tokens")
+"""
+
+import sys
+sys.path.append('.')
+
+from python.text_processing.token_index import TokenIndex, normalize_token
+from python.text_processing.profanity_filter import filter_transcript
+
+
+def words(*items):
+    return [{"word": w, "start": i * 0.5, "end": i * 0.5 + 0.5} for i, w in enumerate(items)]
+
+
+def test_normalize_token():
+    assert normalize_token(" Shit,") == "shit"
+    assert normalize_token("“Jeans!”") == "jeans"
+    assert normalize_token(" ...") == ""
+
+
+def test_whisper_style_tokens():
+    transcript = words(" What", " the", " shit,", " is", " this", " JEANS?")
+    replacements = filter_transcript(transcript, engine="tokens")
+    assert [(r["original"], r["replacement"]) for r in replacements] == [("shit", "crap"), ("JEANS", "pants")]
+    assert (replacements[0]["start"], replacements[0]["end"]) == (1.0, 1.5)
+
+
+def test_multi_word_entries():
+    index = TokenIndex({r'\bmother\s?fucker\b': "awesome person", r'\bfucker\b': "jerk"})
+    assert index.max_phrase_len == 2
+    assert index.find_all(["you", "mother", "fucker"]) == [(0, 1, 2), (1, 2, 2)]
+    assert index.find_all(["motherfucker"]) == [(0, 0, 0)]
+
+    # The longer phrase wins over the single word it contains
+    replacements = filter_transcript(words(" you", " mother", " fucker."), engine="tokens")
+    assert [r["replacement"] for r in replacements] == ["awesome person"]
+    assert replacements[0]["original"] == "mother fucker"
+
+
+def test_leet_variants_fold_to_canonical_forms():
+    index = TokenIndex(
+        {r'\bshit\b': "crap", r'\b5hit\b': "crap", r'\bass\b': "butt", r'\bc0ck\b': "rooster"},
+        aliases={"@55": "ass", "azz": "ass", "nope": "missing"}
+    )
+    # 5hit folds into the same node as shit; c0ck stays, so "cock" is found through it
+    assert index.lookup("sh1t") == 0
+    assert index.lookup("5hit") == 0
+    assert index.lookup("$hit") == 0
+    assert index.lookup("cock") == 3
+    assert index.lookup("@55") == 2
+    assert index.lookup("azz") == 2
+    assert index.lookup("nope") is None
+
+
+def test_numbers_are_not_folded():
+    index = TokenIndex({r'\bass\b': "behind", r'\bss\b': "digits", r'\bleet\b': "elite", r'\bzoot\b': "suit"})
+    assert index.find_all(["55", "455", "1337", "2007"]) == []
+    assert index.lookup("455") is None
+    # A single letter is enough to treat the token as a spelled word
+    assert index.lookup("a55") == 0
+
+    transcript = words(" In", " 2007,", " 455", " people", " paid", " 55", " dollars", " and", " 1337.")
+    assert filter_transcript(transcript, engine="tokens") == []
+    assert filter_transcript(transcript, engine="tokens", fuzzy_distance=1) == []
+
+
+def test_exact_spelling_keeps_its_own_replacement():
+    index = TokenIndex({r'\bc0ck\b': "member", r'\bcock\b': "rooster"})
+    assert index.lookup("cock") == 1
+    assert index.lookup("c0ck") == 0
+
+
+def test_agrees_with_text_engine_on_clean_words():
+    transcript = words(" I", " love", " my", " jeans", " and", " shit", " asshole", " hello")
+    assert filter_transcript(transcript, engine="tokens") == filter_transcript(transcript)
+
+
+if __name__ == "__main__":
+    test_normalize_token()
+    test_whisper_style_tokens()
+    test_multi_word_entries()
+    test_leet_variants_fold_to_canonical_forms()
+    test_numbers_are_not_folded()
+    test_exact_spelling_keeps_its_own_replacement()
+    test_agrees_with_text_engine_on_clean_words()
+    print("✅ Token index tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the columnar Transcript type
+"""
+
+import os
+import pickle
+import random
+import sys
+import tempfile
+from collections.abc import Mapping, Sequence
+sys.path.append('.')
+
+from python.text_processing.profanity_filter import filter_transcript
+from python.text_processing.transcript import Transcript, np
+
+
+def make_words(count, seed=3):
+    rng = random.Random(seed)
+    vocabulary = [" I", " love", " my", " jeans", " and", " shit,", " asshole", " hello", " mother", " fucker"]
+    words = []
+    t = 0.0
+    for _ in range(count):
+        duration = rng.choice([0.0, 0.12, 0.3, 0.55])
+        words.append({"word": rng.choice(vocabulary), "start": round(t, 2), "end": round(t + duration, 2)})
+        t += duration + rng.choice([0.0, 0.05])
+    return words
+
+
+def test_views_read_like_dicts():
+    words = make_words(200)
+    transcript = Transcript.from_words(words)
+    assert len(transcript) == 200
+    assert isinstance(transcript, Sequence) and isinstance(transcript[0], Mapping)
+    assert transcript[0] == words[0]
+    assert transcript[-1]["end"] == words[-1]["end"]
+    assert transcript.to_list() == words
+    assert list(transcript[10:20]) == words[10:20]
+    assert transcript[10:20][0] == words[10]
+    assert len(transcript[150:400]) == 50
+
+
+def test_time_slicing_shares_buffers():
+    words = make_words(500)
+    transcript = Transcript.from_words(words)
+    start, end = words[100]["start"], words[200]["start"]
+    window = transcript.between(start, end)
+    assert window._text is transcript._text
+    assert window.to_list() == [w for w in words if w["end"] > start and w["start"] < end]
+
+    # Pickling a window only carries its own words
+    restored = pickle.loads(pickle.dumps(window))
+    assert restored.to_list() == window.to_list()
+    assert len(restored._text) < len(transcript._text)
+
+
+def test_memory_and_filtering():
+    words = make_words(20000)
+    transcript = Transcript.from_words(words)
+    dict_bytes = sum(sys.getsizeof(w) + sys.getsizeof(w["word"]) for w in words)
+    assert transcript.nbytes * 5 < dict_bytes
+
+    for engine in ("text", "tokens"):
+        assert filter_transcript(transcript, engine=engine) == filter_transcript(words, engine=engine)
+
+
+def test_binary_round_trip():
+    words = make_words(300) + [{"word": " naïve", "start": 99.0, "end": 99.5}]
+    transcript = Transcript.from_words(words)
+    assert Transcript.from_bytes(transcript.to_bytes()).to_list() == words
+    assert Transcript.from_bytes(transcript[50:60].to_bytes()).to_list() == words[50:60]
+    assert len(transcript.to_bytes()) < len(repr(words)) / 2
+
+    try:
+        Transcript.from_bytes(b"not a transcript at all")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        names = ["words.ptx", "words.npz"] if np is not None else ["words.ptx"]
+        for name in names:
+            path = os.path.join(tmp_dir, name)
+            transcript.save(path)
+            loaded = Transcript.load(path)
+            assert loaded.to_list() == words
+            assert loaded.between(10.0, 20.0).to_list() == transcript.between(10.0, 20.0).to_list()
+        # The mapped file is used in place
+        assert isinstance(Transcript.load(os.path.join(tmp_dir, "words.ptx"))._starts, memoryview)
+
+
+if __name__ == "__main__":
+    test_views_read_like_dicts()
+    test_time_slicing_shares_buffers()
+    test_memory_and_filtering()
+    test_binary_round_trip()
+    print("✅ Transcript tests passed")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test that every tool transcribes an upload under the same transcript cache key
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+sys.path.append('.')
+
+from python.audio_processing import whisper_handler
+from python.main import process_video
+from python.others import profanity_detector, transcription_analyzer
+from python.text_processing.transcript import Transcript
+import python.main as main_module
+
+
+class KeyRecorder:
+    """Stands in for the shared transcriber and records the cache key of every request."""
+
+    def __init__(self):
+        self.keys = []
+
+    def transcribe_audio(self, audio_path, language=None):
+        audio = whisper_handler.prepare_audio(audio_path)
+        self.keys.append(whisper_handler.transcript_key(audio, "base", "int8", language, "word_timestamps", {}))
+        return Transcript()
+
+
+def make_clip(path):
+    subprocess.run([
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", "testsrc=size=64x64:rate=10:duration=2",
+        "-f", "lavfi", "-i", "sine=frequency=440:duration=2",
+        "-shortest", "-c:v", "libx264", "-c:a", "aac", path
+    ], check=True)
+
+
+def test_tools_share_the_transcript_key():
+    recorder = KeyRecorder()
+    modules = (main_module, profanity_detector, transcription_analyzer)
+    originals = [module.get_transcriber for module in modules]
+    for module in modules:
+        module.get_transcriber = lambda profile=None: recorder
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            upload = os.path.join(tmp, "upload.mp4")
+            make_clip(upload)
+
+            process_video(upload, os.path.join(tmp, "video"))
+            assert profanity_detector.detect_profanity(upload)["success"]
+            os.makedirs(os.path.join(tmp, "transcript"))
+            transcription_analyzer.generate_transcription_pdf(upload, os.path.join(tmp, "transcript"), "upload")
+    finally:
+        for module, original in zip(modules, originals):
+            module.get_transcriber = original
+
+    assert len(recorder.keys) == 3
+    assert len(set(recorder.keys)) == 1
+
+
+if __name__ == "__main__":
+    test_tools_share_the_transcript_key()
+    print("✅ Transcript key tests passed")
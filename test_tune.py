@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test the auto-tuning helpers: thread layouts, winner selection, tuning file
+"""
+
+import json
+import os
+import sys
+import tempfile
+sys.path.append('.')
+
+from python.audio_processing.tune import (
+    COMPUTE_TYPES, load_tuned_settings, pick_best, profile_compute_types, save_tuning, thread_layouts
+)
+
+
+def test_thread_layouts():
+    assert thread_layouts(1) == [(1, 1)]
+    assert thread_layouts(4) == [(4, 1), (2, 2), (1, 4)]
+    assert thread_layouts(6) == [(6, 1), (3, 2), (1, 4)]
+
+
+def test_pick_best():
+    results = [
+        {"compute_type": "float32", "rtf": 0.30, "peak_rss_mb": 900.0},
+        {"compute_type": "int8", "rtf": 0.12, "peak_rss_mb": 400.0},
+        {"compute_type": "int8_float32", "rtf": 0.12, "peak_rss_mb": 380.0},
+        {"compute_type": "int8", "error": "unsupported", "peak_rss_mb": 50.0},
+    ]
+    assert pick_best(results)["compute_type"] == "int8_float32"  # same speed, less memory
+    assert pick_best(results, max_rss_mb=300) is None
+    assert pick_best([]) is None
+
+
+def test_tuning_file_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tuning.json")
+        assert load_tuned_settings("balanced", "base", path) == {}
+
+        best = {"model_size": "base", "compute_type": "int8", "cpu_threads": 2, "num_workers": 2,
+                "rtf": 0.1, "peak_rss_mb": 400.0}
+        save_tuning("balanced", best, os.cpu_count(), path)
+        save_tuning("accurate", dict(best, compute_type="float32"), os.cpu_count(), path)
+
+        assert load_tuned_settings("balanced", "base", path) == {"cpu_threads": 2, "num_workers": 2}
+        # Only realtime takes a tuned compute type; the others keep their profile's
+        assert load_tuned_settings("accurate", "base", path) == {"cpu_threads": 2, "num_workers": 2}
+        save_tuning("realtime", dict(best, compute_type="int8_float32"), os.cpu_count(), path)
+        assert load_tuned_settings("realtime", "base", path)["compute_type"] == "int8_float32"
+        # Tuned for another model, or on another machine: ignored
+        assert load_tuned_settings("balanced", "small", path) == {}
+        with open(path) as f:
+            data = json.load(f)
+        data["profiles"]["balanced"]["cpu_count"] = -1
+        with open(path, "w") as f:
+            json.dump(data, f)
+        assert load_tuned_settings("balanced", "base", path) == {}
+
+        with open(path, "w") as f:
+            f.write("not json")
+        assert load_tuned_settings("balanced", "base", path) == {}
+
+
+def test_profile_compute_types():
+    assert profile_compute_types("realtime") == COMPUTE_TYPES
+    assert profile_compute_types("realtime", ["int8"]) == ("int8",)
+    assert profile_compute_types("accurate") == ("float32",)
+    assert profile_compute_types("balanced", ["float32"]) == ("int8",)
+
+
+if __name__ == "__main__":
+    test_thread_layouts()
+    test_pick_best()
+    test_tuning_file_roundtrip()
+    test_profile_compute_types()
+    print("✅ Tuning tests passed")
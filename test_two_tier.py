@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test two-tier transcription and hit-only word alignment
+"""
+
+import sys
+sys.path.append('.')
+
+import numpy as np
+
+from python.audio_processing.two_tier import (
+    candidate_windows, rough_words, splice_windows, transcribe_aligned_hits, transcribe_two_tier
+)
+from python.text_processing.lexicon import Lexicon
+from python.text_processing.transcript import Transcript
+
+
+def make_scan(words):
+    """One word per second: word i spans [i, i + 0.5]."""
+    return Transcript.from_words(
+        {"word": f" {word}", "start": float(i), "end": i + 0.5} for i, word in enumerate(words)
+    )
+
+
+def test_windows_cover_whole_words():
+    scan = make_scan(["a", "b", "c", "d", "e", "f", "g", "h"])
+    windows = candidate_windows(scan, [{"start": 3.0, "end": 3.5}], duration=8.0, padding=1.0)
+    # Words 2-4 lie within a second of the hit; edges fall halfway through the pauses
+    assert windows == [(2, 4, 1.75, 4.75)]
+
+
+def test_windows_merge_and_clip():
+    scan = make_scan(["a", "b", "c", "d", "e", "f", "g", "h"])
+    hits = [{"start": 6.0, "end": 6.5}, {"start": 0.0, "end": 0.5}, {"start": 2.0, "end": 2.5}]
+    windows = candidate_windows(scan, hits, duration=8.5, padding=1.0)
+    assert windows == [(0, 3, 0.0, 3.75), (5, 7, 4.75, 8.5)]
+    assert candidate_windows(scan, [], duration=8.0) == []
+
+
+def test_splice_replaces_window_words():
+    scan = make_scan(["a", "b", "c", "d", "e"])
+    windows = [(1, 2, 0.75, 2.75)]
+    verified = [[{"word": " bee", "start": 0.3, "end": 0.7}, {"word": " see", "start": 1.2, "end": 5.0}]]
+    words = list(splice_windows(scan, windows, verified))
+    assert [w["word"] for w in words] == [" a", " bee", " see", " d", " e"]
+    assert words[1]["start"] == 1.05 and words[1]["end"] == 1.45
+    # Times past the window edge are clipped to it
+    assert words[2]["end"] == 2.75
+
+
+class ScriptedTranscriber:
+    """Returns fixed words and records the audio lengths it was given."""
+
+    def __init__(self, words):
+        self.words = words
+        self.calls = []
+
+    def transcribe_audio(self, audio, language=None):
+        self.calls.append((len(audio), language))
+        return Transcript.from_words(self.words)
+
+
+def test_only_candidate_windows_are_retranscribed():
+    lexicon = Lexicon({r'\bdarn\b': "dang"})
+    scan_words = [{"word": f" {w}", "start": float(i), "end": i + 0.5}
+                  for i, w in enumerate(["well", "it", "is", "darn", "cold", "out", "here", "today"])]
+    scanner = ScriptedTranscriber(scan_words)
+    verifier = ScriptedTranscriber([{"word": " darn", "start": 0.1, "end": 0.4}])
+
+    audio = np.zeros(8 * 16000, dtype=np.float32)
+    transcript = transcribe_two_tier(audio, scanner, verifier, lexicon, language="en", padding=0.0)
+
+    assert scanner.calls == [(len(audio), "en")]
+    # Only the word "darn" (2.75s-3.75s) is transcribed again
+    assert verifier.calls == [(16000, "en")]
+    assert transcript.words() == [" well", " it", " is", " darn", " cold", " out", " here", " today"]
+    assert transcript[3]["start"] == 2.85
+
+
+def test_rough_words():
+    segments = Transcript.from_words([
+        {"word": " Hi there", "start": 0.0, "end": 1.0},
+        {"word": "", "start": 1.0, "end": 1.5},
+        {"word": " ok", "start": 2.0, "end": 2.5},
+    ])
+    words, first_word = rough_words(segments)
+    assert first_word == [0, 2, 2, 3]
+    assert words.to_list() == [
+        {"word": " Hi", "start": 0.0, "end": 0.333},
+        {"word": " there", "start": 0.333, "end": 1.0},
+        {"word": " ok", "start": 2.0, "end": 2.5},
+    ]
+
+
+class SegmentTranscriber(ScriptedTranscriber):
+    def __init__(self, segments, words):
+        super().__init__(words)
+        self.segments = segments
+
+    def transcribe_segments(self, audio, language=None):
+        return Transcript.from_words(self.segments)
+
+
+def test_only_hit_segments_are_aligned():
+    lexicon = Lexicon({r'\bdarn\b': "dang"})
+    transcriber = SegmentTranscriber(
+        [
+            {"word": " Nice weather today.", "start": 0.0, "end": 2.0},
+            {"word": " It is darn cold.", "start": 3.0, "end": 5.0},
+            {"word": " See you.", "start": 6.0, "end": 7.0},
+        ],
+        [{"word": w, "start": 0.1 + 0.4 * i, "end": 0.4 + 0.4 * i}
+         for i, w in enumerate([" It", " is", " darn", " cold."])]
+    )
+    audio = np.zeros(8 * 16000, dtype=np.float32)
+    transcript = transcribe_aligned_hits(audio, transcriber, lexicon, language="en")
+
+    # Only the middle segment, widened halfway into the pauses (2.5s-5.5s)
+    assert transcriber.calls == [(3 * 16000, "en")]
+    assert transcript.words() == [" Nice", " weather", " today.", " It", " is", " darn", " cold.", " See", " you."]
+    assert transcript[5]["start"] == 3.4 and transcript[5]["end"] == 3.7
+
+
+if __name__ == "__main__":
+    test_windows_cover_whole_words()
+    test_windows_merge_and_clip()
+    test_splice_replaces_window_words()
+    test_only_candidate_windows_are_retranscribed()
+    test_rough_words()
+    test_only_hit_segments_are_aligned()
+    print("✅ Two-tier transcription tests passed")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test VAD gating: energy detector, gated audio and the timestamp remap table
+"""
+
+import sys
+sys.path.append('.')
+
+import numpy as np
+
+from python.audio_processing.vad_gate import detect_speech, energy_speech, gate_audio
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def test_energy_speech():
+    audio = np.concatenate([silence(2), tone(1), silence(0.2), tone(1), silence(3), tone(0.1), silence(1)])
+    spans = energy_speech(audio)
+    # The short pause is bridged, the 0.1s blip dropped
+    assert len(spans) == 1
+    start, end = spans[0]
+    assert abs(start / SR - 2.0) < 0.05 and abs(end / SR - 4.2) < 0.05
+    assert energy_speech(silence(5)) == []
+    assert energy_speech(audio[:10]) == []
+
+    try:
+        detect_speech(audio, "webrtc")
+        assert False, "unknown method was accepted"
+    except ValueError:
+        pass
+
+
+def test_gate_and_remap():
+    audio = np.concatenate([silence(10), tone(2), silence(20), tone(3), silence(5)])
+    spans = [(10 * SR, 12 * SR), (32 * SR, 35 * SR)]
+    gated, speech_map = gate_audio(audio, spans, SR, pad_ms=0, gap_ms=500)
+
+    assert len(gated) == int(5.5 * SR)
+    assert np.array_equal(gated[:2 * SR], audio[10 * SR:12 * SR])
+    assert speech_map.stats() == {"total_seconds": 40.0, "speech_seconds": 5.0, "skipped_seconds": 35.0}
+
+    assert speech_map.to_original(0.0) == 10.0
+    assert speech_map.to_original(1.5) == 11.5
+    assert speech_map.to_original(2.2) == 12.0  # inside the inserted gap
+    assert speech_map.to_original(3.0) == 32.5
+
+    words = [{"word": " hi", "start": 0.5, "end": 1.0}, {"word": " there", "start": 2.6, "end": 3.1}]
+    transcript = speech_map.remap(words)
+    assert transcript.to_list() == [
+        {"word": " hi", "start": 10.5, "end": 11.0},
+        {"word": " there", "start": 32.1, "end": 32.6},
+    ]
+
+
+def test_gate_pads_and_merges():
+    audio = silence(10)
+    gated, speech_map = gate_audio(audio, [(1 * SR, 2 * SR), (2 * SR + 1000, 3 * SR)], SR, pad_ms=200)
+    # Padding makes the spans touch, so they become one
+    assert len(speech_map.lengths) == 1
+    assert speech_map.original_starts == [0.8]
+    assert abs(speech_map.speech_seconds - 2.4) < 1e-9
+
+    gated, speech_map = gate_audio(audio, [], SR)
+    assert len(gated) == 0 and speech_map.skipped_seconds == 10.0
+
+
+if __name__ == "__main__":
+    test_energy_speech()
+    test_gate_and_remap()
+    test_gate_pads_and_merges()
+    print("✅ VAD gating tests passed")